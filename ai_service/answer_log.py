@@ -0,0 +1,148 @@
+"""
+Answer Log
+
+Append-only, compressed on-disk store for candidate answer bodies:
+- Sessions keep only (offset) references; text is read back when a report needs it
+- Each record: length + CRC32 + codec header, then the (zlib) payload
+- Short answers that don't shrink are stored uncompressed
+- One log per process, shared by every session (thread-safe appends)
+
+Usage:
+    from answer_log import get_answer_log
+
+    log = get_answer_log()
+    offset = log.append("I built a chat app with React...")
+    text = log.read(offset)
+"""
+
+import atexit
+import os
+import struct
+import tempfile
+import threading
+import zlib
+from typing import Optional
+
+# Directory for the per-process log (answers are scratch data: sessions live in memory)
+ANSWER_LOG_DIR = os.getenv("ANSWER_LOG_DIR", tempfile.gettempdir())
+
+# zlib level for answer bodies (1 = fastest, 9 = smallest)
+ANSWER_LOG_COMPRESSION = int(os.getenv("ANSWER_LOG_COMPRESSION", "6"))
+
+# payload length, CRC32 of payload, codec
+_HEADER = struct.Struct("<IIB")
+CODEC_RAW = 0
+CODEC_ZLIB = 1
+
+
+class AnswerLogError(Exception):
+    """A record could not be read back (bad offset or corrupt data)"""
+
+
+def encode_record(raw: bytes, compression: int = ANSWER_LOG_COMPRESSION) -> bytes:
+    """Header + payload for raw bytes (zlib, unless that doesn't make them smaller)"""
+    payload = zlib.compress(raw, compression)
+    codec = CODEC_ZLIB
+    if len(payload) >= len(raw):
+        payload, codec = raw, CODEC_RAW
+    return _HEADER.pack(len(payload), zlib.crc32(payload), codec) + payload
+
+
+def read_record(f) -> Optional[bytes]:
+    """
+    Raw bytes of the record at f's position (None at a clean end of file).
+    Raises AnswerLogError on a truncated or corrupt record.
+    """
+    header = f.read(_HEADER.size)
+    if not header:
+        return None
+    if len(header) < _HEADER.size:
+        raise AnswerLogError("Truncated record header")
+    length, crc, codec = _HEADER.unpack(header)
+    payload = f.read(length)
+    if len(payload) != length or zlib.crc32(payload) != crc:
+        raise AnswerLogError("Truncated or corrupt record")
+    return zlib.decompress(payload) if codec == CODEC_ZLIB else payload
+
+
+class AnswerLog:
+    """Append-only file of compressed answer bodies, addressed by byte offset"""
+
+    def __init__(self, path: str, compression: int = ANSWER_LOG_COMPRESSION, remove_on_close: bool = False):
+        self.path = path
+        self.compression = compression
+        self.remove_on_close = remove_on_close
+        self._lock = threading.Lock()
+        self._file = open(path, "a+b")
+        self._file.seek(0, os.SEEK_END)
+        self._end = self._file.tell()
+
+        self.records = 0
+        self.raw_bytes = 0
+        self.stored_bytes = 0
+
+    def append(self, text: str) -> int:
+        """Store an answer; returns the offset to read it back with"""
+        raw = text.encode("utf-8")
+        record = encode_record(raw, self.compression)
+
+        with self._lock:
+            offset = self._end
+            self._file.write(record)  # Append mode: always lands at the end
+            self._file.flush()
+            self._end += len(record)
+            self.records += 1
+            self.raw_bytes += len(raw)
+            self.stored_bytes += len(record)
+        return offset
+
+    def read(self, offset: int) -> str:
+        """The answer stored at offset"""
+        with self._lock:
+            if offset < 0 or offset + _HEADER.size > self._end:
+                raise AnswerLogError(f"No answer record at offset {offset} in {self.path}")
+            self._file.seek(offset)
+            try:
+                raw = read_record(self._file)
+            except AnswerLogError:
+                raw = None
+        if raw is None:
+            raise AnswerLogError(f"Corrupt answer record at offset {offset} in {self.path}")
+        return raw.decode("utf-8")
+
+    def get_statistics(self) -> dict:
+        """Records written by this process and the compression achieved"""
+        return {
+            "path": self.path,
+            "records": self.records,
+            "size_bytes": self._end,
+            "compression_ratio": round(self.raw_bytes / self.stored_bytes, 2) if self.stored_bytes else None
+        }
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+                if self.remove_on_close:
+                    try:
+                        os.remove(self.path)
+                    except OSError:
+                        pass
+
+
+_default_log: Optional[AnswerLog] = None
+_default_lock = threading.Lock()
+
+
+def get_answer_log() -> AnswerLog:
+    """The process-wide answer log (created on first use, removed at exit)"""
+    global _default_log
+    with _default_lock:
+        if _default_log is None:
+            os.makedirs(ANSWER_LOG_DIR, exist_ok=True)
+            path = os.path.join(ANSWER_LOG_DIR, f"mockmate-answers-{os.getpid()}.log")
+            if os.path.exists(path):
+                os.remove(path)  # Left by an earlier process with the same pid
+            _default_log = AnswerLog(path, remove_on_close=True)
+            atexit.register(_default_log.close)
+        return _default_log
@@ -1,45 +1,129 @@
+import time
+_app_import_started = time.perf_counter()
+
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 import httpx
+import asyncio
+import importlib.util
 import json
 import re
+from contextlib import asynccontextmanager
 from typing import Optional, List
 import os
 
-# Try to import Google Generative AI (for Gemini backup)
-try:
-    import google.generativeai as genai
-    GEMINI_AVAILABLE = True
-except ImportError:
-    GEMINI_AVAILABLE = False
-
-# Try to import RAG retriever (optional, graceful fallback if not available)
-try:
-    from rag.retrieve import QuestionRetriever, extract_metadata
-    from session_context import InterviewSession, INTERVIEW_MODE_CONFIG
-    retriever = QuestionRetriever()
-    RAG_AVAILABLE = True
-    print("✅ RAG retriever loaded successfully")
-except Exception as e:
-    RAG_AVAILABLE = False
-    retriever = None
-    print(f"⚠️ RAG retriever not available: {e}")
-
-# Gemini API configuration
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "")
-if GEMINI_API_KEY and GEMINI_AVAILABLE:
+from compute_pool import ComputePool, EventLoopLagMonitor
+from prefetch import GUIDANCE_PREFETCH_ENABLED, GUIDANCE_PREFETCH_QUESTIONS, Prefetcher
+from readiness import IMPORT_TIMINGS, readiness, timed_import
+from session_context import InterviewSession, INTERVIEW_MODE_CONFIG
+from session_journal import JOURNAL_ENABLED, SessionJournal
+
+# Seconds clients should wait before retrying while the retriever loads
+RAG_RETRY_AFTER_SECONDS = int(os.getenv("RAG_RETRY_AFTER_SECONDS", "5"))
+
+# RAG retriever is loaded by a background startup task (sentence_transformers,
+# torch and faiss are only imported there), so /health answers immediately.
+retriever = None
+RAG_AVAILABLE = False
+
+def module_available(module_name: str) -> bool:
+    """Check a module is installed without importing it"""
     try:
-        genai.configure(api_key=GEMINI_API_KEY)
-        print("✅ Gemini API configured successfully (backup available)")
-    except Exception as e:
-        print(f"⚠️ Gemini API configuration failed: {e}")
-        GEMINI_AVAILABLE = False
-elif GEMINI_AVAILABLE and not GEMINI_API_KEY:
-    GEMINI_AVAILABLE = False
+        return importlib.util.find_spec(module_name) is not None
+    except ModuleNotFoundError:
+        return False
+
+# Gemini API configuration (google.generativeai is imported on first use)
+GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "")
+GEMINI_AVAILABLE = bool(GEMINI_API_KEY) and module_available("google.generativeai")
+_genai = None
+
+if GEMINI_AVAILABLE:
+    print("✅ Gemini backup available (SDK loads on first use)")
+elif not GEMINI_API_KEY:
     print("⚠️ Gemini API key not provided (set GEMINI_API_KEY env var)")
 
-app = FastAPI(title="MockMate AI Service", version="1.0.0")
+def get_genai():
+    """Import and configure the Gemini SDK on first use"""
+    global _genai, GEMINI_AVAILABLE
+    if _genai is None:
+        try:
+            genai = timed_import("google.generativeai")
+            genai.configure(api_key=GEMINI_API_KEY)
+            _genai = genai
+            print("✅ Gemini API configured successfully (backup available)")
+        except Exception as e:
+            print(f"⚠️ Gemini API configuration failed: {e}")
+            GEMINI_AVAILABLE = False
+            raise
+    return _genai
+
+def load_retriever():
+    """Import RAG dependencies and build the retriever (runs on the compute pool)"""
+    timed_import("numpy")
+    timed_import("faiss")
+    embeddings_module = timed_import("rag.embeddings")
+    if embeddings_module.EMBEDDING_BACKEND == "onnx":
+        timed_import("onnxruntime")
+    else:
+        timed_import("sentence_transformers")
+    retrieve_module = timed_import("rag.retrieve")
+    return retrieve_module.QuestionRetriever()
+
+async def initialize_rag():
+    """Background startup task: load the retriever, then flip readiness"""
+    global retriever, RAG_AVAILABLE
+    readiness.mark_loading("retriever")
+    try:
+        retriever = await compute_pool.run(load_retriever)
+        RAG_AVAILABLE = True
+        readiness.mark_ready("retriever")
+        print("✅ RAG retriever loaded successfully")
+    except Exception as e:
+        readiness.mark_failed("retriever", e)
+        print(f"⚠️ RAG retriever not available: {e}")
+    print(f"📦 Startup report: {json.dumps(readiness.report())}")
+
+def require_rag():
+    """Fail fast with 503 (+ Retry-After while loading) when RAG isn't usable"""
+    if RAG_AVAILABLE:
+        return
+    if readiness.status("retriever") == "loading":
+        raise HTTPException(
+            status_code=503,
+            detail="RAG system is starting up",
+            headers={"Retry-After": str(RAG_RETRY_AFTER_SECONDS)}
+        )
+    raise HTTPException(status_code=503, detail="RAG system not available")
+
+# Retrieval runs on its own bounded thread pool so the event loop stays responsive
+compute_pool = ComputePool()
+loop_monitor = EventLoopLagMonitor()
+
+# Speculative next batch / guidance while candidates answer (yields to real requests)
+prefetcher = Prefetcher(foreground=compute_pool)
+
+# Sessions survive restarts: change events are journaled, replayed at startup
+session_journal = SessionJournal() if JOURNAL_ENABLED else None
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if session_journal:
+        active_sessions.update(session_journal.recover())
+        print(f"✓ Recovered {len(active_sessions)} sessions ({session_journal.last_recovery['seconds']}s)")
+    loop_monitor.start()
+    rag_task = asyncio.create_task(initialize_rag())
+    yield
+    rag_task.cancel()
+    await loop_monitor.stop()
+    prefetcher.shutdown()
+    compute_pool.shutdown()
+    if session_journal:
+        session_journal.close()
+
+app = FastAPI(title="MockMate AI Service", version="1.0.0", lifespan=lifespan)
 
 # CORS for server communication
 app.add_middleware(
@@ -50,6 +134,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def track_foreground_requests(request, call_next):
+    """Speculative work waits while real (POST) requests are being served"""
+    if request.method != "POST":
+        return await call_next(request)
+    with prefetcher.foreground():
+        return await call_next(request)
+
 # Models
 class EvaluateRequest(BaseModel):
     question: str
@@ -78,10 +170,12 @@ class GenerateQARequest(BaseModel):
     interview_mode: Optional[str] = "general"
     session_id: Optional[str] = None
     questionCount: Optional[int] = 10
+    statistics_since: Optional[int] = None  # Only return statistics changed after this version
 
 class SessionRequest(BaseModel):
     session_id: Optional[str] = None
     action: str  # create, get, update, delete
+    statistics_since: Optional[int] = None  # Only return statistics changed after this version
 
 class SessionResponse(BaseModel):
     session_id: str
@@ -110,10 +204,56 @@ TIMEOUT = 120.0
 # Session storage (in-memory for now, can move to Redis/DB later)
 active_sessions = {}
 
+# Serialize retrieval per session (retrieval now runs off the event loop)
+session_locks = {}
+
+def get_session_lock(session_id: str) -> asyncio.Lock:
+    """Get or create the lock guarding a session's question state"""
+    if session_id not in session_locks:
+        session_locks[session_id] = asyncio.Lock()
+    return session_locks[session_id]
+
+def session_statistics(session: InterviewSession, since: Optional[int] = None) -> dict:
+    """Full statistics, or just what changed after `since` (the version of an earlier response)"""
+    return session.get_statistics() if since is None else session.get_statistics_delta(since)
+
+def new_session(session_id: str = None) -> InterviewSession:
+    """Create a session whose changes are journaled (when persistence is enabled)"""
+    session = InterviewSession(session_id)
+    if session_journal:
+        session_journal.attach(session)
+    return session
+
+# Import cost of the app module itself (heavy RAG imports are recorded separately)
+IMPORT_TIMINGS["app"] = time.perf_counter() - _app_import_started
+
+# Readiness check (orchestrator gate: only ready once the retriever is loaded)
+@app.get("/ready")
+async def readiness_check():
+    """Report whether background components (RAG retriever) have loaded"""
+    report = readiness.report()
+    if readiness.is_ready("retriever"):
+        return {"status": "ready", **report}
+    
+    status = readiness.status("retriever") or "loading"
+    headers = {"Retry-After": str(RAG_RETRY_AFTER_SECONDS)} if status == "loading" else None
+    return JSONResponse(status_code=503, content={"status": status, **report}, headers=headers)
+
 # Health check
 @app.get("/health")
 async def health_check():
     """Check if service and Ollama are running"""
+    # Reported the same way whether Ollama is up or not
+    statistics = {
+        "rag_enabled": RAG_AVAILABLE,
+        "rag_status": readiness.status("retriever"),
+        "active_sessions": len(active_sessions),
+        "compute_pool": compute_pool.get_statistics(),
+        "event_loop": loop_monitor.get_statistics(),
+        "query_cache": retriever.query_cache.get_statistics() if retriever else None,
+        "prefetch": prefetcher.get_statistics(),
+        "session_journal": session_journal.get_statistics() if session_journal else None
+    }
     try:
         async with httpx.AsyncClient(timeout=5.0) as client:
             response = await client.get(f"{OLLAMA_BASE_URL}/api/tags")
@@ -126,8 +266,7 @@ async def health_check():
                 "available_models": model_names,
                 "active_model": MODEL_NAME,
                 "gemini_backup": "available" if GEMINI_AVAILABLE else "not available",
-                "rag_enabled": RAG_AVAILABLE,
-                "active_sessions": len(active_sessions)
+                **statistics
             }
     except Exception as e:
         # If Ollama is down, check if Gemini is available as backup
@@ -137,23 +276,21 @@ async def health_check():
             "ollama": "disconnected",
             "gemini_backup": gemini_status,
             "error": str(e),
-            "rag_enabled": RAG_AVAILABLE,
-            "active_sessions": len(active_sessions)
+            **statistics
         }
 
 @app.post("/api/generate-qa")
 async def generate_qa(req: GenerateQARequest):
     """Generate interview questions with phased ordering"""
     
-    if not RAG_AVAILABLE:
-        raise HTTPException(status_code=503, detail="RAG system not available")
+    require_rag()
     
     try:
         # Get or create session
         session_id = req.session_id or f"session_{len(active_sessions)}"
         
         if session_id not in active_sessions:
-            session = InterviewSession(session_id)
+            session = new_session(session_id)
             session.set_user_context(
                 resume=req.resume or "",
                 job_description=req.jobDescription or "",
@@ -168,17 +305,32 @@ async def generate_qa(req: GenerateQARequest):
         else:
             session = active_sessions[session_id]
         
-        # Retrieve questions with phased ordering
-        questions = retriever.retrieve_phased(
-            session=session,
-            resume_text=req.resume or "",
-            job_description=req.jobDescription or "",
-            top_k=req.questionCount or 10
-        )
+        resume_text = req.resume or ""
+        job_description = req.jobDescription or ""
+        top_k = req.questionCount or 10
         
-        # Mark questions as asked
-        for q in questions:
-            session.mark_question_asked(q["id"])
+        async with get_session_lock(session_id):
+            # Serve the batch prefetched while the candidate was answering, if still valid
+            prefetched = await prefetcher.take_batch(session, resume_text, job_description, top_k)
+            if prefetched:
+                questions, phase = prefetched
+                session.set_phase(phase)
+            else:
+                # Retrieve questions with phased ordering (off the event loop)
+                questions = await compute_pool.run(
+                    retriever.retrieve_phased,
+                    session=session,
+                    resume_text=resume_text,
+                    job_description=job_description,
+                    top_k=top_k
+                )
+            
+            # Mark questions as asked
+            for q in questions:
+                session.mark_question_asked(q["id"])
+            
+            # Get the next batch ready in the background
+            prefetcher.schedule_batch(session, retriever.retrieve_phased, resume_text, job_description, top_k)
         
         # Format for frontend
         qa_pairs = [
@@ -193,12 +345,20 @@ async def generate_qa(req: GenerateQARequest):
             }
             for q in questions
         ]
+
+        # Warm guidance for the next question(s) only, keyed like the client's /api/guidance call
+        if GUIDANCE_PREFETCH_ENABLED:
+            for qa_pair in qa_pairs[:GUIDANCE_PREFETCH_QUESTIONS]:
+                prefetch_guidance(session, guidance_request_for(
+                    qa_pair, resume_summary=resume_text, job_description=job_description,
+                    skills=req.skills, experience_level=req.experience_level
+                ))
         
         return {
             "qaPairs": qa_pairs,
             "session_id": session_id,
             "current_phase": session.current_phase,
-            "statistics": session.get_statistics()
+            "statistics": session_statistics(session, req.statistics_since)
         }
         
     except Exception as e:
@@ -210,7 +370,7 @@ async def manage_session(req: SessionRequest):
     """Manage interview sessions"""
     
     if req.action == "create":
-        session = InterviewSession()
+        session = new_session()
         active_sessions[session.session_id] = session
         return {
             "session_id": session.session_id,
@@ -225,13 +385,17 @@ async def manage_session(req: SessionRequest):
         session = active_sessions[req.session_id]
         return {
             "session_id": session.session_id,
-            "statistics": session.get_statistics(),
+            "statistics": session_statistics(session, req.statistics_since),
             "current_phase": session.current_phase
         }
     
     elif req.action == "delete":
         if req.session_id and req.session_id in active_sessions:
             del active_sessions[req.session_id]
+            session_locks.pop(req.session_id, None)
+            prefetcher.forget_session(req.session_id)
+            if session_journal:
+                session_journal.forget(req.session_id)
         return {"message": "Session deleted"}
     
     else:
@@ -244,16 +408,14 @@ async def get_interview_modes():
         "modes": INTERVIEW_MODE_CONFIG
     }
 
-@app.post("/api/guidance", response_model=GuidanceResponse)
-async def generate_guidance(req: GuidanceRequest):
-    """Generate guidance using local LLM first, Gemini as backup"""
-
-    default_direction = "Answer clearly and concisely, relating to your experience."
-    default_answer = "Provide a brief, structured response with specific examples when relevant."
-    default_tips = ["Be specific with examples", "Keep it concise"]
+GUIDANCE_DEFAULT_DIRECTION = "Answer clearly and concisely, relating to your experience."
+GUIDANCE_DEFAULT_ANSWER = "Provide a brief, structured response with specific examples when relevant."
+GUIDANCE_DEFAULT_TIPS = ["Be specific with examples", "Keep it concise"]
 
+def build_guidance_prompt(req: GuidanceRequest) -> str:
+    """Coaching prompt for a question (also the key for prefetched guidance)"""
     skills_text = ", ".join(req.skills[:8]) if req.skills else "Not specified"
-    prompt = f"""You are an interview coach preparing a candidate.
+    return f"""You are an interview coach preparing a candidate.
 
 Stage: {req.stage.replace('_', ' ').upper() if req.stage else 'TECHNICAL'}
 
@@ -275,9 +437,8 @@ Return ONLY valid JSON with this exact structure:
   "tips": ["tip 1", "tip 2", "tip 3"]
 }}"""
 
-    raw_output = None
-    source = "default"
-
+async def request_guidance(prompt: str, allow_backup: bool = True):
+    """(raw LLM output or None, source): local LLM first, Gemini as backup"""
     try:
         async with httpx.AsyncClient(timeout=TIMEOUT) as client:
             response = await client.post(
@@ -297,27 +458,30 @@ Return ONLY valid JSON with this exact structure:
                 raise Exception(f"Ollama returned status {response.status_code}")
 
             result = response.json()
-            raw_output = result.get("response", "").strip()
-            source = "ollama"
+            return result.get("response", "").strip(), "ollama"
     except Exception as ollama_error:
         print(f"❌ Ollama guidance failed: {ollama_error}")
 
-        if GEMINI_AVAILABLE:
+        if allow_backup and GEMINI_AVAILABLE:
             try:
-                model = genai.GenerativeModel('gemini-pro')
+                model = get_genai().GenerativeModel('gemini-pro')
                 response = model.generate_content(prompt)
-                raw_output = response.text.strip()
-                source = "gemini"
+                return response.text.strip(), "gemini"
             except Exception as gemini_error:
                 print(f"❌ Gemini guidance failed: {gemini_error}")
 
+    return None, "default"
+
+def parse_guidance(raw_output: Optional[str], source: str) -> GuidanceResponse:
+    """Parse the LLM's JSON, falling back to generic guidance"""
+    default = GuidanceResponse(
+        direction=GUIDANCE_DEFAULT_DIRECTION,
+        answer=GUIDANCE_DEFAULT_ANSWER,
+        tips=GUIDANCE_DEFAULT_TIPS,
+        source=source
+    )
     if not raw_output:
-        return GuidanceResponse(
-            direction=default_direction,
-            answer=default_answer,
-            tips=default_tips,
-            source=source
-        )
+        return default
 
     cleaned = raw_output.replace("```json", "").replace("```", "").strip()
     parsed = None
@@ -333,18 +497,13 @@ Return ONLY valid JSON with this exact structure:
                 parsed = None
 
     if not isinstance(parsed, dict):
-        return GuidanceResponse(
-            direction=default_direction,
-            answer=default_answer,
-            tips=default_tips,
-            source=source
-        )
+        return default
 
-    direction = str(parsed.get("direction", default_direction))
-    answer = str(parsed.get("answer", default_answer))
-    tips = parsed.get("tips", default_tips)
+    direction = str(parsed.get("direction", GUIDANCE_DEFAULT_DIRECTION))
+    answer = str(parsed.get("answer", GUIDANCE_DEFAULT_ANSWER))
+    tips = parsed.get("tips", GUIDANCE_DEFAULT_TIPS)
     if not isinstance(tips, list) or not tips:
-        tips = default_tips
+        tips = GUIDANCE_DEFAULT_TIPS
     tips = [str(t) for t in tips[:3]]
 
     return GuidanceResponse(
@@ -354,6 +513,42 @@ Return ONLY valid JSON with this exact structure:
         source=source
     )
 
+def guidance_request_for(qa_pair: dict, **context) -> GuidanceRequest:
+    """
+    The /api/guidance request a client sends for a qaPairs entry. Unset
+    context keeps GuidanceRequest's defaults, so the prompt (the prefetch key)
+    is the same as the client's.
+    """
+    return GuidanceRequest(
+        question=qa_pair["question"],
+        stage=qa_pair["phase"],
+        **{field: value for field, value in context.items() if value is not None}
+    )
+
+def prefetch_guidance(session: InterviewSession, req: GuidanceRequest):
+    """Warm guidance for an issued question (local LLM only; failures aren't cached)"""
+    prompt = build_guidance_prompt(req)
+
+    async def compute():
+        raw_output, source = await request_guidance(prompt, allow_backup=False)
+        return parse_guidance(raw_output, source) if raw_output else None
+
+    prefetcher.schedule_guidance(session.session_id, session.current_phase, prompt, compute)
+
+@app.post("/api/guidance", response_model=GuidanceResponse)
+async def generate_guidance(req: GuidanceRequest):
+    """Generate guidance using local LLM first, Gemini as backup"""
+
+    prompt = build_guidance_prompt(req)
+
+    # Warmed while the candidate was answering the previous question
+    prefetched = await prefetcher.take_guidance(prompt)
+    if prefetched:
+        return prefetched
+
+    raw_output, source = await request_guidance(prompt)
+    return parse_guidance(raw_output, source)
+
 @app.post("/evaluate", response_model=EvaluateResponse)
 async def evaluate(req: EvaluateRequest):
     """Evaluate candidate answer with context-aware feedback"""
@@ -404,7 +599,8 @@ async def evaluate(req: EvaluateRequest):
     rag_context = ""
     if RAG_AVAILABLE and retriever:
         try:
-            similar_questions = retriever.retrieve(
+            similar_questions = await compute_pool.run(
+                retriever.retrieve,
                 resume_text=req.question,
                 job_description="",
                 top_k=3
@@ -531,7 +727,7 @@ Score as integer 0–10. Pick from the bands above. Think carefully before scori
         if GEMINI_AVAILABLE:
             try:
                 print("⚠️ Falling back to Gemini API...")
-                model = genai.GenerativeModel('gemini-pro')
+                model = get_genai().GenerativeModel('gemini-pro')
                 response = model.generate_content(prompt)
                 raw_output = response.text.strip()
                 used_service = "gemini"
@@ -550,20 +746,29 @@ Score as integer 0–10. Pick from the bands above. Think carefully before scori
     
     # Update session if available
     if session and req.question_id:
-        session.mark_question_answered(
-            req.question_id, 
-            req.user_answer, 
-            parsed["score"]
-        )
+        # Retrieval for this session may be running on a worker thread; write under its lock
+        async with get_session_lock(req.session_id):
+            session.mark_question_answered(
+                req.question_id, 
+                req.user_answer, 
+                parsed["score"]
+            )
         
-        # Extract mentioned topics from answer
-        if question_obj:
-            extract_mentioned_topics(req.user_answer, session)
+            # Extract mentioned topics from answer
+            if question_obj:
+                extract_mentioned_topics(req.user_answer, session)
             
-            # Mark skill as covered
-            skill = question_obj.get("skill")
-            if skill:
-                session.mark_skill_covered(skill)
+                # Mark skill as covered
+                skill = question_obj.get("skill")
+                if skill:
+                    session.mark_skill_covered(skill)
+        
+            # The answer changed what the next batch should be
+            prefetcher.refresh_batch(session)
+        
+            # Don't acknowledge the answer until it is on disk (one fsync per batch of requests)
+            if session_journal:
+                await asyncio.to_thread(session_journal.sync)
     
     # Get follow-up questions
     follow_ups = []
@@ -0,0 +1,109 @@
+"""
+Interview Analytics Benchmark (throughput and memory vs record count)
+
+Writes synthetic session exports (*.jsonl.gz, InterviewSession.to_dict() per
+line, 20 scored answers per session) of increasing size and runs the
+interview_analytics CLI on each in a child process, reporting:
+- answers per second
+- peak resident memory of the child (flat as the record count grows = bounded)
+
+Usage (from ai_service/):
+    python benchmarks/bench_analytics.py --answers 250000,1000000,2000000
+"""
+
+import argparse
+import contextlib
+import gzip
+import io
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+AI_SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(AI_SERVICE_DIR)
+
+from rag.question_bank import flatten_pools, load_question_sets
+
+ANSWERS_PER_SESSION = 20
+
+
+def write_export(path: str, answers: int, question_ids, seed: int = 0):
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1).timestamp()
+    roles = ["Backend", "Frontend", "Data", "DevOps", ""]
+    modes = ["general", "technical", "hr", "behavioral", "managerial"]
+    with gzip.open(path, "wt", encoding="utf-8", compresslevel=1) as f:
+        for n in range(answers // ANSWERS_PER_SESSION):
+            day = start + rng.randint(0, 600) * 86400
+            session = {
+                "session_id": f"session_{n}",
+                "resume_data": {"target_role": rng.choice(roles)},
+                "interview_mode": rng.choice(modes),
+                "answered_questions": {
+                    question_id: {
+                        "answer": "Short synthetic answer",
+                        "score": rng.randint(0, 10),
+                        "timestamp": datetime.fromtimestamp(day + k * 120).isoformat()
+                    }
+                    for k, question_id in enumerate(rng.sample(question_ids, ANSWERS_PER_SESSION))
+                }
+            }
+            f.write(json.dumps(session) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--answers", default="250000,1000000", help="Comma-separated record counts")
+    parser.add_argument("--json", help="Write the report to this path")
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        bank, _ = flatten_pools(load_question_sets())
+    question_ids = sorted({q["id"] for q in bank})
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for answers in (int(n) for n in args.answers.split(",")):
+            export = os.path.join(tmp, f"sessions-{answers}.jsonl.gz")
+            write_export(export, answers, question_ids)
+            report_path = os.path.join(tmp, "report.json")
+
+            # Peak RSS is read inside the child (RUSAGE_CHILDREN would be the max over every run)
+            started = time.perf_counter()
+            child = subprocess.run(
+                [sys.executable, "-c",
+                 "import resource, sys, runpy; sys.argv = sys.argv[1:]; "
+                 "runpy.run_path(sys.argv[0], run_name='__main__'); "
+                 "print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, file=sys.stderr)",
+                 os.path.join(AI_SERVICE_DIR, "interview_analytics.py"), export, "--output", report_path],
+                cwd=AI_SERVICE_DIR, capture_output=True, text=True, check=True
+            )
+            seconds = time.perf_counter() - started
+            peak_kb = int(child.stderr.strip().splitlines()[-1])
+            with open(report_path) as f:
+                report = json.load(f)
+
+            results.append({
+                "answers": report["records"],
+                "export_mb": round(os.path.getsize(export) / 1e6, 1),
+                "seconds": round(seconds, 2),
+                "answers_per_s": report["records_per_second"],
+                "peak_rss_mb": round(peak_kb / 1024, 1),
+                "questions": len(report["questions"])
+            })
+            print(f"{results[-1]['answers']:>9} answers ({results[-1]['export_mb']} MB gz): "
+                  f"{results[-1]['answers_per_s']:>8} answers/s, peak RSS {results[-1]['peak_rss_mb']} MB")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({"runs": results}, f, indent=2)
+        print(f"\n✓ Report written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
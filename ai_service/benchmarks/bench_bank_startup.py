@@ -0,0 +1,90 @@
+"""
+Question Bank Startup Benchmark (JSON files vs compiled bundle)
+
+Measures how long the question bank takes to load at startup:
+- JSON: open + json.load every bank file (the retriever before the bundle)
+- Bundle: mmap the compiled bundle, verify its hash, unpickle records
+- Bundle (no verify): as above without the sha256 check
+- Cold process: a fresh interpreter loading each way (includes imports)
+
+Usage (from ai_service/):
+    python rag/question_bundle.py            # compile first
+    python benchmarks/bench_bank_startup.py --repeats 50
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rag.question_bank import AI_SERVICE_DIR, load_question_sets
+from rag.question_bundle import BUNDLE_PATH, load_bundle
+
+COLD_SNIPPETS = {
+    "json": "from rag.question_bank import load_question_sets; load_question_sets()",
+    "bundle": "from rag.question_bundle import load_bundle; load_bundle()",
+}
+
+
+def time_ms(fn, repeats: int):
+    """Median and p95 wall time of fn() in milliseconds"""
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return {
+        "p50_ms": round(float(np.percentile(timings, 50)), 2),
+        "p95_ms": round(float(np.percentile(timings, 95)), 2)
+    }
+
+
+def cold_start_ms(snippet: str, repeats: int):
+    """Median wall time of a fresh interpreter running the snippet"""
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, "-c", snippet], cwd=AI_SERVICE_DIR, check=True, stdout=subprocess.DEVNULL)
+        timings.append((time.perf_counter() - started) * 1000)
+    return round(float(np.median(timings)), 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeats", type=int, default=30)
+    parser.add_argument("--cold-repeats", type=int, default=5)
+    parser.add_argument("--json", help="Write the report to this path")
+    args = parser.parse_args()
+
+    if not os.path.exists(BUNDLE_PATH):
+        print(f"❌ {BUNDLE_PATH} not found. Run: python rag/question_bundle.py")
+        sys.exit(1)
+
+    report = {
+        "bundle_bytes": os.path.getsize(BUNDLE_PATH),
+        "json": time_ms(load_question_sets, args.repeats),
+        "bundle": time_ms(load_bundle, args.repeats),
+        "bundle_no_verify": time_ms(lambda: load_bundle(verify=False), args.repeats),
+        "cold_process_ms": {
+            name: cold_start_ms(snippet, args.cold_repeats) for name, snippet in COLD_SNIPPETS.items()
+        }
+    }
+    report["speedup"] = round(report["json"]["p50_ms"] / max(report["bundle"]["p50_ms"], 1e-6), 1)
+
+    print(json.dumps(report, indent=2))
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Question Calibration Benchmark (fit time, memory and accuracy vs record count)
+
+Simulates candidates answering bank-sized question sets under a known 2PL
+model (binomial 0-10 scores) and fits them with question_calibration,
+reporting per record count:
+- record ingestion rate (QuestionCalibration.add_answer)
+- EM iterations, fit seconds and records per second per iteration
+- peak memory traced during the fit (numpy allocations included)
+- recovery: correlation of fitted vs true b and a, difficulty levels matched
+
+Usage (from ai_service/):
+    python benchmarks/bench_calibration.py --records 100000,1000000,5000000
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from question_calibration import QuestionCalibration, difficulty_level, fit_2pl
+
+QUESTIONS = 500
+ANSWERS_PER_CANDIDATE = 15
+
+
+def simulate(records: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    difficulty = rng.uniform(-2.5, 2.5, QUESTIONS)
+    discrimination = np.exp(rng.normal(0, 0.3, QUESTIONS))
+    candidates = records // ANSWERS_PER_CANDIDATE
+    ability = rng.normal(size=candidates)
+    c = np.repeat(np.arange(candidates, dtype=np.int32), ANSWERS_PER_CANDIDATE)
+    q = rng.integers(0, QUESTIONS, len(c)).astype(np.int32)
+    p = 1 / (1 + np.exp(-discrimination[q] * (ability[c] - difficulty[q])))
+    scores = rng.binomial(10, p) / 10
+    return c, q, scores, candidates, difficulty, discrimination
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", default="100000,1000000", help="Comma-separated record counts")
+    parser.add_argument("--json", help="Write the report to this path")
+    args = parser.parse_args()
+
+    results = []
+    for records in (int(n) for n in args.records.split(",")):
+        c, q, scores, candidates, difficulty, discrimination = simulate(records)
+
+        sample = min(len(scores), 200000)
+        ingest = QuestionCalibration()
+        started = time.perf_counter()
+        for candidate, question, score in zip(c[:sample].tolist(), q[:sample].tolist(), (scores[:sample] * 10).tolist()):
+            ingest.add_answer(candidate, question, score)
+        ingest_rate = sample / (time.perf_counter() - started)
+        del ingest
+
+        tracemalloc.start()
+        started = time.perf_counter()
+        fit = fit_2pl(c, q, scores, candidates, QUESTIONS)
+        seconds = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        results.append({
+            "records": len(scores),
+            "candidates": candidates,
+            "ingest_records_per_s": round(ingest_rate),
+            "iterations": fit["iterations"],
+            "fit_seconds": round(seconds, 2),
+            "records_per_s_per_iteration": round(len(scores) * fit["iterations"] / seconds),
+            "fit_peak_mb": round(peak / 1e6, 1),
+            "b_correlation": round(float(np.corrcoef(difficulty, fit["difficulty"])[0, 1]), 4),
+            "a_correlation": round(float(np.corrcoef(discrimination, fit["discrimination"])[0, 1]), 4),
+            "levels_matched": round(float((difficulty_level(difficulty) == difficulty_level(fit["difficulty"])).mean()), 3),
+            "dispersion": round(fit["dispersion"], 4)
+        })
+        r = results[-1]
+        print(f"{r['records']:>9} records: fit {r['fit_seconds']}s ({r['iterations']} iterations, "
+              f"{r['records_per_s_per_iteration']:,} records/s/iteration), peak {r['fit_peak_mb']} MB, "
+              f"ingest {r['ingest_records_per_s']:,}/s | b r={r['b_correlation']} a r={r['a_correlation']} "
+              f"levels {r['levels_matched']:.1%}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({"runs": results}, f, indent=2)
+        print(f"\n✓ Report written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Embedding Backend Parity + Benchmark (torch vs int8 ONNX)
+
+Checks that the quantized ONNX backend is a safe replacement for the
+SentenceTransformer backend on our own question bank, then measures speed.
+
+Parity:
+- Cosine similarity between torch and ONNX vectors for every bank question
+- Top-k neighbour overlap: each question is used as a query against the bank
+  under both backends and the result sets are compared
+
+Speed:
+- Single-query latency (p50/p95), as seen by /api/generate-qa
+- Batch throughput (questions/sec), as seen by index builds
+
+Usage (from ai_service/):
+    python benchmarks/bench_embedding_backends.py --onnx-dir models/all-MiniLM-L6-v2-onnx
+    python benchmarks/bench_embedding_backends.py --json bench_output.json --min-overlap 0.9
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rag.embeddings import MODEL_NAME, ONNX_MODEL_DIR, question_to_text
+from rag.onnx_encoder import OnnxSentenceEncoder
+
+
+def load_bank_texts(data_dir: str):
+    """Every question record in data/*.json, deduplicated by id"""
+    texts = {}
+    for path in sorted(glob.glob(os.path.join(data_dir, "*.json"))):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if not isinstance(data, list):
+            continue  # Config files (interview_flow.json, taxonomy.json, ...)
+        for q in data:
+            if isinstance(q, dict) and 'id' in q and 'question' in q:
+                texts.setdefault(q['id'], question_to_text(q))
+    return list(texts.values())
+
+
+def top_k_neighbours(embeddings: np.ndarray, k: int) -> np.ndarray:
+    """Top-k neighbours of each row (excluding itself) by cosine similarity"""
+    normed = embeddings / np.clip(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12, None)
+    sims = normed @ normed.T
+    np.fill_diagonal(sims, -np.inf)
+    return np.argsort(-sims, axis=1)[:, :k]
+
+
+def measure_latency(model, queries, repeats: int):
+    """Single-query encode latency in milliseconds"""
+    timings = []
+    for i in range(repeats):
+        started = time.perf_counter()
+        model.encode(queries[i % len(queries)], convert_to_numpy=True)
+        timings.append((time.perf_counter() - started) * 1000)
+    return {
+        "p50_ms": round(float(np.percentile(timings, 50)), 2),
+        "p95_ms": round(float(np.percentile(timings, 95)), 2)
+    }
+
+
+def measure_throughput(model, texts, batch_size: int):
+    """Batch encode throughput in questions per second"""
+    started = time.perf_counter()
+    embeddings = model.encode(texts, batch_size=batch_size, convert_to_numpy=True)
+    elapsed = time.perf_counter() - started
+    return np.asarray(embeddings, dtype='float32'), round(len(texts) / elapsed, 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data-dir", default="data")
+    parser.add_argument("--onnx-dir", default=ONNX_MODEL_DIR)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--repeats", type=int, default=200)
+    parser.add_argument("--min-overlap", type=float, default=0.0,
+                        help="Exit non-zero if mean top-k overlap falls below this")
+    parser.add_argument("--json", help="Write the report to this path")
+    args = parser.parse_args()
+
+    from sentence_transformers import SentenceTransformer
+
+    texts = load_bank_texts(args.data_dir)
+    print(f"Bank: {len(texts)} questions")
+
+    torch_model = SentenceTransformer(MODEL_NAME)
+    onnx_model = OnnxSentenceEncoder(args.onnx_dir)
+
+    # Warm up both runtimes before timing
+    torch_model.encode(texts[:8])
+    onnx_model.encode(texts[:8])
+
+    torch_vectors, torch_qps = measure_throughput(torch_model, texts, args.batch_size)
+    onnx_vectors, onnx_qps = measure_throughput(onnx_model, texts, args.batch_size)
+
+    # Parity
+    cosine = np.sum(torch_vectors * onnx_vectors, axis=1) / (
+        np.linalg.norm(torch_vectors, axis=1) * np.linalg.norm(onnx_vectors, axis=1)
+    )
+    k = min(args.k, len(texts) - 1)
+    torch_top = top_k_neighbours(torch_vectors, k)
+    onnx_top = top_k_neighbours(onnx_vectors, k)
+    overlap = np.array([
+        len(set(a) & set(b)) / k for a, b in zip(torch_top, onnx_top)
+    ])
+
+    queries = [t[:200] for t in texts]
+    report = {
+        "model": MODEL_NAME,
+        "bank_size": len(texts),
+        "parity": {
+            "cosine_mean": round(float(cosine.mean()), 5),
+            "cosine_min": round(float(cosine.min()), 5),
+            f"top{k}_overlap_mean": round(float(overlap.mean()), 4),
+            f"top{k}_overlap_min": round(float(overlap.min()), 4)
+        },
+        "torch": {
+            "latency": measure_latency(torch_model, queries, args.repeats),
+            "throughput_qps": torch_qps
+        },
+        "onnx_int8": {
+            "latency": measure_latency(onnx_model, queries, args.repeats),
+            "throughput_qps": onnx_qps
+        }
+    }
+
+    print(json.dumps(report, indent=2))
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if overlap.mean() < args.min_overlap:
+        print(f"❌ Top-{k} overlap {overlap.mean():.3f} below required {args.min_overlap}")
+        sys.exit(1)
+
+    print("✅ Parity check passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Metadata Selection Benchmark (list scan vs bitmaps vs inverted indexes)
+
+Runs the flow controller's eligibility query ("stage=resume_technical,
+role in {backend, any}, difficulty 3-4, not asked") on our bank replicated
+to larger sizes, three ways:
+- scan:   list comprehension over every question (the old path)
+- bitmap: MetadataFilter.match() boolean masks (O(bank / 8) bytes per op)
+- select: MetadataFilter.select() posting-list intersection
+
+Usage (from ai_service/):
+    python benchmarks/bench_metadata_select.py --scales 1,10,100
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rag.metadata_filter import MetadataFilter
+from rag.question_bank import load_bank
+
+QUERY = {'stages': ['resume_technical'], 'role': 'backend', 'difficulty': (3, 4)}
+
+
+def scaled_bank(bank, scale: int):
+    """The bank repeated scale times with unique ids"""
+    if scale == 1:
+        return bank
+    return [dict(q, id=f"{q['id']}#{copy}") for copy in range(scale) for q in bank]
+
+
+def scan(bank, asked):
+    low, high = QUERY['difficulty']
+    return [
+        q for q in bank
+        if (
+            q.get('stage') in QUERY['stages'] and
+            low <= q.get('difficulty', 2) <= high and
+            (q.get('role') == QUERY['role'] or q.get('role') == 'any') and
+            q['id'] not in asked
+        )
+    ]
+
+
+def time_us(fn, repeats: int) -> float:
+    """Median wall time of fn() in microseconds"""
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1e6)
+    return round(float(np.median(timings)), 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", default="1,10,100", help="Bank replication factors")
+    parser.add_argument("--repeats", type=int, default=50)
+    parser.add_argument("--json", help="Write the report to this path")
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        _, bank, _ = load_bank()
+
+    report = []
+    print(f"{'questions':>10} {'matches':>8} {'scan us':>10} {'bitmap us':>10} {'select us':>10}")
+    for scale in (int(s) for s in args.scales.split(",") if s.strip()):
+        questions = scaled_bank(bank, scale)
+        with contextlib.redirect_stdout(io.StringIO()):
+            filters = MetadataFilter(questions)
+        asked = {q['id'] for q in questions[:: max(1, len(questions) // 20)]}  # A session's ~20 asked questions
+
+        matches = len(filters.select(exclude_ids=asked, **QUERY))
+        row = {
+            "questions": len(questions),
+            "matches": matches,
+            "scan_us": time_us(lambda: scan(questions, asked), args.repeats),
+            "bitmap_us": time_us(lambda: np.flatnonzero(filters.match(exclude_ids=asked, **QUERY)), args.repeats),
+            "select_us": time_us(lambda: filters.select(exclude_ids=asked, **QUERY), args.repeats)
+        }
+        report.append(row)
+        print(f"{row['questions']:>10} {row['matches']:>8} {row['scan_us']:>10} {row['bitmap_us']:>10} {row['select_us']:>10}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✓ Report written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Question Record Benchmark (dicts vs slotted records)
+
+Measures on the full bank:
+- bank memory: every object reachable from the bank (shared objects counted
+  once), JSON dicts vs QuestionRecords with interned categorical values
+- result cost: building top_k retrieval results, q.copy() + q['score'] (the
+  old path) vs ScoredQuestion views; time per batch and bytes / allocations
+  held by the results
+
+Usage (from ai_service/):
+    python benchmarks/bench_question_records.py --top-k 10 --batches 1000
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+import tracemalloc
+from types import MappingProxyType
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rag.question_bank import flatten_pools, load_question_sets
+from rag.question_record import ScoredQuestion, freeze_pools
+
+
+def deep_size(root) -> int:
+    """Bytes of every object reachable from root, each counted once"""
+    seen = set()
+    stack = [root]
+    total = 0
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        if isinstance(obj, MappingProxyType):
+            total += sys.getsizeof(dict(obj))  # The read-only dict behind the proxy
+        if isinstance(obj, (dict, MappingProxyType)):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        elif hasattr(obj, '__slots__') and not isinstance(obj, type):
+            for cls in type(obj).__mro__:
+                for slot in getattr(cls, '__slots__', ()):
+                    if hasattr(obj, slot):
+                        stack.append(getattr(obj, slot))
+    return total
+
+
+def copied_results(bank, picks, scores):
+    results = []
+    for pos, score in zip(picks, scores):
+        question = bank[pos].copy()
+        question['score'] = score
+        results.append(question)
+    return results
+
+
+def view_results(bank, picks, scores):
+    return [ScoredQuestion((bank[pos], score)) for pos, score in zip(picks, scores)]
+
+
+def measure(build, bank, batches):
+    """(ms per batch, KB held by all batches, allocations held)"""
+    timings = []
+    for picks, scores in batches[:200]:
+        started = time.perf_counter()
+        build(bank, picks, scores)
+        timings.append((time.perf_counter() - started) * 1000)
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    held = [build(bank, picks, scores) for picks, scores in batches]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    stats = after.compare_to(before, 'filename')
+    size = sum(stat.size_diff for stat in stats)
+    blocks = sum(stat.count_diff for stat in stats)
+    del held
+    return round(float(np.median(timings)), 4), round(size / 1024, 1), blocks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--batches", type=int, default=1000, help="Result batches kept alive while measuring")
+    parser.add_argument("--json", help="Write the report to this path")
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        dict_bank, _ = flatten_pools(load_question_sets())
+        record_bank, _ = flatten_pools(freeze_pools(load_question_sets()))
+
+    rng = np.random.default_rng(0)
+    batches = [
+        (rng.choice(len(dict_bank), args.top_k, replace=False).tolist(), rng.random(args.top_k).tolist())
+        for _ in range(args.batches)
+    ]
+
+    dict_kb = deep_size(dict_bank) / 1024
+    record_kb = deep_size(record_bank) / 1024
+    copy_ms, copy_kb, copy_blocks = measure(copied_results, dict_bank, batches)
+    view_ms, view_kb, view_blocks = measure(view_results, record_bank, batches)
+
+    report = {
+        "questions": len(dict_bank),
+        "bank_dict_kb": round(dict_kb, 1),
+        "bank_record_kb": round(record_kb, 1),
+        "bank_saved_pct": round((1 - record_kb / dict_kb) * 100, 1),
+        "top_k": args.top_k,
+        "batches": args.batches,
+        "copy_ms_per_batch": copy_ms,
+        "view_ms_per_batch": view_ms,
+        "copy_results_kb": copy_kb,
+        "view_results_kb": view_kb,
+        "copy_allocations": copy_blocks,
+        "view_allocations": view_blocks
+    }
+
+    print(f"Bank ({len(dict_bank)} questions): dicts {report['bank_dict_kb']} KB -> "
+          f"records {report['bank_record_kb']} KB ({report['bank_saved_pct']}% smaller)")
+    print(f"{'results':>10} {'ms/batch':>10} {'KB held':>10} {'allocs':>10}")
+    print(f"{'copy':>10} {copy_ms:>10} {copy_kb:>10} {copy_blocks:>10}")
+    print(f"{'view':>10} {view_ms:>10} {view_kb:>10} {view_blocks:>10}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✓ Report written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
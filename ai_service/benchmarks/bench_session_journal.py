@@ -0,0 +1,170 @@
+"""
+Session Persistence Benchmark (save() rewrites vs event journal)
+
+Simulated interviews are played by concurrent request threads and made
+durable three ways:
+- rewrite:  InterviewSession.save() + fsync after every answer (whole session
+            as indented JSON each time)
+- journal:  SessionJournal, every answer waits for sync() (group commit: one
+            fsync covers whatever the other threads appended meanwhile)
+- async:    SessionJournal without waiting (durable within JOURNAL_FLUSH_MS)
+
+Then measures startup recovery of the live sessions (finished interviews are
+deleted) by replaying journal segments only, and from a snapshot.
+
+Usage (from ai_service/):
+    python benchmarks/bench_session_journal.py --sessions 200 --answers 20 --threads 16
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from answer_log import AnswerLog
+from session_context import InterviewSession
+from session_journal import SessionJournal
+
+WORDS = ("I designed the service around a queue so retries were idempotent and the team "
+         "could scale consumers independently while we measured latency under load").split()
+
+
+def script(sessions: int, answers: int, seed: int = 0):
+    rng = random.Random(seed)
+    plans = []
+    for n in range(sessions):
+        turns = [
+            (f"technical_{n}_{k}", " ".join(rng.choice(WORDS) for _ in range(rng.randint(60, 220))), rng.randint(3, 9))
+            for k in range(answers)
+        ]
+        plans.append((f"session_{n}", turns))
+    return plans
+
+
+def play(plan, make_session, after_answer):
+    """One interview: context, asked/answered/skill per turn; returns events produced"""
+    session_id, turns = plan
+    session = make_session(session_id)
+    session.set_user_context(resume="Backend developer " * 50, skills=["Python", "SQL", "Docker"],
+                             education="B.Tech", experience_level="intern", target_role="Backend")
+    events = 3
+    for question_id, answer, score in turns:
+        session.mark_question_asked(question_id)
+        session.mark_question_answered(question_id, answer, score)
+        session.mark_skill_covered(random.choice(("Python", "SQL", "Docker")))
+        events += 3
+        after_answer(session)
+    return events
+
+
+def run(plans, threads, make_session, after_answer):
+    started = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        events = sum(pool.map(lambda plan: play(plan, make_session, after_answer), plans))
+    return events, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--answers", type=int, default=20, help="Answered questions per session")
+    parser.add_argument("--threads", type=int, default=16, help="Concurrent request threads")
+    parser.add_argument("--live", type=float, default=0.25, help="Fraction of sessions not yet deleted at restart")
+    parser.add_argument("--json", help="Write the report to this path")
+    args = parser.parse_args()
+
+    plans = script(args.sessions, args.answers)
+    answers = args.sessions * args.answers
+    report = {"sessions": args.sessions, "answers_per_session": args.answers, "threads": args.threads}
+    tmp = tempfile.mkdtemp(prefix="bench-journal-")
+    answer_log = AnswerLog(os.path.join(tmp, "answers.log"), remove_on_close=True)
+
+    try:
+        # rewrite: the whole session to its own file after every answer
+        rewrite_dir = os.path.join(tmp, "rewrite")
+        os.makedirs(rewrite_dir)
+
+        def save(session):
+            path = os.path.join(rewrite_dir, f"{session.session_id}.json")
+            session.save(path)
+            with open(path, "rb") as f:
+                os.fsync(f.fileno())
+
+        events, seconds = run(plans, args.threads, lambda sid: InterviewSession(sid, answer_log=answer_log), save)
+        report["rewrite_answers_per_s"] = round(answers / seconds)
+
+        # journal: group commit, every answer acknowledged only once durable
+        journal_dir = os.path.join(tmp, "journal")
+        journal = SessionJournal(journal_dir, snapshot_bytes=1 << 40)
+        journal.recover()
+        events, seconds = run(
+            plans, args.threads,
+            lambda sid: journal.attach(InterviewSession(sid, answer_log=answer_log)),
+            lambda session: journal.sync()
+        )
+        stats = journal.get_statistics()
+        report["journal_answers_per_s"] = round(answers / seconds)
+        report["journal_events_per_s"] = round(events / seconds)
+        report["journal_events_per_fsync"] = stats["events_per_batch"]
+        report["journal_mb"] = round(stats["bytes_written"] / 1e6, 2)
+
+        # Finished interviews are deleted; the rest are live at restart
+        live = int(args.sessions * args.live)
+        for session_id, _ in plans[live:]:
+            journal.forget(session_id)
+        journal.close()
+
+        # async: durable within the flush interval, nobody waits
+        journal = SessionJournal(os.path.join(tmp, "async"), snapshot_bytes=1 << 40)
+        journal.recover()
+        started = time.perf_counter()
+        events, _ = run(
+            plans, args.threads,
+            lambda sid: journal.attach(InterviewSession(sid, answer_log=answer_log)),
+            lambda session: None
+        )
+        journal.sync()
+        report["async_events_per_s"] = round(events / (time.perf_counter() - started))
+        report["async_events_per_fsync"] = journal.get_statistics()["events_per_batch"]
+        journal.close()
+
+        # Recovery by replaying the whole history (close() then finishes the snapshot recover() started)
+        journal = SessionJournal(journal_dir)
+        assert len(journal.recover()) == live
+        report["recover_replay_s"] = journal.last_recovery["seconds"]
+        journal.close()
+
+        # Recovery from that snapshot
+        journal = SessionJournal(journal_dir)
+        assert len(journal.recover()) == live
+        assert journal.last_recovery["snapshot"] is not None
+        report["recover_snapshot_s"] = journal.last_recovery["seconds"]
+        journal.close()
+    finally:
+        answer_log.close()
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    print(f"{args.sessions} sessions x {args.answers} answers, {args.threads} threads")
+    print(f"  rewrite + fsync per answer: {report['rewrite_answers_per_s']:>8} answers/s")
+    print(f"  journal, sync per answer:   {report['journal_answers_per_s']:>8} answers/s "
+          f"({report['journal_events_per_fsync']} events per fsync, {report['journal_mb']} MB)")
+    print(f"  journal, async:             {report['async_events_per_s']:>8} events/s "
+          f"({report['async_events_per_fsync']} events per fsync)")
+    print(f"  recovery of {live} live sessions: replay {report['recover_replay_s']}s, "
+          f"snapshot {report['recover_snapshot_s']}s")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✓ Report written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+Session Memory Benchmark (dict/set sessions vs compact sessions)
+
+Simulates many concurrent interviews: every session asks and answers
+questions from the bank with realistic answer lengths, two ways:
+- legacy:  sets of id strings, {id: {answer, score, ISO timestamp}} dicts
+           (InterviewSession before __slots__ and the answer log)
+- compact: InterviewSession (ordinals, numeric arrays, answers in the AnswerLog)
+
+Reports Python heap held per session (tracemalloc) and the log's on-disk size.
+
+Usage (from ai_service/):
+    python benchmarks/bench_session_memory.py --sessions 2000 --answers 20
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from answer_log import AnswerLog
+from rag.question_bank import load_bank
+from session_context import InterviewSession
+
+WORDS = ("I designed the service around a queue so retries were idempotent and the team "
+         "could scale consumers independently while we measured latency under load").split()
+
+
+class LegacySession:
+    """The per-session state as it was stored before (dicts and sets of strings)"""
+
+    def __init__(self, session_id):
+        self.session_id = session_id
+        self.current_phase = "warmup"
+        self.asked_questions = set()
+        self.answered_questions = {}
+        self.skipped_questions = set()
+        self.covered_skills = set()
+
+    def mark_question_asked(self, question_id):
+        self.asked_questions.add(question_id)
+
+    def mark_question_answered(self, question_id, answer, score=None):
+        self.answered_questions[question_id] = {
+            "answer": answer,
+            "score": score,
+            "timestamp": datetime.now().isoformat()
+        }
+        self.asked_questions.add(question_id)
+
+
+def script(bank, sessions: int, answers: int, seed: int = 0):
+    """(session id, [(question id, answer, score)]) for every simulated session"""
+    rng = random.Random(seed)
+    ids = [q['id'] for q in bank]
+    plans = []
+    for n in range(sessions):
+        turns = []
+        for question_id in rng.sample(ids, answers):
+            length = rng.randint(60, 220)  # Words per spoken answer
+            turns.append((question_id, " ".join(rng.choice(WORDS) for _ in range(length)), rng.randint(3, 9)))
+        plans.append((f"session_{n}", turns))
+    return plans
+
+
+def held_bytes(build):
+    """Python heap still allocated by what build() returns"""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    kept = build()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    return kept, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=2000)
+    parser.add_argument("--answers", type=int, default=20, help="Answered questions per session")
+    parser.add_argument("--json", help="Write the report to this path")
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        _, bank, _ = load_bank()
+    plans = script(bank, args.sessions, args.answers)
+    text_bytes = sum(len(answer.encode()) for _, turns in plans for _, answer, _ in turns)
+
+    def legacy():
+        sessions = []
+        for session_id, turns in plans:
+            session = LegacySession(session_id)
+            for question_id, answer, score in turns:
+                session.mark_question_answered(question_id, answer, score)
+            sessions.append(session)
+        return sessions
+
+    with tempfile.TemporaryDirectory() as tmp:
+        log = AnswerLog(os.path.join(tmp, "answers.log"))
+
+        def compact():
+            sessions = []
+            for session_id, turns in plans:
+                session = InterviewSession(session_id, answer_log=log)
+                for question_id, answer, score in turns:
+                    session.mark_question_answered(question_id, answer, score)
+                sessions.append(session)
+            return sessions
+
+        started = time.perf_counter()
+        legacy_sessions, legacy_bytes = held_bytes(legacy)
+        legacy_ms = (time.perf_counter() - started) * 1000
+        del legacy_sessions
+
+        started = time.perf_counter()
+        compact_sessions, compact_bytes = held_bytes(compact)
+        compact_ms = (time.perf_counter() - started) * 1000
+
+        # Reports still get every answer back
+        sample = compact_sessions[0]
+        assert [entry["answer"] for entry in sample.answered_questions.values()] == [a for _, a, _ in plans[0][1]]
+        log_stats = log.get_statistics()
+        log.close()
+
+    report = {
+        "sessions": args.sessions,
+        "answers_per_session": args.answers,
+        "answer_text_mb": round(text_bytes / 1e6, 2),
+        "legacy_heap_mb": round(legacy_bytes / 1e6, 2),
+        "compact_heap_mb": round(compact_bytes / 1e6, 2),
+        "legacy_bytes_per_session": legacy_bytes // args.sessions,
+        "compact_bytes_per_session": compact_bytes // args.sessions,
+        "heap_saved_pct": round((1 - compact_bytes / legacy_bytes) * 100, 1),
+        "log_mb": round(log_stats["size_bytes"] / 1e6, 2),
+        "log_compression_ratio": log_stats["compression_ratio"],
+        "legacy_build_ms": round(legacy_ms, 1),
+        "compact_build_ms": round(compact_ms, 1)
+    }
+
+    print(f"{args.sessions} sessions x {args.answers} answers ({report['answer_text_mb']} MB of answer text)")
+    print(f"  legacy:  {report['legacy_heap_mb']:>8} MB heap ({report['legacy_bytes_per_session']} B/session)")
+    print(f"  compact: {report['compact_heap_mb']:>8} MB heap ({report['compact_bytes_per_session']} B/session), "
+          f"log {report['log_mb']} MB on disk ({report['log_compression_ratio']}x compression)")
+    print(f"  heap saved: {report['heap_saved_pct']}%")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✓ Report written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Vector Index Benchmark (flat L2 / flat IP / HNSW / IVF-Flat)
+
+For each index type in rag/vector_index.py, on our own bank and on synthetic
+scaled-up banks, reports:
+- Build time (including IVF training)
+- Index memory (serialized size)
+- Single-query latency (p50/p95)
+- Recall@k against exact cosine search
+
+Synthetic banks are clustered unit vectors of the same dimension as the
+embedding model, so partitioning and graph behaviour resemble real text
+embeddings more closely than uniform noise.
+
+Usage (from ai_service/):
+    python benchmarks/bench_vector_index.py
+    python benchmarks/bench_vector_index.py --sizes 10000,100000,500000 --k 10 --json bench_index.json
+    python benchmarks/bench_vector_index.py --skip-bank --types hnsw,ivf_flat
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import faiss
+
+from rag.vector_index import INDEX_TYPES, build_vector_index, index_settings, search_index
+
+
+def synthetic_bank(n: int, dimension: int, seed: int = 0) -> np.ndarray:
+    """n unit vectors drawn around sqrt(n) random topic centres"""
+    rng = np.random.default_rng(seed)
+    n_topics = max(1, int(np.sqrt(n)))
+    centres = rng.standard_normal((n_topics, dimension)).astype('float32')
+    vectors = centres[rng.integers(0, n_topics, n)] + 0.6 * rng.standard_normal((n, dimension)).astype('float32')
+    faiss.normalize_L2(vectors)
+    return vectors
+
+
+def make_queries(bank: np.ndarray, count: int, seed: int = 1) -> np.ndarray:
+    """Perturbed bank vectors (queries land near, not on, stored questions)"""
+    rng = np.random.default_rng(seed)
+    queries = bank[rng.integers(0, len(bank), count)] + 0.3 * rng.standard_normal((count, bank.shape[1])).astype('float32')
+    faiss.normalize_L2(queries)
+    return queries
+
+
+def exact_neighbours(bank: np.ndarray, queries: np.ndarray, k: int) -> np.ndarray:
+    """Ground truth: exact cosine top-k"""
+    index = faiss.IndexFlatIP(bank.shape[1])
+    index.add(bank)
+    _, ids = index.search(queries, k)
+    return ids
+
+
+def bench_index(index_type: str, bank: np.ndarray, queries: np.ndarray, truth: np.ndarray, k: int):
+    """Build one index type and measure it against the exact neighbours"""
+    started = time.perf_counter()
+    index = build_vector_index(bank, index_type, ids=np.arange(len(bank)))
+    build_seconds = time.perf_counter() - started
+
+    timings = []
+    hits = 0
+    for query, expected in zip(queries, truth):
+        started = time.perf_counter()
+        _, ids = search_index(index, query, k)
+        timings.append((time.perf_counter() - started) * 1000)
+        hits += len(set(ids.tolist()) & set(expected.tolist()))
+
+    return {
+        **index_settings(index),
+        "build_s": round(build_seconds, 3),
+        "memory_mb": round(faiss.serialize_index(index).nbytes / 1e6, 2),
+        "latency_p50_ms": round(float(np.percentile(timings, 50)), 3),
+        "latency_p95_ms": round(float(np.percentile(timings, 95)), 3),
+        f"recall@{k}": round(hits / (len(queries) * k), 4)
+    }
+
+
+def load_bank_vectors() -> np.ndarray:
+    """Embeddings of our question bank with the configured embedding model"""
+    from rag.embeddings import embed_questions
+    from rag.question_bank import load_bank
+
+    _, bank, _ = load_bank()
+    vectors = embed_questions(bank)
+    faiss.normalize_L2(vectors)
+    return vectors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="10000,100000", help="Synthetic bank sizes (comma-separated)")
+    parser.add_argument("--types", default=",".join(INDEX_TYPES), help="Index types to compare")
+    parser.add_argument("--dimension", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--threads", type=int, default=1,
+                        help="FAISS threads (1 = per-request latency as served)")
+    parser.add_argument("--skip-bank", action="store_true", help="Only run synthetic banks (no embedding model)")
+    parser.add_argument("--json", help="Write the report to this path")
+    args = parser.parse_args()
+
+    faiss.omp_set_num_threads(args.threads)
+    index_types = [t.strip() for t in args.types.split(",") if t.strip()]
+
+    banks = []
+    if not args.skip_bank:
+        banks.append(("question_bank", load_bank_vectors))
+    for size in (int(s) for s in args.sizes.split(",") if s.strip()):
+        banks.append((f"synthetic_{size}", lambda size=size: synthetic_bank(size, args.dimension)))
+
+    report = []
+    for name, load in banks:
+        bank = load()
+        k = min(args.k, len(bank))
+        queries = make_queries(bank, args.queries)
+        truth = exact_neighbours(bank, queries, k)
+
+        print(f"\n{name}: {len(bank)} vectors, {bank.shape[1]} dims, {len(queries)} queries, k={k}")
+        print(f"{'type':<10} {'build s':>9} {'MB':>8} {'p50 ms':>8} {'p95 ms':>8} {'recall':>8}")
+        for index_type in index_types:
+            result = bench_index(index_type, bank, queries, truth, k)
+            report.append({"bank": name, "size": len(bank), **result})
+            print(f"{index_type:<10} {result['build_s']:>9.3f} {result['memory_mb']:>8.2f} "
+                  f"{result['latency_p50_ms']:>8.3f} {result['latency_p95_ms']:>8.3f} {result[f'recall@{k}']:>8.4f}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✓ Report written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
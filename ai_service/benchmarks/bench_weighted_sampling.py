@@ -0,0 +1,100 @@
+"""
+Weighted Sampling Benchmark (multiplicity pool vs Efraimidis-Spirakis)
+
+Draws a stage's worth of questions without replacement from synthetic
+banks of weighted questions, two ways:
+- pool: int(weight * 10) copies of each question, shuffle, dedupe
+        (the old InterviewFlowController.select_questions)
+- es:   weighted_sample_indices (log(u) / weight keys, top-k by argpartition)
+
+Reports median time and peak extra memory (tracemalloc) per draw.
+
+Usage (from ai_service/):
+    python benchmarks/bench_weighted_sampling.py --sizes 1000,10000,100000 --count 5
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rag.interview_flow_controller import weighted_sample_indices
+
+
+def synthetic_questions(n: int, seed: int = 0):
+    """n question dicts with weights spread like the bank (1.0-2.5)"""
+    rng = np.random.default_rng(seed)
+    weights = np.round(rng.uniform(1.0, 2.5, n), 1)
+    return [({'id': f"q_{i}", 'question': f"Question {i}?", 'weight': float(w)}, float(w)) for i, w in enumerate(weights)]
+
+
+def pool_sample(weighted, count: int):
+    pool = []
+    for question, weight in weighted:
+        pool.extend([question] * max(1, int(weight * 10)))
+    random.shuffle(pool)
+    selected = []
+    for question in pool:
+        if question not in selected and len(selected) < count:
+            selected.append(question)
+    return selected
+
+
+def es_sample(weighted, count: int, rng):
+    indices = weighted_sample_indices([weight for _, weight in weighted], count, rng)
+    return [weighted[i][0] for i in indices]
+
+
+def measure(fn, repeats: int):
+    """(median ms, peak extra MB) over repeats"""
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return round(float(np.median(timings)), 3), round(peak / 1e6, 2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,10000,100000")
+    parser.add_argument("--count", type=int, default=5, help="Questions drawn per call (a stage)")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--json", help="Write the report to this path")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    report = []
+    print(f"{'questions':>10} {'pool ms':>10} {'pool MB':>8} {'es ms':>8} {'es MB':>7} {'speedup':>8}")
+    for size in (int(s) for s in args.sizes.split(",") if s.strip()):
+        weighted = synthetic_questions(size)
+        pool_ms, pool_mb = measure(lambda: pool_sample(weighted, args.count), args.repeats)
+        es_ms, es_mb = measure(lambda: es_sample(weighted, args.count, rng), args.repeats)
+        row = {
+            "questions": size, "count": args.count,
+            "pool_ms": pool_ms, "pool_peak_mb": pool_mb,
+            "es_ms": es_ms, "es_peak_mb": es_mb,
+            "speedup": round(pool_ms / max(es_ms, 1e-6), 1)
+        }
+        report.append(row)
+        print(f"{size:>10} {pool_ms:>10} {pool_mb:>8} {es_ms:>8} {es_mb:>7} {row['speedup']:>7}x")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✓ Report written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""
+Compute Pool
+
+Keeps CPU-bound retrieval work off the asyncio event loop:
+- Dedicated, bounded thread pool for embedding, FAISS search and filtering
+- Back-pressure when too many jobs are queued
+- Event-loop lag monitor that reports how long the loop was blocked
+
+Usage:
+    from compute_pool import ComputePool, EventLoopLagMonitor
+
+    pool = ComputePool(max_workers=4)
+    questions = await pool.run(retriever.retrieve_phased, session=session, top_k=10)
+
+    monitor = EventLoopLagMonitor()
+    monitor.start()
+    print(monitor.get_statistics())
+"""
+
+import asyncio
+import functools
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+
+def _env_int(name: str, default: int) -> int:
+    """Read a positive integer from the environment, falling back to default"""
+    try:
+        value = int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+    return value if value > 0 else default
+
+
+# Thread count for retrieval work (SentenceTransformer and FAISS release the GIL)
+RAG_WORKER_THREADS = _env_int("RAG_WORKER_THREADS", min(4, os.cpu_count() or 1))
+
+# Jobs allowed to wait for a worker before callers start queueing on the loop
+RAG_MAX_QUEUED = _env_int("RAG_MAX_QUEUED", RAG_WORKER_THREADS * 8)
+
+
+class ComputePool:
+    """Bounded thread pool for blocking work called from async handlers"""
+
+    def __init__(self, max_workers: int = RAG_WORKER_THREADS, max_queued: int = RAG_MAX_QUEUED,
+                 thread_name_prefix: str = "rag-worker", initializer: Optional[Callable] = None):
+        self.max_workers = max_workers
+        self.max_queued = max_queued
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix=thread_name_prefix,
+            initializer=initializer  # Runs once in each worker thread (e.g. to lower its priority)
+        )
+        self._slots: Optional[asyncio.Semaphore] = None
+
+        # Counters (only touched from the event loop thread)
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.total_run_seconds = 0.0
+        self.total_wait_seconds = 0.0
+
+    async def run(self, fn: Callable, *args, **kwargs):
+        """Run fn(*args, **kwargs) on a worker thread and await the result"""
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_workers + self.max_queued)
+
+        loop = asyncio.get_running_loop()
+        submitted = time.perf_counter()
+
+        async with self._slots:
+            self.in_flight += 1
+            try:
+                started, result = await loop.run_in_executor(
+                    self._executor,
+                    functools.partial(self._timed_call, fn, args, kwargs)
+                )
+                self.completed += 1
+                self.total_wait_seconds += started - submitted
+                self.total_run_seconds += time.perf_counter() - started
+                return result
+            except Exception:
+                self.failed += 1
+                raise
+            finally:
+                self.in_flight -= 1
+
+    @staticmethod
+    def _timed_call(fn: Callable, args: tuple, kwargs: dict):
+        """Record when a worker actually picked the job up"""
+        started = time.perf_counter()
+        return started, fn(*args, **kwargs)
+
+    def get_statistics(self) -> Dict:
+        """Pool utilisation counters"""
+        finished = self.completed or 1
+        return {
+            "max_workers": self.max_workers,
+            "max_queued": self.max_queued,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "failed": self.failed,
+            "avg_run_ms": round(self.total_run_seconds / finished * 1000, 2),
+            "avg_queue_wait_ms": round(self.total_wait_seconds / finished * 1000, 2)
+        }
+
+    def shutdown(self, wait: bool = False):
+        """Stop accepting work and release worker threads"""
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+class EventLoopLagMonitor:
+    """
+    Measure event-loop responsiveness.
+
+    A background task sleeps for `interval` seconds; any extra delay before it
+    wakes up is time the loop spent blocked by synchronous code.
+    """
+
+    def __init__(self, interval: float = 0.1, warn_threshold: float = 0.1):
+        self.interval = interval
+        self.warn_threshold = warn_threshold
+        self._task: Optional[asyncio.Task] = None
+
+        self.samples = 0
+        self.stalls = 0  # Samples where lag exceeded warn_threshold
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self.total_blocked = 0.0
+
+    def start(self):
+        """Start sampling on the running loop"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Stop sampling"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.record(max(0.0, loop.time() - expected))
+
+    def record(self, lag: float):
+        """Add one lag sample (seconds)"""
+        self.samples += 1
+        self.last_lag = lag
+        self.total_blocked += lag
+        if lag > self.max_lag:
+            self.max_lag = lag
+        if lag >= self.warn_threshold:
+            self.stalls += 1
+            print(f"⚠️ Event loop blocked for {lag * 1000:.0f}ms")
+
+    def get_statistics(self) -> Dict:
+        """Lag summary in milliseconds"""
+        return {
+            "samples": self.samples,
+            "stalls": self.stalls,
+            "last_lag_ms": round(self.last_lag * 1000, 2),
+            "max_lag_ms": round(self.max_lag * 1000, 2),
+            "total_blocked_ms": round(self.total_blocked * 1000, 2)
+        }
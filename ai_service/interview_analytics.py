@@ -0,0 +1,454 @@
+"""
+Interview Analytics
+
+Offline cohort statistics over every persisted interview:
+- Sources: a SessionJournal directory (newest snapshot + the segments after
+  it), session exports (*.jsonl / *.jsonl.gz with one InterviewSession.to_dict()
+  per line) and saved sessions (*.json from InterviewSession.save)
+- Streaming: answers are read one at a time and aggregated in fixed-size NumPy
+  chunks, so memory depends on the number of groups (plus the changes in the
+  journal segments after the newest snapshot), not the number of answers
+- Per question, skill, role (candidate's target role) and interview mode:
+  count, mean, variance, min/max, percentiles and the 0-10 score distribution
+- Per skill trends: count and mean per day, week or month
+- Only the last attempt at each question counts, as in session exports and
+  journal snapshots, so a journal gives the same report before and after
+  compaction
+
+Usage:
+    python interview_analytics.py data/session_journal --output report.json
+    python interview_analytics.py exports/ sessions.jsonl.gz --trend-period week --min-count 20
+
+    from interview_analytics import InterviewAnalytics
+    analytics = InterviewAnalytics()
+    analytics.add_source("data/session_journal")
+    report = analytics.report()
+"""
+
+import argparse
+import contextlib
+import glob
+import gzip
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+# Answers buffered before they are folded into the aggregates
+ANALYTICS_CHUNK_SIZE = 65536
+
+# Score histogram resolution: scores 0-10 in steps of 0.1 (exact for integer scores)
+SCORE_MAX = 10
+BINS_PER_POINT = 10
+N_BINS = SCORE_MAX * BINS_PER_POINT + 1
+_BIN_POINTS = (np.arange(N_BINS) + BINS_PER_POINT // 2) // BINS_PER_POINT  # Nearest whole score per bin
+
+PERCENTILES = (10, 25, 50, 75, 90)
+
+TREND_PERIODS = {"day": "datetime64[D]", "week": "datetime64[W]", "month": "datetime64[M]"}
+
+UNKNOWN = "unknown"
+
+
+class GroupStats:
+    """
+    Streaming count / mean / M2 / min / max / score histogram per group key.
+    Chunks are merged with Chan et al.'s parallel variance update, so results
+    don't depend on the chunk size.
+    """
+
+    def __init__(self):
+        self.keys: List[int] = []  # Group key of each row
+        self._rows: Dict[int, int] = {}
+        self.count = np.zeros(0, dtype=np.int64)
+        self.mean = np.zeros(0)
+        self.m2 = np.zeros(0)
+        self.min = np.zeros(0)
+        self.max = np.zeros(0)
+        self.histogram = np.zeros((0, N_BINS), dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def _grow(self, size: int):
+        if size <= len(self.count):
+            return
+        capacity = max(size, 2 * len(self.count), 16)
+        extra = capacity - len(self.count)
+        self.count = np.concatenate([self.count, np.zeros(extra, dtype=np.int64)])
+        self.mean = np.concatenate([self.mean, np.zeros(extra)])
+        self.m2 = np.concatenate([self.m2, np.zeros(extra)])
+        self.min = np.concatenate([self.min, np.full(extra, np.inf)])
+        self.max = np.concatenate([self.max, np.full(extra, -np.inf)])
+        self.histogram = np.concatenate([self.histogram, np.zeros((extra, N_BINS), dtype=np.int64)])
+
+    def _row_codes(self, keys: np.ndarray) -> Tuple[np.ndarray, int]:
+        """Row of every key (new keys get rows) and the row count after this chunk"""
+        unique, inverse = np.unique(keys, return_inverse=True)
+        rows = np.empty(len(unique), dtype=np.int64)
+        for i, key in enumerate(unique.tolist()):
+            row = self._rows.get(key)
+            if row is None:
+                row = self._rows[key] = len(self.keys)
+                self.keys.append(key)
+            rows[i] = row
+        self._grow(len(self.keys))
+        return rows[inverse.ravel()], len(self.keys)
+
+    def update(self, keys: np.ndarray, scores: np.ndarray):
+        """Fold one chunk of (group key, score) pairs into the aggregates"""
+        if len(keys) == 0:
+            return
+        codes, n = self._row_codes(keys)
+
+        count_b = np.bincount(codes, minlength=n)
+        present = count_b > 0
+        mean_b = np.zeros(n)
+        mean_b[present] = np.bincount(codes, weights=scores, minlength=n)[present] / count_b[present]
+        m2_b = np.bincount(codes, weights=(scores - mean_b[codes]) ** 2, minlength=n)
+
+        count_a = self.count[:n]
+        total = count_a + count_b
+        delta = mean_b - self.mean[:n]
+        weight_b = count_b / np.maximum(total, 1)
+        self.mean[:n] += delta * weight_b
+        self.m2[:n] += m2_b + delta ** 2 * count_a * weight_b
+        self.count[:n] = total
+
+        np.minimum.at(self.min, codes, scores)
+        np.maximum.at(self.max, codes, scores)
+        bins = np.clip(np.rint(scores * BINS_PER_POINT), 0, N_BINS - 1).astype(np.int64)
+        self.histogram[:n] += np.bincount(codes * N_BINS + bins, minlength=n * N_BINS).reshape(n, N_BINS)
+
+    def percentiles(self) -> np.ndarray:
+        """(groups, len(PERCENTILES)) scores: smallest bin whose cumulative share reaches p"""
+        n = len(self.keys)
+        cumulative = np.cumsum(self.histogram[:n], axis=1)
+        targets = np.ceil(self.count[:n, None] * (np.array(PERCENTILES) / 100.0)).clip(min=1)
+        index = (cumulative[:, None, :] >= targets[:, :, None]).argmax(axis=2)
+        return index / BINS_PER_POINT
+
+    def rows(self, min_count: int = 1) -> Iterator[Tuple[int, Dict]]:
+        """(group key, statistics) for groups with at least min_count answers"""
+        n = len(self.keys)
+        percentiles = self.percentiles()
+        variance = self.m2[:n] / np.maximum(self.count[:n] - 1, 1)  # Sample variance
+        for row in range(n):
+            count = int(self.count[row])
+            if count < min_count:
+                continue
+            distribution = np.bincount(_BIN_POINTS, weights=self.histogram[row], minlength=SCORE_MAX + 1)
+            yield self.keys[row], {
+                "count": count,
+                "mean": round(float(self.mean[row]), 4),
+                "variance": round(float(variance[row]) if count > 1 else 0.0, 4),
+                "std": round(float(np.sqrt(variance[row])) if count > 1 else 0.0, 4),
+                "min": float(self.min[row]),
+                "max": float(self.max[row]),
+                "percentiles": {f"p{p}": float(v) for p, v in zip(PERCENTILES, percentiles[row])},
+                "distribution": [int(c) for c in distribution]
+            }
+
+
+class Vocabulary:
+    """String <-> small int codes for group labels"""
+
+    def __init__(self):
+        self.codes: Dict[str, int] = {}
+        self.labels: List[str] = []
+
+    def code(self, label: Optional[str]) -> int:
+        label = label or UNKNOWN
+        code = self.codes.get(label)
+        if code is None:
+            code = self.codes[label] = len(self.labels)
+            self.labels.append(label)
+        return code
+
+
+def iter_export(path: str) -> Iterator[Dict]:
+    """Session dicts from a .jsonl(.gz) export or a single saved .json session"""
+    if path.endswith(".json"):
+        with open(path, "r", encoding="utf-8") as f:
+            yield json.load(f)
+        return
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _timestamp(value) -> float:
+    if isinstance(value, str):
+        return datetime.fromisoformat(value).timestamp()
+    return float(value) if value is not None else 0.0
+
+
+def _merge_state(state: Dict, change: Dict) -> Dict:
+    """A snapshot session dict with later journal changes applied (later answers replace earlier ones)"""
+    merged = dict(state)
+    if change["resume_data"]:
+        merged["resume_data"] = {**(state.get("resume_data") or {}), **change["resume_data"]}
+    if "interview_mode" in change:
+        merged["interview_mode"] = change["interview_mode"]
+    merged["answered_questions"] = {**(state.get("answered_questions") or {}), **change["answered_questions"]}
+    return merged
+
+
+class InterviewAnalytics:
+    """Streams answers from journals and exports into per-group aggregates"""
+
+    def __init__(self, chunk_size: int = ANALYTICS_CHUNK_SIZE, trend_period: str = "month",
+                 question_metadata: Optional[Dict[str, Tuple[str, str]]] = None):
+        if trend_period not in TREND_PERIODS:
+            raise ValueError(f"trend_period must be one of {sorted(TREND_PERIODS)}")
+        self.chunk_size = chunk_size
+        self.trend_period = trend_period
+        # question id -> (skill, bank role); skills fall back to "unknown" without it
+        self.question_metadata = question_metadata or {}
+
+        self.questions = Vocabulary()
+        self.skills = Vocabulary()
+        self.roles = Vocabulary()
+        self.modes = Vocabulary()
+        self._question_skill: List[int] = []  # Skill code per question code
+
+        self.by_question = GroupStats()
+        self.by_skill = GroupStats()
+        self.by_role = GroupStats()
+        self.by_mode = GroupStats()
+        self.by_skill_period = GroupStats()
+        self.overall = GroupStats()
+
+        # Chunk buffers: question, role, mode codes, score, timestamp
+        self._buffer = np.zeros((5, chunk_size))
+        self._filled = 0
+
+        self.records = 0
+        self.sessions = 0
+        self.chunks = 0
+        self.sources: List[str] = []
+        self.seconds = 0.0
+
+    # ---- Records ----
+
+    def _question_code(self, question_id: str) -> int:
+        code = self.questions.code(question_id)
+        if code == len(self._question_skill):
+            skill = self.question_metadata.get(question_id, (UNKNOWN, UNKNOWN))[0]
+            self._question_skill.append(self.skills.code(skill))
+        return code
+
+    def add_answer(self, question_id: str, score, timestamp: float, role_code: int, mode_code: int):
+        """Buffer one scored answer (flushed every chunk_size answers)"""
+        if score is None:
+            return
+        row = self._filled
+        buffer = self._buffer
+        buffer[0, row] = self._question_code(question_id)
+        buffer[1, row] = role_code
+        buffer[2, row] = mode_code
+        buffer[3, row] = min(max(float(score), 0.0), SCORE_MAX)
+        buffer[4, row] = timestamp
+        self._filled += 1
+        if self._filled == self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        """Fold buffered answers into every aggregate"""
+        n = self._filled
+        if not n:
+            return
+        questions = self._buffer[0, :n].astype(np.int64)
+        roles = self._buffer[1, :n].astype(np.int64)
+        modes = self._buffer[2, :n].astype(np.int64)
+        scores = self._buffer[3, :n].copy()
+        skills = np.asarray(self._question_skill, dtype=np.int64)[questions]
+        periods = self._buffer[4, :n].astype("datetime64[s]").astype(TREND_PERIODS[self.trend_period]).astype(np.int64)
+
+        self.by_question.update(questions, scores)
+        self.by_skill.update(skills, scores)
+        self.by_role.update(roles, scores)
+        self.by_mode.update(modes, scores)
+        self.by_skill_period.update((skills << 32) | (periods & 0xFFFFFFFF), scores)
+        self.overall.update(np.zeros(n, dtype=np.int64), scores)
+
+        self.records += n
+        self.chunks += 1
+        self._filled = 0
+
+    # ---- Sources ----
+
+    def add_session(self, state: Dict) -> List[int]:
+        """Every scored answer of one session dict (InterviewSession.to_dict() form); returns [role, mode] codes"""
+        role = self.roles.code((state.get("resume_data") or {}).get("target_role"))
+        mode = self.modes.code(state.get("interview_mode"))
+        for question_id, entry in (state.get("answered_questions") or {}).items():
+            self.add_answer(question_id, entry.get("score"), _timestamp(entry.get("timestamp")), role, mode)
+        self.sessions += 1
+        return [role, mode]
+
+    def add_journal(self, directory: str):
+        """
+        Newest snapshot of a SessionJournal directory with the events after it
+        folded in, as compaction would: each session's last attempt at each
+        question, its final role and mode, and nothing from deleted sessions
+        """
+        from session_journal import SessionJournal
+
+        journal = SessionJournal(directory)
+        base, segments = journal.history()
+
+        # session id -> changes since the snapshot in to_dict() form ("created" replaces
+        # the snapshot state), or None once deleted
+        changes: Dict[str, Optional[Dict]] = {}
+        for n in segments:
+            for session_id, op, *args in journal.iter_segment(n):
+                if op == "create":
+                    changes[session_id] = {"created": True, "resume_data": {}, "interview_mode": "general",
+                                           "answered_questions": {}}
+                    continue
+                if op == "delete":
+                    changes[session_id] = None
+                    continue
+                if session_id in changes and changes[session_id] is None:
+                    continue  # Events after a delete are dropped on replay too
+                change = changes.setdefault(session_id, {"created": False, "resume_data": {}, "answered_questions": {}})
+                if op == "answered":
+                    question_id, _, score, timestamp = args
+                    change["answered_questions"][question_id] = {"score": score, "timestamp": timestamp}
+                elif op == "context" and args[0].get("target_role"):
+                    change["resume_data"]["target_role"] = args[0]["target_role"]
+                elif op == "mode":
+                    change["interview_mode"] = args[0]
+
+        if base is not None:
+            for state in journal.iter_snapshot(base):
+                session_id = state["session_id"]
+                if session_id not in changes:
+                    self.add_session(state)
+                elif changes[session_id] is not None and not changes[session_id]["created"]:
+                    self.add_session(_merge_state(state, changes.pop(session_id)))
+                # Otherwise deleted or recreated after the snapshot
+        for change in changes.values():
+            if change is not None and change["created"]:
+                self.add_session(change)
+
+    def add_source(self, path: str):
+        """A journal directory, a directory of exports, or one export file"""
+        started = time.perf_counter()
+        if os.path.isdir(path):
+            names = os.listdir(path)
+            if any(name.startswith(("journal-", "snapshot-")) for name in names):
+                self.add_journal(path)
+            else:
+                for pattern in ("*.jsonl", "*.jsonl.gz", "*.json"):
+                    for file_path in sorted(glob.glob(os.path.join(path, pattern))):
+                        for state in iter_export(file_path):
+                            self.add_session(state)
+        else:
+            for state in iter_export(path):
+                self.add_session(state)
+        self.flush()
+        self.sources.append(path)
+        self.seconds += time.perf_counter() - started
+
+    # ---- Report ----
+
+    def _table(self, stats: GroupStats, vocabulary: Vocabulary, name: str, min_count: int) -> List[Dict]:
+        rows = [{name: vocabulary.labels[key], **row} for key, row in stats.rows(min_count)]
+        return sorted(rows, key=lambda row: (-row["count"], row[name]))
+
+    def report(self, min_count: int = 1) -> Dict:
+        """JSON-serializable report of everything aggregated so far"""
+        self.flush()
+
+        questions = []
+        for row in self._table(self.by_question, self.questions, "question_id", min_count):
+            skill, bank_role = self.question_metadata.get(row["question_id"], (UNKNOWN, UNKNOWN))
+            questions.append({**row, "skill": skill, "bank_role": bank_role})
+
+        trends: Dict[str, List[Dict]] = {}
+        unit = TREND_PERIODS[self.trend_period]
+        for key, row in self.by_skill_period.rows(min_count):
+            skill = self.skills.labels[key >> 32]
+            offset = ((key & 0xFFFFFFFF) ^ 0x80000000) - 0x80000000  # Periods before 1970 are negative
+            period = np.array(offset, dtype=np.int64).astype(unit)
+            trends.setdefault(skill, []).append({"period": str(period), "count": row["count"], "mean": row["mean"]})
+        for points in trends.values():
+            points.sort(key=lambda point: point["period"])
+
+        overall = next((row for _, row in self.overall.rows()), None)
+        return {
+            "generated": datetime.now().isoformat(),
+            "sources": self.sources,
+            "records": self.records,
+            "sessions": self.sessions,
+            "chunks": self.chunks,
+            "chunk_size": self.chunk_size,
+            "seconds": round(self.seconds, 3),
+            "records_per_second": round(self.records / self.seconds) if self.seconds else None,
+            "min_count": min_count,
+            "overall": overall,
+            "questions": questions,
+            "skills": self._table(self.by_skill, self.skills, "skill", min_count),
+            "roles": self._table(self.by_role, self.roles, "role", min_count),
+            "interview_modes": self._table(self.by_mode, self.modes, "interview_mode", min_count),
+            "skill_trends": {"period": self.trend_period, "skills": trends}
+        }
+
+
+def load_question_metadata() -> Dict[str, Tuple[str, str]]:
+    """question id -> (skill, role) from the question bank"""
+    from rag.question_bank import load_bank
+
+    with contextlib.redirect_stdout(sys.stderr):  # Keep stdout for the report
+        _, bank, _ = load_bank()
+    return {q["id"]: (q.get("skill") or UNKNOWN, q.get("role") or UNKNOWN) for q in bank}
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        description="Cohort score statistics over session journals and exports",
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("sources", nargs="+", help="Journal directories, export directories or export files")
+    parser.add_argument("--output", help="Write the JSON report here (default: stdout)")
+    parser.add_argument("--chunk-size", type=int, default=ANALYTICS_CHUNK_SIZE)
+    parser.add_argument("--trend-period", choices=sorted(TREND_PERIODS), default="month")
+    parser.add_argument("--min-count", type=int, default=1, help="Leave out groups with fewer answers")
+    parser.add_argument("--no-bank", action="store_true", help="Don't join question skills/roles from the bank")
+    args = parser.parse_args(argv)
+
+    metadata = None
+    if not args.no_bank:
+        try:
+            metadata = load_question_metadata()
+        except Exception as e:
+            print(f"⚠️ Question bank unavailable ({e}); skills will be '{UNKNOWN}'", file=sys.stderr)
+
+    analytics = InterviewAnalytics(chunk_size=args.chunk_size, trend_period=args.trend_period,
+                                   question_metadata=metadata)
+    for source in args.sources:
+        if not os.path.exists(source):
+            parser.error(f"No such source: {source}")
+        analytics.add_source(source)
+
+    report = analytics.report(min_count=args.min_count)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"✓ {report['records']} answers from {report['sessions']} sessions "
+              f"({report['records_per_second']}/s) -> {args.output}", file=sys.stderr)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
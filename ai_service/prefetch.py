@@ -0,0 +1,356 @@
+"""
+Speculative Prefetch
+
+Uses the minutes a candidate spends answering to prepare the next request:
+- Next retrieve_phased batch, computed on a snapshot of the session
+- Guidance for questions already issued (local LLM only, never the paid backup)
+- Low priority: niced worker thread, and speculative work waits while
+  foreground requests or retrieval jobs are running
+- Stale work is cancelled when the session moves on (phase change, new asks,
+  newly covered skills), so a served batch is always what retrieval would return now
+
+Usage:
+    from prefetch import Prefetcher
+
+    prefetcher = Prefetcher(foreground=compute_pool)
+    prefetcher.schedule_batch(session, retriever.retrieve_phased, resume_text, job_description, top_k=10)
+
+    prefetched = await prefetcher.take_batch(session, resume_text, job_description, top_k=10)
+    if prefetched:
+        questions, phase = prefetched
+"""
+
+import asyncio
+import contextlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from compute_pool import ComputePool, _env_int
+
+# Master switch for speculative work
+PREFETCH_ENABLED = os.getenv("PREFETCH_ENABLED", "true").lower() not in ("0", "false", "no", "off")
+
+# Guidance warming holds the local LLM /evaluate needs: off until a client calls
+# /api/guidance, and then only for the next question(s) of each batch
+GUIDANCE_PREFETCH_ENABLED = os.getenv("GUIDANCE_PREFETCH_ENABLED", "false").lower() not in ("0", "false", "no", "off")
+GUIDANCE_PREFETCH_QUESTIONS = _env_int("GUIDANCE_PREFETCH_QUESTIONS", 1)
+
+# Background threads for speculative retrieval (kept small: it competes with real requests)
+PREFETCH_WORKERS = _env_int("PREFETCH_WORKERS", 1)
+
+# Nice value for those threads (Linux schedules threads individually)
+PREFETCH_NICE = _env_int("PREFETCH_NICE", 10)
+
+# Guidance answers kept warm, and for how long
+PREFETCH_CACHE_SIZE = _env_int("PREFETCH_CACHE_SIZE", 256)
+PREFETCH_TTL_SECONDS = _env_int("PREFETCH_TTL_SECONDS", 900)
+
+# How often deferred work re-checks whether the service is idle
+PREFETCH_POLL_SECONDS = 0.05
+
+
+def lower_thread_priority(niceness: int = PREFETCH_NICE):
+    """Renice the calling worker thread so foreground threads win the CPU"""
+    try:
+        thread_id = threading.get_native_id()
+        current = os.getpriority(os.PRIO_PROCESS, thread_id)
+        os.setpriority(os.PRIO_PROCESS, thread_id, max(current, niceness))
+    except (AttributeError, OSError):
+        pass  # Not supported here (e.g. Windows): deferring to foreground work still applies
+
+
+def retrieval_fingerprint(session, resume_text: str, job_description: str, top_k: int) -> tuple:
+    """Everything retrieve_phased reads; a prefetched batch is valid while this is unchanged"""
+    return (
+        session.current_phase,
+        session.interview_mode,
+        frozenset(session.asked_questions),
+        bool(session.answered_questions),  # Warmup leads with the introduction until the first answer
+        frozenset(session.covered_skills),
+        tuple(session.target_skills),
+        session.resume_data.get("education"),
+        session.resume_data.get("target_role"),
+        resume_text,
+        job_description,
+        top_k
+    )
+
+
+class _Job:
+    """One speculative computation and what it was computed for"""
+
+    __slots__ = ("key", "phase", "task", "started", "created")
+
+    def __init__(self, key, phase: str):
+        self.key = key
+        self.phase = phase
+        self.task: Optional[asyncio.Task] = None
+        self.started = False  # Work is actually running (not just waiting for an idle service)
+        self.created = time.monotonic()
+
+
+class Prefetcher:
+    """Speculative next-batch retrieval and guidance, served through the normal endpoints"""
+
+    def __init__(self, foreground: Optional[ComputePool] = None, workers: int = PREFETCH_WORKERS,
+                 cache_size: int = PREFETCH_CACHE_SIZE, ttl_seconds: float = PREFETCH_TTL_SECONDS,
+                 enabled: bool = PREFETCH_ENABLED):
+        self.enabled = enabled
+        self.foreground_pool = foreground
+        self.cache_size = cache_size
+        self.ttl_seconds = ttl_seconds
+        self.pool = ComputePool(
+            max_workers=workers,
+            max_queued=workers * 4,
+            thread_name_prefix="prefetch",
+            initializer=lower_thread_priority
+        )
+        self._llm_slot: Optional[asyncio.Semaphore] = None  # One speculative LLM call at a time
+
+        self._batches: Dict[str, _Job] = {}  # session_id -> next batch
+        self._batch_args: Dict[str, tuple] = {}  # session_id -> how its batches are retrieved
+        self._guidance: "OrderedDict[str, _Job]" = OrderedDict()  # prompt -> guidance (LRU)
+        self._session_guidance: Dict[str, Set[str]] = {}  # session_id -> prompts it scheduled
+        self._session_phase: Dict[str, str] = {}
+
+        # Counters (only touched from the event loop thread)
+        self.foreground_requests = 0
+        self.deferrals = 0
+        self.batch_hits = 0
+        self.batch_misses = 0
+        self.batch_cancelled = 0
+        self.guidance_hits = 0
+        self.guidance_misses = 0
+        self.guidance_cancelled = 0
+        self.failed = 0
+
+    # ---- priority ----
+
+    @contextlib.contextmanager
+    def foreground(self):
+        """Mark a real request as in flight (speculative work waits for it)"""
+        self.foreground_requests += 1
+        try:
+            yield
+        finally:
+            self.foreground_requests -= 1
+
+    def is_busy(self) -> bool:
+        """Foreground requests or retrieval jobs are running"""
+        pool_busy = self.foreground_pool is not None and self.foreground_pool.in_flight > 0
+        return self.foreground_requests > 0 or pool_busy
+
+    async def _wait_until_idle(self):
+        while self.is_busy():
+            self.deferrals += 1
+            await asyncio.sleep(PREFETCH_POLL_SECONDS)
+
+    def _cancel(self, job: Optional[_Job]) -> bool:
+        """Cancel a job that hasn't finished; True if anything was cancelled"""
+        if job is None or job.task is None or job.task.done():
+            return False
+        job.task.cancel()
+        return True
+
+    # ---- next question batch ----
+
+    def schedule_batch(self, session, retrieve: Callable, resume_text: str = "",
+                       job_description: str = "", top_k: int = 10):
+        """Start computing the batch the session's next generate-qa call would get"""
+        if not self.enabled:
+            return
+        self._note_phase(session)
+        self._batch_args[session.session_id] = (retrieve, resume_text, job_description, top_k)
+
+        key = retrieval_fingerprint(session, resume_text, job_description, top_k)
+        existing = self._batches.get(session.session_id)
+        if existing is not None and existing.key == key:
+            return
+        if self._cancel(existing):
+            self.batch_cancelled += 1
+
+        # retrieve_phased may advance the phase: run it on a copy, apply the phase when served
+        snapshot = session.snapshot()
+        job = _Job(key, session.current_phase)
+        job.task = asyncio.get_running_loop().create_task(
+            self._run_batch(job, retrieve, snapshot, resume_text, job_description, top_k)
+        )
+        self._batches[session.session_id] = job
+
+    def refresh_batch(self, session):
+        """Recompute the next batch after the session changed outside generate-qa (e.g. an answer)"""
+        args = self._batch_args.get(session.session_id)
+        if args is not None:
+            self.schedule_batch(session, *args)
+
+    async def _run_batch(self, job: _Job, retrieve: Callable, snapshot, resume_text: str,
+                         job_description: str, top_k: int) -> Optional[Tuple[List[Dict], str]]:
+        await self._wait_until_idle()
+        job.started = True
+        try:
+            questions = await self.pool.run(
+                retrieve,
+                session=snapshot,
+                resume_text=resume_text,
+                job_description=job_description,
+                top_k=top_k
+            )
+        except Exception as e:
+            self.failed += 1
+            print(f"⚠️ Prefetch of next batch failed: {e}")
+            return None
+        return questions, snapshot.current_phase
+
+    async def take_batch(self, session, resume_text: str = "", job_description: str = "",
+                         top_k: int = 10) -> Optional[Tuple[List[Dict], str]]:
+        """
+        Prefetched (questions, phase after retrieval) if still valid for the
+        session's current state, else None (caller retrieves as usual).
+        """
+        job = self._batches.pop(session.session_id, None)
+        if job is None:
+            self.batch_misses += 1
+            return None
+
+        key = retrieval_fingerprint(session, resume_text, job_description, top_k)
+        if job.key != key or not (job.started or job.task.done()):
+            # Stale, or still waiting for an idle moment: the foreground computes it now
+            if self._cancel(job):
+                self.batch_cancelled += 1
+            self.batch_misses += 1
+            return None
+
+        try:
+            result = await job.task
+        except asyncio.CancelledError:
+            result = None
+
+        if result is None:
+            self.batch_misses += 1
+            return None
+
+        self.batch_hits += 1
+        return result
+
+    # ---- guidance ----
+
+    def schedule_guidance(self, session_id: str, phase: str, key: str,
+                          compute: Callable[[], Awaitable]):
+        """
+        Warm guidance for an issued question. key identifies the request (the
+        prompt); compute() returns the response, or None if it shouldn't be cached.
+        """
+        if not self.enabled or key in self._guidance:
+            return
+
+        job = _Job(key, phase)
+        job.task = asyncio.get_running_loop().create_task(self._run_guidance(job, compute))
+        self._guidance[key] = job
+        self._session_guidance.setdefault(session_id, set()).add(key)
+        self._session_phase.setdefault(session_id, phase)
+
+        while len(self._guidance) > self.cache_size:
+            _, evicted = self._guidance.popitem(last=False)
+            if self._cancel(evicted):
+                self.guidance_cancelled += 1
+
+    async def _run_guidance(self, job: _Job, compute: Callable[[], Awaitable]):
+        if self._llm_slot is None:
+            self._llm_slot = asyncio.Semaphore(1)
+        await self._wait_until_idle()
+        async with self._llm_slot:
+            await self._wait_until_idle()
+            job.started = True
+            try:
+                return await compute()
+            except Exception as e:
+                self.failed += 1
+                print(f"⚠️ Guidance prefetch failed: {e}")
+                return None
+
+    async def take_guidance(self, key: str):
+        """Prefetched guidance for this request, or None (caller generates it)"""
+        job = self._guidance.get(key)
+        if job is None:
+            self.guidance_misses += 1
+            return None
+
+        expired = time.monotonic() - job.created > self.ttl_seconds
+        if expired or not (job.started or job.task.done()):
+            self._guidance.pop(key, None)
+            if self._cancel(job):
+                self.guidance_cancelled += 1
+            self.guidance_misses += 1
+            return None
+
+        # Shielded: other requests for the same guidance may be waiting on it too
+        result = await asyncio.shield(job.task)
+
+        if result is None:
+            self._guidance.pop(key, None)
+            self.guidance_misses += 1
+            return None
+
+        self._guidance.move_to_end(key)
+        self.guidance_hits += 1
+        return result
+
+    # ---- staleness ----
+
+    def _note_phase(self, session):
+        """On a phase change, drop the session's unfinished guidance for the old phase"""
+        previous = self._session_phase.get(session.session_id)
+        self._session_phase[session.session_id] = session.current_phase
+        if previous is None or previous == session.current_phase:
+            return
+
+        keys = self._session_guidance.get(session.session_id, set())
+        for key in list(keys):
+            job = self._guidance.get(key)
+            if job is None:
+                keys.discard(key)
+            elif job.phase != session.current_phase and self._cancel(job):
+                self._guidance.pop(key, None)
+                keys.discard(key)
+                self.guidance_cancelled += 1
+
+    def forget_session(self, session_id: str):
+        """Cancel and drop everything prefetched for a session"""
+        if self._cancel(self._batches.pop(session_id, None)):
+            self.batch_cancelled += 1
+        for key in self._session_guidance.pop(session_id, set()):
+            if self._cancel(self._guidance.pop(key, None)):
+                self.guidance_cancelled += 1
+        self._session_phase.pop(session_id, None)
+        self._batch_args.pop(session_id, None)
+
+    def get_statistics(self) -> Dict:
+        """Hit rates and pending work"""
+        return {
+            "enabled": self.enabled,
+            "pending_batches": sum(1 for job in self._batches.values() if not job.task.done()),
+            "ready_batches": sum(1 for job in self._batches.values() if job.task.done()),
+            "guidance_cached": len(self._guidance),
+            "batch_hits": self.batch_hits,
+            "batch_misses": self.batch_misses,
+            "batch_cancelled": self.batch_cancelled,
+            "guidance_hits": self.guidance_hits,
+            "guidance_misses": self.guidance_misses,
+            "guidance_cancelled": self.guidance_cancelled,
+            "deferrals": self.deferrals,
+            "failed": self.failed,
+            "pool": self.pool.get_statistics()
+        }
+
+    def shutdown(self):
+        """Cancel outstanding work and release the worker thread"""
+        for job in list(self._batches.values()) + list(self._guidance.values()):
+            self._cancel(job)
+        self._batches.clear()
+        self._batch_args.clear()
+        self._guidance.clear()
+        self._session_guidance.clear()
+        self.pool.shutdown()
@@ -0,0 +1,521 @@
+"""
+Question Calibration
+
+Batch job that fits each question's difficulty and discrimination from
+historical answers and proposes data-driven bank values:
+- Records: (candidate, question, score) from session journals and exports
+  (the sources interview_analytics.py reads). A candidate is one interview
+  session; only their last answer to a question counts
+- Model: 2PL IRT with 0-10 scores as fractional responses,
+  E[score / 10] = sigmoid(a * (theta - b)), fitted by marginal maximum
+  likelihood (EM over a quadrature grid, abilities ~ N(0, 1)). A Pearson
+  dispersion factor accounts for scores carrying more information than one
+  pass/fail. Priors log a ~ N(0, 0.5) and b ~ N(hand-assigned level, 1) keep
+  questions with few answers near their current values
+- Vectorized: each EM iteration is a few np.bincount passes over fixed-size
+  chunks of compact record arrays (about 12 bytes per record), so millions of
+  records fit on one machine
+- Mapping: b -> difficulty 1-5 (cut points in ability standard deviations);
+  the difficulty picks a weight category from question_weight_calibration.json
+  and the discrimination places the weight within that category's range
+- Output: the "empirical_calibration" section of question_weight_calibration.json
+  as a unified diff for review; --write applies it. The question bank applies
+  that section when it loads (rag/question_bank.py apply_calibration)
+
+Usage:
+    python question_calibration.py data/session_journal exports/ > calibration.diff
+    python question_calibration.py data/session_journal --report fit.json --write
+    python rag/question_bundle.py      # Recompile the bundle after --write
+
+    from question_calibration import QuestionCalibration
+    calibration = QuestionCalibration(hand_assigned)
+    calibration.add_source("data/session_journal")
+    fit = calibration.fit()
+"""
+
+import argparse
+import contextlib
+import difflib
+import glob
+import json
+import os
+import sys
+import time
+from array import array
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from interview_analytics import SCORE_MAX, Vocabulary, iter_export
+
+# Records per vectorized pass (temporaries are records x quadrature points)
+CALIBRATION_CHUNK_SIZE = 1 << 18
+
+# Proposals need this many answers; candidates with fewer answers are left out
+MIN_RESPONSES = 50
+MIN_CANDIDATE_ANSWERS = 3
+
+# Abilities are integrated over this grid (population N(0, 1), which fixes the scale)
+QUADRATURE = np.linspace(-4.0, 4.0, 21)
+
+# Priors (logit scale) and convergence
+PRIOR_SD_DIFFICULTY = 1.0
+PRIOR_SD_LOG_DISCRIMINATION = 0.5
+MAX_ITERATIONS = 500
+M_STEP_ITERATIONS = 2
+TOLERANCE = 1e-3
+
+# b below -1.5 -> difficulty 1, ..., above 1.5 -> 5 (level n is centred on b = n - 3)
+DIFFICULTY_CUTS = (-1.5, -0.5, 0.5, 1.5)
+
+# Difficulty -> weight_categories entry; discrimination 0.5-2 spans the category's range
+# on a log scale (a = 1 lands in the middle)
+DIFFICULTY_CATEGORIES = {
+    1: "foundation_questions",
+    2: "standard_questions",
+    3: "challenging_questions",
+    4: "elite_questions",
+    5: "elite_questions"
+}
+DISCRIMINATION_RANGE = (0.5, 2.0)
+
+# A new difficulty must clear the hand-assigned level's band by this many standard errors
+LEVEL_MARGIN_SE = 2.0
+
+# Smaller weight moves (with an unchanged difficulty) aren't proposed
+WEIGHT_TOLERANCE = 0.1
+
+SECTION = "empirical_calibration"
+
+
+def _sigmoid(z: np.ndarray) -> np.ndarray:
+    return 1.0 / (1.0 + np.exp(-np.clip(z, -30.0, 30.0)))
+
+
+def fit_2pl(candidates: np.ndarray, questions: np.ndarray, scores: np.ndarray,
+            n_candidates: int, n_questions: int, difficulty_prior: Optional[np.ndarray] = None,
+            chunk_size: int = CALIBRATION_CHUNK_SIZE, max_iterations: int = MAX_ITERATIONS,
+            tolerance: float = TOLERANCE) -> Dict:
+    """
+    Marginal maximum likelihood (EM) fit of a 2PL model to fractional
+    responses (scores in [0, 1]), abilities integrated over a quadrature grid.
+
+    E-step: each candidate's posterior over the grid. M-step: expected
+    answers and score mass per question and grid point, then Fisher scoring
+    of each question's (b, log a) with their priors. Both steps are
+    flattened np.bincount passes over chunks of records. Stops when no question
+    parameter moves more than tolerance. Returns per-question arrays
+    (b, a, standard errors, responses, mean score) and fit diagnostics.
+    """
+    k = len(QUADRATURE)
+    b_prior = np.zeros(n_questions) if difficulty_prior is None else np.asarray(difficulty_prior, dtype=np.float64)
+    b = b_prior.copy()
+    log_a = np.zeros(n_questions)
+    log_weights = -0.5 * QUADRATURE ** 2
+    log_weights -= np.log(np.exp(log_weights).sum())
+    slices = [slice(start, start + chunk_size) for start in range(0, len(scores), chunk_size)]
+    grid = np.arange(k)
+    precision_b = 1.0 / PRIOR_SD_DIFFICULTY ** 2
+    precision_log_a = 1.0 / PRIOR_SD_LOG_DISCRIMINATION ** 2
+
+    # Scores are less noisy than one coin flip: Pearson dispersion scales the E-step
+    dispersion = 1.0
+    converged = False
+    for iteration in range(1, max_iterations + 1):
+        # E-step: log-likelihood of every candidate at every grid point
+        p = _sigmoid(np.exp(log_a)[:, None] * (QUADRATURE[None, :] - b[:, None]))
+        log_p, log_q = np.log(np.clip(p, 1e-12, None)), np.log(np.clip(1 - p, 1e-12, None))
+        log_p /= dispersion
+        log_q /= dispersion
+        log_odds = log_p - log_q
+        log_likelihood = np.tile(log_weights, (n_candidates, 1))
+        for part in slices:
+            c, q, y = candidates[part], questions[part], scores[part]
+            values = np.take(log_odds, q, axis=0)
+            values *= y[:, None]
+            values += np.take(log_q, q, axis=0)
+            cells = (c[:, None] * k + grid).ravel()
+            log_likelihood += np.bincount(cells, weights=values.ravel(), minlength=n_candidates * k).reshape(-1, k)
+        peak = log_likelihood.max(axis=1, keepdims=True)
+        posterior = np.exp(log_likelihood - peak)
+        total = posterior.sum(axis=1, keepdims=True)
+        posterior /= total
+        marginal = float((peak + np.log(total)).sum())
+        del log_likelihood
+
+        # Expected answers (n), score mass (r) and squared score mass (r2) per question and grid point
+        n = np.zeros(n_questions * k)
+        r = np.zeros(n_questions * k)
+        r2 = np.zeros(n_questions * k)
+        for part in slices:
+            c, q, y = candidates[part], questions[part], scores[part]
+            weights = np.take(posterior, c, axis=0)
+            cells = (q[:, None] * k + grid).ravel()
+            n += np.bincount(cells, weights=weights.ravel(), minlength=n_questions * k)
+            weights *= y[:, None]
+            r += np.bincount(cells, weights=weights.ravel(), minlength=n_questions * k)
+            weights *= y[:, None]
+            r2 += np.bincount(cells, weights=weights.ravel(), minlength=n_questions * k)
+        n, r, r2 = n.reshape(-1, k), r.reshape(-1, k), r2.reshape(-1, k)
+        del posterior
+
+        # M-step: Fisher scoring of (b, log a) per question (2x2 information)
+        previous = np.concatenate([b, log_a])
+        for _ in range(M_STEP_ITERATIONS):
+            a = np.exp(log_a)
+            distance = QUADRATURE[None, :] - b[:, None]
+            p = _sigmoid(a[:, None] * distance)
+            residual, information = (r - n * p) / dispersion, n * p * (1 - p) / dispersion
+            grad_b = -a * residual.sum(axis=1) - (b - b_prior) * precision_b
+            grad_log_a = a * (distance * residual).sum(axis=1) - log_a * precision_log_a
+            info_bb = a * a * information.sum(axis=1) + precision_b
+            info_aa = a * a * (distance ** 2 * information).sum(axis=1) + precision_log_a
+            info_ba = -a * a * (distance * information).sum(axis=1)
+            det = info_bb * info_aa - info_ba ** 2
+            b += np.clip((info_aa * grad_b - info_ba * grad_log_a) / det, -1.0, 1.0)
+            log_a += np.clip((info_bb * grad_log_a - info_ba * grad_b) / det, -0.5, 0.5)
+
+        # Pearson dispersion: sum of (y - p)^2 / p(1 - p) over the expected answers
+        p = np.clip(_sigmoid(np.exp(log_a)[:, None] * (QUADRATURE[None, :] - b[:, None])), 1e-6, 1 - 1e-6)
+        dispersion = float(((r2 - 2 * r * p + n * p * p) / (p * (1 - p))).sum() / max(len(scores), 1))
+        dispersion = min(max(dispersion, 0.01), 1.0)
+
+        if np.abs(np.concatenate([b, log_a]) - previous).max(initial=0) < tolerance:
+            converged = True
+            break
+
+    a = np.exp(log_a)
+    responses = np.bincount(questions, minlength=n_questions)
+    return {
+        "difficulty": b,
+        "discrimination": a,
+        "difficulty_se": np.sqrt(info_aa / det),
+        "discrimination_se": a * np.sqrt(info_bb / det),
+        "responses": responses,
+        "mean_score": np.bincount(questions, weights=scores, minlength=n_questions) * SCORE_MAX / np.maximum(responses, 1),
+        "log_likelihood": marginal / max(n_candidates, 1),
+        "dispersion": dispersion,
+        "iterations": iteration,
+        "converged": converged
+    }
+
+
+def difficulty_level(b) -> np.ndarray:
+    """Bank difficulty 1-5 for fitted b values"""
+    return np.digitize(b, DIFFICULTY_CUTS) + 1
+
+
+def proposed_level(b: float, se: float, hand_level: Optional[int]) -> int:
+    """Fitted difficulty, or the hand-assigned one while b is within LEVEL_MARGIN_SE of its band"""
+    level = int(difficulty_level(b))
+    if hand_level in DIFFICULTY_CATEGORIES and level != hand_level:
+        bounds = (-np.inf,) + DIFFICULTY_CUTS + (np.inf,)
+        low, high = bounds[hand_level - 1], bounds[hand_level]
+        if low - LEVEL_MARGIN_SE * se <= b <= high + LEVEL_MARGIN_SE * se:
+            return hand_level
+    return level
+
+
+def calibrated_weight(level: int, discrimination: float, categories: Dict) -> float:
+    """Weight within the level's category range, higher for more discriminating questions"""
+    low, high = categories[DIFFICULTY_CATEGORIES[level]]["range"]
+    a_low, a_high = np.log(DISCRIMINATION_RANGE)
+    position = min(max((np.log(discrimination) - a_low) / (a_high - a_low), 0.0), 1.0)
+    return round(float(low + position * (high - low)), 2)
+
+
+class QuestionCalibration:
+    """Collects (candidate, question, score) records and fits the 2PL model"""
+
+    def __init__(self, hand_assigned: Optional[Dict[str, Tuple[Optional[int], float]]] = None,
+                 ambiguous: Iterable[str] = ()):
+        # question id -> (difficulty, weight) as hand-assigned in the bank
+        self.hand_assigned = hand_assigned or {}
+        # Ids used by several bank questions: answers can't be told apart, so no proposals
+        self.ambiguous = set(ambiguous)
+
+        self.candidates = Vocabulary()
+        self.questions = Vocabulary()
+        self._candidate = array('i')
+        self._question = array('i')
+        self._score = array('f')
+
+        self.sessions = 0
+        self.sources: List[str] = []
+        self.seconds = 0.0
+
+    def __len__(self) -> int:
+        return len(self._score)
+
+    # ---- Records ----
+
+    def add_answer(self, candidate: str, question_id: str, score):
+        """One scored answer (unscored answers are ignored)"""
+        if score is None:
+            return
+        self._candidate.append(self.candidates.code(candidate))
+        self._question.append(self.questions.code(question_id))
+        self._score.append(min(max(float(score), 0.0), SCORE_MAX) / SCORE_MAX)
+
+    def add_session(self, state: Dict):
+        """Every scored answer of one session dict (InterviewSession.to_dict() form)"""
+        session_id = state.get("session_id")
+        for question_id, entry in (state.get("answered_questions") or {}).items():
+            self.add_answer(session_id, question_id, entry.get("score"))
+        self.sessions += 1
+
+    def add_journal(self, directory: str):
+        """Newest snapshot of a SessionJournal directory, then the answers after it"""
+        from session_journal import SessionJournal
+
+        journal = SessionJournal(directory)
+        base, segments = journal.history()
+        if base is not None:
+            for state in journal.iter_snapshot(base):
+                self.add_session(state)
+        for n in segments:
+            for session_id, op, *args in journal.iter_segment(n):
+                if op == "answered":
+                    self.add_answer(session_id, args[0], args[2])
+                elif op == "create":
+                    self.sessions += 1
+
+    def add_source(self, path: str):
+        """A journal directory, a directory of exports, or one export file"""
+        started = time.perf_counter()
+        if os.path.isdir(path):
+            names = os.listdir(path)
+            if any(name.startswith(("journal-", "snapshot-")) for name in names):
+                self.add_journal(path)
+            else:
+                for pattern in ("*.jsonl", "*.jsonl.gz", "*.json"):
+                    for file_path in sorted(glob.glob(os.path.join(path, pattern))):
+                        for state in iter_export(file_path):
+                            self.add_session(state)
+        else:
+            for state in iter_export(path):
+                self.add_session(state)
+        self.sources.append(path)
+        self.seconds += time.perf_counter() - started
+
+    def records(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        (candidate, question, score) arrays: the last answer of each candidate
+        to each question, from candidates with at least MIN_CANDIDATE_ANSWERS
+        """
+        candidates = np.frombuffer(self._candidate, dtype=np.int32)
+        questions = np.frombuffer(self._question, dtype=np.int32)
+        scores = np.frombuffer(self._score, dtype=np.float32)
+
+        # Reversed, np.unique's first index is the last attempt
+        pair = candidates.astype(np.int64) * max(len(self.questions.labels), 1) + questions
+        _, first = np.unique(pair[::-1], return_index=True)
+        keep = np.sort(len(pair) - 1 - first)
+        candidates, questions, scores = candidates[keep], questions[keep], scores[keep]
+
+        answers = np.bincount(candidates, minlength=len(self.candidates.labels))
+        keep = answers[candidates] >= MIN_CANDIDATE_ANSWERS
+        return candidates[keep], questions[keep], scores[keep]
+
+    # ---- Fit ----
+
+    def fit(self, chunk_size: int = CALIBRATION_CHUNK_SIZE, max_iterations: int = MAX_ITERATIONS,
+            tolerance: float = TOLERANCE) -> Dict:
+        """Fit every question seen so far; fit_2pl's result plus question_ids, records, candidates and seconds"""
+        started = time.perf_counter()
+        candidates, questions, scores = self.records()
+        kept, candidates = np.unique(candidates, return_inverse=True)
+        prior = np.array([
+            (self.hand_assigned.get(question_id, (None, None))[0] or 3) - 3
+            for question_id in self.questions.labels
+        ], dtype=np.float64)
+        result = fit_2pl(
+            candidates, questions, scores.astype(np.float64),
+            len(kept), len(self.questions.labels), prior,
+            chunk_size=chunk_size, max_iterations=max_iterations, tolerance=tolerance
+        )
+        result["question_ids"] = list(self.questions.labels)
+        result["records"] = len(scores)
+        result["candidates"] = len(kept)
+        result["seconds"] = round(time.perf_counter() - started, 3)
+        return result
+
+    def proposals(self, fit: Dict, categories: Dict, min_responses: int = MIN_RESPONSES) -> Tuple[Dict, List[Dict]]:
+        """
+        ({question id: section entry} for questions whose difficulty or weight
+        should change, one report row per fitted question with its status)
+        """
+        changes, rows = {}, []
+        for code, question_id in enumerate(fit["question_ids"]):
+            hand = self.hand_assigned.get(question_id)
+            b, a = float(fit["difficulty"][code]), float(fit["discrimination"][code])
+            level = proposed_level(b, float(fit["difficulty_se"][code]), hand[0] if hand else None)
+            weight = calibrated_weight(level, a, categories)
+            row = {
+                "question_id": question_id,
+                "responses": int(fit["responses"][code]),
+                "mean_score": round(float(fit["mean_score"][code]), 2),
+                "location": round(b, 3),
+                "location_se": round(float(fit["difficulty_se"][code]), 3),
+                "discrimination": round(a, 3),
+                "discrimination_se": round(float(fit["discrimination_se"][code]), 3),
+                "difficulty": level,
+                "weight": weight,
+                "hand_assigned": list(hand) if hand else None
+            }
+            if hand is None:
+                row["status"] = "not_in_bank"
+            elif question_id in self.ambiguous:
+                row["status"] = "ambiguous_id"
+            elif row["responses"] < min_responses:
+                row["status"] = "insufficient_data"
+            elif level == hand[0] and abs(weight - hand[1]) < WEIGHT_TOLERANCE:
+                row["status"] = "unchanged"
+            else:
+                row["status"] = "changed"
+                changes[question_id] = {
+                    "difficulty": level,
+                    "weight": weight,
+                    "discrimination": row["discrimination"],
+                    "location": row["location"],
+                    "responses": row["responses"],
+                    "hand_assigned": row["hand_assigned"]
+                }
+            rows.append(row)
+        rows.sort(key=lambda row: -row["responses"])
+        return changes, rows
+
+    def section(self, fit: Dict, changes: Dict, min_responses: int = MIN_RESPONSES) -> Optional[Dict]:
+        """The empirical_calibration section for these changes (None when there are none)"""
+        if not changes:
+            return None
+        return {
+            "description": "Fitted by question_calibration.py (2PL IRT); overrides each question's "
+                           "difficulty and weight when the bank loads",
+            "model": "2pl_irt",
+            "fitted": datetime.now().isoformat(timespec="seconds"),
+            "records": fit["records"],
+            "candidates": fit["candidates"],
+            "min_responses": min_responses,
+            "questions": {question_id: changes[question_id] for question_id in sorted(changes)}
+        }
+
+
+def render_calibration(text: str, section: Optional[Dict]) -> str:
+    """
+    question_weight_calibration.json text with its empirical_calibration
+    section replaced (or removed when section is None).
+
+    Everything before the section is kept byte for byte and each question is
+    one line, so the diff shows exactly the proposed changes.
+    """
+    document = json.loads(text)
+    ending = text[len(text.rstrip()):] or "\n"
+    marker = f',\n  "{SECTION}": '
+    if marker in text:
+        head = text[:text.index(marker)]
+    else:
+        head = text.rstrip()[:-1].rstrip()  # Without the closing brace
+
+    if section is None:
+        rendered = head + "\n}" + ending
+    else:
+        lines = [f'    {json.dumps(key)}: {json.dumps(value)},' for key, value in section.items() if key != "questions"]
+        entries = [f'      {json.dumps(question_id)}: {json.dumps(entry)}' for question_id, entry in section["questions"].items()]
+        lines.append('    "questions": {\n' + ",\n".join(entries) + '\n    }')
+        rendered = head + marker + "{\n" + "\n".join(lines) + "\n  }\n}" + ending
+
+    expected = {key: value for key, value in document.items() if key != SECTION}
+    if section is not None:
+        expected[SECTION] = section
+    if json.loads(rendered) != expected:
+        raise ValueError(f'"{SECTION}" must be the last key of the calibration file')
+    return rendered
+
+
+def load_hand_assigned() -> Tuple[Dict[str, Tuple[Optional[int], float]], List[str]]:
+    """question id -> (difficulty, weight) as written in the bank files, and ids used more than once"""
+    from rag.question_bank import flatten_pools, load_question_sets
+
+    with contextlib.redirect_stdout(sys.stderr):  # Keep stdout for the diff
+        bank, _ = flatten_pools(load_question_sets(calibrated=False))
+    counts = Counter(q.get("id") for q in bank)
+    hand_assigned = {}
+    for q in bank:
+        difficulty = q.get("difficulty")
+        hand_assigned.setdefault(q.get("id"), (
+            difficulty if isinstance(difficulty, int) else None,
+            float(q.get("weight", 1.0))
+        ))
+    return hand_assigned, [question_id for question_id, count in counts.items() if count > 1]
+
+
+def main(argv: Optional[List[str]] = None):
+    from rag.question_bank import CALIBRATION_FILE, resolve_path
+
+    parser = argparse.ArgumentParser(
+        description="Fit question difficulty/discrimination (2PL IRT) and propose bank calibration",
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("sources", nargs="+", help="Journal directories, export directories or export files")
+    parser.add_argument("--calibration", default=resolve_path(CALIBRATION_FILE), help="Calibration file to diff against")
+    parser.add_argument("--diff", help="Write the unified diff here (default: stdout)")
+    parser.add_argument("--report", help="Write every question's fit as JSON here")
+    parser.add_argument("--write", action="store_true", help="Apply the proposed section to the calibration file")
+    parser.add_argument("--min-responses", type=int, default=MIN_RESPONSES)
+    parser.add_argument("--max-iterations", type=int, default=MAX_ITERATIONS)
+    parser.add_argument("--chunk-size", type=int, default=CALIBRATION_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    hand_assigned, ambiguous = load_hand_assigned()
+    calibration = QuestionCalibration(hand_assigned, ambiguous)
+    for source in args.sources:
+        if not os.path.exists(source):
+            parser.error(f"No such source: {source}")
+        calibration.add_source(source)
+    print(f"✓ {len(calibration)} answers from {calibration.sessions} sessions in {calibration.seconds:.1f}s",
+          file=sys.stderr)
+
+    fit = calibration.fit(chunk_size=args.chunk_size, max_iterations=args.max_iterations)
+    if not fit["converged"]:
+        print(f"⚠️ Fit did not converge in {fit['iterations']} iterations", file=sys.stderr)
+    print(f"✓ Fitted {len(fit['question_ids'])} questions from {fit['records']} records "
+          f"({fit['candidates']} candidates, {fit['iterations']} iterations, {fit['seconds']}s)", file=sys.stderr)
+
+    with open(args.calibration, "r", encoding="utf-8") as f:
+        current = f.read()
+    changes, rows = calibration.proposals(fit, json.loads(current)["weight_categories"], args.min_responses)
+    proposed = render_calibration(current, calibration.section(fit, changes, args.min_responses))
+    statuses = Counter(row["status"] for row in rows)
+    print(f"✓ {statuses['changed']} changed, {statuses['unchanged']} unchanged, "
+          f"{statuses['insufficient_data']} below {args.min_responses} answers, "
+          f"{statuses['ambiguous_id'] + statuses['not_in_bank']} ambiguous or not in the bank", file=sys.stderr)
+
+    if args.report:
+        report = {key: fit[key] for key in ("records", "candidates", "iterations", "converged", "seconds",
+                                            "log_likelihood", "dispersion")}
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump({**report, "sources": calibration.sources, "questions": rows}, f, indent=2)
+
+    name = os.path.relpath(args.calibration, os.path.dirname(os.path.abspath(__file__)))
+    diff = "".join(difflib.unified_diff(
+        current.splitlines(keepends=True), proposed.splitlines(keepends=True), f"a/{name}", f"b/{name}"
+    ))
+    if args.diff:
+        with open(args.diff, "w", encoding="utf-8") as f:
+            f.write(diff)
+    else:
+        sys.stdout.write(diff)
+
+    if args.write and proposed != current:
+        tmp_path = args.calibration + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(proposed)
+        os.replace(tmp_path, args.calibration)
+        print(f"✅ Wrote {args.calibration} (recompile the bundle: python rag/question_bundle.py)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+Embedding Store Module
+
+Handles:
+- Content hash per question (embedded text: question + ideal_points)
+- Memory-mapped .npy store of embeddings keyed by that hash
+- Incremental builds: only new or changed questions are encoded
+
+Layout (one directory per embedding model):
+    data/embedding_store/<model>/vectors.npy     float32 [rows, dimension], memory-mapped
+    data/embedding_store/<model>/manifest.json   {"model", "dimension", "hashes": [row -> content hash]}
+
+Usage:
+    from rag.embedding_store import EmbeddingStore
+
+    store = EmbeddingStore('data/embedding_store/all-MiniLM-L6-v2', model_id='all-MiniLM-L6-v2')
+    texts = [question_to_text(q) for q in questions]
+    vectors = store.embeddings_for(texts, encode=encode_texts)
+    print(store.last_build)   # {'reused': 503, 'encoded': 1, ...}
+"""
+
+import hashlib
+import json
+import os
+import time
+from typing import Callable, Dict, List
+
+import numpy as np
+
+VECTORS_FILE = 'vectors.npy'
+MANIFEST_FILE = 'manifest.json'
+
+# Rewrite the store without unreferenced rows once they outnumber live ones
+COMPACT_RATIO = 1.0
+
+
+def text_hash(text: str) -> str:
+    """Content hash of the text an embedding was computed from"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class EmbeddingStore:
+    """Append-only embedding cache on disk, keyed by content hash"""
+
+    def __init__(self, path: str, model_id: str):
+        self.path = path
+        self.model_id = model_id
+        self.vectors = None          # np.memmap [rows, dimension] or None when empty
+        self.row_of: Dict[str, int] = {}
+        self.last_build: Dict = {}
+        self._load()
+
+    @property
+    def vectors_path(self) -> str:
+        return os.path.join(self.path, VECTORS_FILE)
+
+    @property
+    def manifest_path(self) -> str:
+        return os.path.join(self.path, MANIFEST_FILE)
+
+    def _load(self):
+        if not (os.path.exists(self.vectors_path) and os.path.exists(self.manifest_path)):
+            return
+        with open(self.manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('model') != self.model_id:
+            print(f"⚠️  Embedding store was built with {manifest.get('model')}, starting fresh for {self.model_id}")
+            return
+
+        vectors = np.load(self.vectors_path, mmap_mode='r')
+        hashes = manifest.get('hashes', [])
+        if len(hashes) != len(vectors):
+            print("⚠️  Embedding store manifest does not match vectors.npy, starting fresh")
+            return
+
+        self.vectors = vectors
+        self.row_of = {h: row for row, h in enumerate(hashes)}
+
+    def __len__(self) -> int:
+        return len(self.row_of)
+
+    def embeddings_for(
+        self,
+        texts: List[str],
+        encode: Callable[[List[str]], np.ndarray],
+        compact: bool = False
+    ) -> np.ndarray:
+        """
+        Embeddings for texts in order, encoding only those not in the store.
+
+        Args:
+            texts: Embedded text of each question (question_to_text)
+            encode: Batch encoder for a list of texts
+            compact: texts are the whole bank; drop stale rows once they
+                outnumber live ones
+        """
+        started = time.perf_counter()
+        hashes = [text_hash(text) for text in texts]
+
+        missing = {}
+        for text, h in zip(texts, hashes):
+            if h not in self.row_of and h not in missing:
+                missing[h] = text
+
+        if missing:
+            new_vectors = np.asarray(encode(list(missing.values())), dtype='float32')
+            self._append(list(missing.keys()), new_vectors)
+
+        rows = np.fromiter((self.row_of[h] for h in hashes), dtype='int64', count=len(hashes))
+        embeddings = np.asarray(self.vectors[rows], dtype='float32') if len(rows) else np.zeros((0, 0), dtype='float32')
+
+        self.last_build = {
+            "questions": len(texts),
+            "reused": len(texts) - sum(1 for h in hashes if h in missing),
+            "encoded": len(missing),
+            "seconds": round(time.perf_counter() - started, 3)
+        }
+        print(f"✓ Embeddings: {self.last_build['reused']} reused, {self.last_build['encoded']} encoded "
+              f"({self.last_build['seconds']}s)")
+
+        live = set(hashes)
+        if compact and len(self.row_of) - len(live) > COMPACT_RATIO * len(live):
+            self.compact(live)
+
+        return embeddings
+
+    def _append(self, hashes: List[str], new_vectors: np.ndarray):
+        """Write old rows + new rows to a fresh .npy and swap it in atomically"""
+        if self.vectors is not None and len(self.vectors):
+            if self.vectors.shape[1] != new_vectors.shape[1]:
+                raise ValueError(
+                    f"Embedding dimension changed ({self.vectors.shape[1]} -> {new_vectors.shape[1]}) "
+                    f"for model {self.model_id}; delete {self.path} to rebuild"
+                )
+            merged_hashes = list(self.row_of) + hashes
+            self._write(merged_hashes, [self.vectors, new_vectors])
+        else:
+            self._write(hashes, [new_vectors])
+
+    def compact(self, live_hashes):
+        """Drop rows no current question refers to"""
+        keep = [h for h in self.row_of if h in live_hashes]
+        rows = np.array([self.row_of[h] for h in keep], dtype='int64')
+        print(f"✓ Compacting embedding store: {len(self.row_of)} -> {len(keep)} rows")
+        self._write(keep, [np.asarray(self.vectors[rows])])
+
+    def _write(self, hashes: List[str], blocks: List[np.ndarray]):
+        os.makedirs(self.path, exist_ok=True)
+        rows = sum(len(block) for block in blocks)
+        dimension = blocks[0].shape[1]
+
+        tmp_vectors = self.vectors_path + '.tmp'
+        out = np.lib.format.open_memmap(tmp_vectors, mode='w+', dtype='float32', shape=(rows, dimension))
+        offset = 0
+        for block in blocks:
+            out[offset:offset + len(block)] = block
+            offset += len(block)
+        out.flush()
+        del out
+
+        tmp_manifest = self.manifest_path + '.tmp'
+        with open(tmp_manifest, 'w', encoding='utf-8') as f:
+            json.dump({"model": self.model_id, "dimension": dimension, "hashes": hashes}, f)
+
+        # Release the old mapping before replacing the file under it
+        self.vectors = None
+        os.replace(tmp_vectors, self.vectors_path)
+        os.replace(tmp_manifest, self.manifest_path)
+
+        self.vectors = np.load(self.vectors_path, mmap_mode='r')
+        self.row_of = {h: row for row, h in enumerate(hashes)}
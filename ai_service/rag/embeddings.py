@@ -3,7 +3,10 @@ RAG Embeddings Module
 
 Handles:
 - Creating embeddings for questions
-- Building FAISS/ChromaDB index
+- Building FAISS/ChromaDB index (type from VECTOR_INDEX_TYPE, see rag/vector_index.py)
+- Unified bank index over every question file (python rag/embeddings.py --bank)
+- Incremental builds: embeddings cached by content hash, only changed questions re-encoded
+- Batched, length-sorted, optionally multi-process encoding for index builds
 - Storing and loading embeddings
 
 Usage:
@@ -14,62 +17,189 @@ Usage:
     index = build_index(embeddings)
 """
 
-from sentence_transformers import SentenceTransformer
 import numpy as np
+import hashlib
 import json
+import multiprocessing
+import os
+import sys
+import threading
+import time
 from typing import List, Dict
 import faiss
 
+if __package__ in (None, ""):
+    # Allow `python rag/embeddings.py` from the ai_service directory
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rag.embedding_store import EmbeddingStore, text_hash
+from rag.question_bank import DATA_DIR
+from rag.vector_index import VECTOR_INDEX_TYPE, build_vector_index, index_settings, prepare_vectors
+
 # Model for embeddings
 MODEL_NAME = "all-MiniLM-L6-v2"  # 384 dimensions, fast, good quality
+
+# Embedding backend: "torch" (SentenceTransformer) or "onnx" (int8 ONNX Runtime, CPU serving)
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch").lower()
+ONNX_MODEL_DIR = os.getenv(
+    "ONNX_MODEL_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "models", f"{MODEL_NAME}-onnx")
+)
+
+# Unified index over every question bank (vector id = bank position)
+BANK_INDEX_PREFIX = os.path.join(DATA_DIR, 'bank_vectors')
+
+# Index build encoding: texts per model call and encoder processes (0 = one per core)
+EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", "64"))
+EMBED_WORKERS = int(os.getenv("EMBED_WORKERS", "1"))
+
+# Content-hashed embedding cache shared by index builds (one subdirectory per model)
+EMBEDDING_STORE_DIR = os.getenv("EMBEDDING_STORE_DIR", os.path.join(DATA_DIR, 'embedding_store'))
+
 model = None
+_model_lock = threading.Lock()
 
 def get_model():
-    """Lazy load the embedding model"""
+    """Lazy load the embedding model for the configured backend"""
     global model
     if model is None:
-        print(f"Loading embedding model: {MODEL_NAME}")
-        model = SentenceTransformer(MODEL_NAME)
+        with _model_lock:
+            if model is None:
+                if EMBEDDING_BACKEND == "onnx":
+                    from rag.onnx_encoder import OnnxSentenceEncoder
+                    print(f"Loading embedding model: {MODEL_NAME} (ONNX int8 from {ONNX_MODEL_DIR})")
+                    model = OnnxSentenceEncoder(ONNX_MODEL_DIR)
+                else:
+                    # Imported here so the ONNX backend never pulls in torch
+                    from sentence_transformers import SentenceTransformer
+                    print(f"Loading embedding model: {MODEL_NAME}")
+                    model = SentenceTransformer(MODEL_NAME)
     return model
 
+def get_model_id() -> str:
+    """Model identity for caches (int8 ONNX vectors differ slightly from torch ones)"""
+    if EMBEDDING_BACKEND == "onnx":
+        return f"{MODEL_NAME}:onnx-int8"
+    return MODEL_NAME
+
+def question_to_text(question: Dict) -> str:
+    """Text embedded for a question: question + ideal_points for richer representation"""
+    text = question['question']
+    if question.get('ideal_points'):
+        text += ' ' + ' '.join(question['ideal_points'])
+    return text
+
 def create_question_embedding(question: Dict) -> np.ndarray:
     """
     Create embedding for a single question.
     Combines question text + ideal_points for richer representation.
     """
     m = get_model()
+    embedding = m.encode(question_to_text(question), convert_to_numpy=True)
+    return embedding
+
+def length_sorted_batches(texts: List[str], batch_size: int) -> List[np.ndarray]:
+    """
+    Index batches of similar-length texts.
     
-    # Combine text for embedding
-    text = question['question']
-    if question.get('ideal_points'):
-        text += ' ' + ' '.join(question['ideal_points'])
+    Each batch is padded to its longest text, so grouping by length keeps
+    padding (wasted transformer compute) small.
+    """
+    order = np.argsort([len(text) for text in texts], kind='stable')
+    return [order[start:start + batch_size] for start in range(0, len(order), batch_size)]
+
+def padding_efficiency(texts: List[str], batches: List[np.ndarray]) -> float:
+    """Share of padded batch slots holding real text (by character length)"""
+    lengths = np.array([len(text) for text in texts])
+    padded = sum(len(batch) * lengths[batch].max() for batch in batches if len(batch))
+    return float(lengths.sum() / padded) if padded else 1.0
+
+def _init_encode_worker(threads: int):
+    """Process-pool initializer: split the cores between workers"""
+    os.environ["OMP_NUM_THREADS"] = str(threads)
+    if EMBEDDING_BACKEND != "onnx":
+        import torch
+        torch.set_num_threads(threads)
+
+def _encode_batch(batch: List[str]) -> np.ndarray:
+    """Encode one batch with this process's model"""
+    return np.asarray(get_model().encode(batch, batch_size=len(batch), convert_to_numpy=True), dtype='float32')
+
+def encode_texts(texts: List[str], batch_size: int = None, workers: int = None) -> np.ndarray:
+    """
+    Encode texts in length-sorted batches, optionally across processes.
     
-    embedding = m.encode(text, convert_to_numpy=True)
-    return embedding
+    Args:
+        texts: Texts to encode
+        batch_size: Texts per model call (default EMBED_BATCH_SIZE)
+        workers: Encoder processes (default EMBED_WORKERS; 0 = one per core)
+    
+    Returns:
+        float32 array [len(texts), dimension] in input order
+    """
+    batch_size = batch_size or EMBED_BATCH_SIZE
+    workers = EMBED_WORKERS if workers is None else workers
+    workers = workers or os.cpu_count() or 1
+    
+    batches = length_sorted_batches(texts, batch_size)
+    workers = max(1, min(workers, len(batches)))
+    print(f"Creating embeddings for {len(texts)} questions "
+          f"(batch {batch_size}, {workers} worker{'s' if workers > 1 else ''})...")
+    
+    started = time.perf_counter()
+    batch_texts = [[texts[i] for i in batch] for batch in batches]
+    if workers > 1:
+        threads = max(1, (os.cpu_count() or 1) // workers)
+        context = multiprocessing.get_context("spawn")  # torch is not fork-safe
+        with context.Pool(workers, initializer=_init_encode_worker, initargs=(threads,)) as pool:
+            results = pool.map(_encode_batch, batch_texts)
+    else:
+        results = [_encode_batch(batch) for batch in batch_texts]
+    
+    if not results:
+        return np.zeros((0, 0), dtype='float32')
+    
+    # Scatter batch rows back to input order
+    embeddings = np.empty((len(texts), results[0].shape[1]), dtype='float32')
+    for batch, vectors in zip(batches, results):
+        embeddings[batch] = vectors
+    
+    elapsed = time.perf_counter() - started
+    print(f"Created embeddings: shape {embeddings.shape} in {elapsed:.2f}s "
+          f"({len(texts) / elapsed:.1f} q/s, padding efficiency {padding_efficiency(texts, batches):.0%})")
+    return embeddings
 
 def create_embeddings(questions: List[Dict]) -> np.ndarray:
     """Create embeddings for all questions"""
-    print(f"Creating embeddings for {len(questions)} questions...")
-    
-    embeddings = []
-    for q in questions:
-        emb = create_question_embedding(q)
-        embeddings.append(emb)
+    return encode_texts([question_to_text(q) for q in questions])
+
+def get_embedding_store() -> EmbeddingStore:
+    """Embedding store for the configured model"""
+    model_dir = get_model_id().replace(':', '-').replace('/', '-')
+    return EmbeddingStore(os.path.join(EMBEDDING_STORE_DIR, model_dir), get_model_id())
+
+def embed_questions(questions: List[Dict], whole_bank: bool = False) -> np.ndarray:
+    """
+    Embeddings for questions, encoding only those whose text is not in the store.
     
-    embeddings = np.array(embeddings).astype('float32')
-    print(f"Created embeddings: shape {embeddings.shape}")
-    return embeddings
+    whole_bank lets the store drop embeddings of questions no longer in the bank.
+    """
+    store = get_embedding_store()
+    return store.embeddings_for([question_to_text(q) for q in questions], encode_texts, compact=whole_bank)
+
+def content_hashes(questions: List[Dict]) -> List[str]:
+    """Content hash of each question's embedded text (bank order)"""
+    return [text_hash(question_to_text(q)) for q in questions]
 
-def build_faiss_index(embeddings: np.ndarray):
+def build_faiss_index(embeddings: np.ndarray, index_type: str = VECTOR_INDEX_TYPE):
     """Build FAISS index for fast similarity search"""
     dimension = embeddings.shape[1]
     
-    # Use IndexFlatL2 for exact search (good for small datasets)
-    # For larger datasets, use IndexIVFFlat or IndexHNSW
-    index = faiss.IndexFlatL2(dimension)
-    index.add(embeddings)
+    # flat_l2/flat_ip are exact (good for small datasets);
+    # for larger datasets, use hnsw or ivf_flat
+    index = build_vector_index(embeddings, index_type)
     
-    print(f"Built FAISS index: {index.ntotal} vectors, {dimension} dimensions")
+    print(f"Built FAISS index ({index_type}): {index.ntotal} vectors, {dimension} dimensions")
     return index
 
 def save_index(index, questions: List[Dict], path_prefix: str = 'data/embeddings'):
@@ -81,6 +211,101 @@ def save_index(index, questions: List[Dict], path_prefix: str = 'data/embeddings
     
     print(f"Saved index and metadata to {path_prefix}.*")
 
+def bank_fingerprint(questions: List[Dict]) -> str:
+    """Hash of every (id, embedded text) pair in bank order, plus the model identity"""
+    digest = hashlib.sha256(get_model_id().encode('utf-8'))
+    for q in questions:
+        digest.update(b"\x00")
+        digest.update(str(q.get('id')).encode('utf-8'))
+        digest.update(b"\x01")
+        digest.update(question_to_text(q).encode('utf-8'))
+    return digest.hexdigest()
+
+def build_bank_index(questions: List[Dict], index_type: str = VECTOR_INDEX_TYPE):
+    """
+    Build one vector index over every question in the bank.
+    
+    Vector ids are bank positions (IDMap), not question ids: several banks
+    reuse the same id string for different questions.
+    """
+    embeddings = embed_questions(questions, whole_bank=True)
+    index = build_vector_index(embeddings, index_type, ids=np.arange(len(questions)))
+    print(f"Built bank index ({index_type}): {index.ntotal} vectors")
+    return index
+
+def save_bank_index(index, questions: List[Dict], path_prefix: str = BANK_INDEX_PREFIX):
+    """Save the bank index and its manifest (vector id -> question id)"""
+    faiss.write_index(index, f"{path_prefix}.index")
+    
+    manifest = {
+        "model": get_model_id(),
+        "fingerprint": bank_fingerprint(questions),
+        **index_settings(index),
+        "question_ids": [q.get('id') for q in questions],
+        "content_hashes": content_hashes(questions)
+    }
+    with open(f"{path_prefix}.json", 'w', encoding='utf-8') as f:
+        json.dump(manifest, f)
+    
+    print(f"Saved bank index to {path_prefix}.*")
+
+def load_or_build_bank_index(
+    questions: List[Dict],
+    path_prefix: str = BANK_INDEX_PREFIX,
+    index_type: str = VECTOR_INDEX_TYPE
+):
+    """Load the bank index if it matches the current bank, model and index type, otherwise rebuild it"""
+    fingerprint = bank_fingerprint(questions)
+    
+    if os.path.exists(f"{path_prefix}.index") and os.path.exists(f"{path_prefix}.json"):
+        with open(f"{path_prefix}.json", 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get("index_type", "flat_l2") != index_type or manifest.get("model") != get_model_id():
+            print(f"⚠️  Bank index is {manifest.get('index_type', 'flat_l2')}/{manifest.get('model')}, "
+                  f"want {index_type}/{get_model_id()}, rebuilding...")
+        elif manifest.get("fingerprint") == fingerprint:
+            index = faiss.read_index(f"{path_prefix}.index")
+            print(f"Loaded bank index ({index_type}): {index.ntotal} vectors")
+            return index
+        else:
+            index = append_bank_index(manifest, questions, path_prefix)
+            if index is not None:
+                return index
+            print("⚠️  Bank index is stale (questions changed), rebuilding from embedding store...")
+    
+    index = build_bank_index(questions, index_type)
+    try:
+        save_bank_index(index, questions, path_prefix)
+    except OSError as e:
+        print(f"⚠️  Could not save bank index (using in-memory copy): {e}")
+    return index
+
+def append_bank_index(manifest: Dict, questions: List[Dict], path_prefix: str = BANK_INDEX_PREFIX):
+    """
+    Extend a saved bank index when questions were only appended.
+    
+    Returns None when earlier questions changed or moved (a rebuild is needed).
+    """
+    old_hashes = manifest.get("content_hashes")
+    new_hashes = content_hashes(questions)
+    if not old_hashes or len(old_hashes) >= len(new_hashes) or new_hashes[:len(old_hashes)] != old_hashes:
+        return None
+    
+    index = faiss.read_index(f"{path_prefix}.index")
+    if index.ntotal != len(old_hashes):
+        return None
+    
+    added = questions[len(old_hashes):]
+    vectors = prepare_vectors(embed_questions(added), manifest.get("index_type", "flat_l2"))
+    index.add_with_ids(vectors, np.arange(len(old_hashes), len(questions), dtype='int64'))
+    print(f"✓ Appended {len(added)} questions to bank index ({index.ntotal} vectors)")
+    
+    try:
+        save_bank_index(index, questions, path_prefix)
+    except OSError as e:
+        print(f"⚠️  Could not save bank index (using in-memory copy): {e}")
+    return index
+
 def load_index(path_prefix: str = 'data/embeddings'):
     """Load FAISS index and question metadata"""
     index = faiss.read_index(f"{path_prefix}.index")
@@ -92,6 +317,30 @@ def load_index(path_prefix: str = 'data/embeddings'):
     return index, questions
 
 if __name__ == "__main__":
+    import argparse
+    from rag.question_bank import load_bank
+    
+    parser = argparse.ArgumentParser(description="Build embedding indexes")
+    parser.add_argument("--bank", action="store_true", help="Build the unified index over every question file")
+    parser.add_argument("--batch-size", type=int, default=EMBED_BATCH_SIZE, help="Texts per model call")
+    parser.add_argument("--workers", type=int, default=EMBED_WORKERS, help="Encoder processes (0 = one per core)")
+    args = parser.parse_args()
+    EMBED_BATCH_SIZE, EMBED_WORKERS = args.batch_size, args.workers
+    
+    if args.bank:
+        # Build the unified index over every question bank file
+        print("=" * 60)
+        print("Building bank index (all question files)...")
+        print("=" * 60)
+        
+        _, bank, _ = load_bank()
+        index = build_bank_index(bank)
+        save_bank_index(index, bank)
+        
+        print("\n✅ Bank index built successfully!")
+        print("Run: python rag/retrieve.py to test retrieval")
+        sys.exit(0)
+    
     # Build index from questions.json
     print("=" * 60)
     print("Building embeddings index...")
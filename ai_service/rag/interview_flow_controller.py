@@ -7,15 +7,22 @@ This module implements:
 3. Stage-based progression
 4. Difficulty escalation based on performance
 5. Interview memory and tracking
+6. One shared engine (InterviewFlowEngine) driving many interviews, each
+   with its own small, serializable InterviewState
 """
 
 import json
-import random
+from collections import Counter
 from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 from datetime import datetime
 
+import numpy as np
+
+from rag.metadata_filter import MetadataFilter, normalize_value
+from rag.question_bank import QuestionIndex, get_question_index, load_data_file
+
 
 class InterviewStage(Enum):
     """Valid interview stages in strict progression order."""
@@ -28,6 +35,10 @@ class InterviewStage(Enum):
     COMPLETE = "complete"
 
 
+# Stages an interview moves through, in order (COMPLETE excluded)
+STAGE_ORDER = [s for s in InterviewStage if s != InterviewStage.COMPLETE]
+
+
 @dataclass
 class QuestionScore:
     """Track score for each question answer."""
@@ -37,11 +48,19 @@ class QuestionScore:
     category: str
     difficulty: int
     timestamp: str
+    stage: str = ""
 
 
 @dataclass
 class InterviewState:
-    """Track complete interview state and progress."""
+    """
+    Track complete interview state and progress.
+    
+    Averages, per-stage and per-category counts are kept up to date as
+    questions are asked and answered, so progression checks are O(1).
+    to_dict()/from_dict() store only asked ids, scores and the sampling RNG
+    position; everything else is rebuilt from them.
+    """
     role: str
     level: str
     current_stage: InterviewStage
@@ -51,30 +70,54 @@ class InterviewState:
     average_score: float
     max_achieved_difficulty: int
     red_flags_total: int
-    candidate_strengths: List[str]
-    candidate_weaknesses: List[str]
+    candidate_strengths: Dict[str, int]  # category -> answers scored > 0.8
+    candidate_weaknesses: Dict[str, int]  # category -> answers scored < 0.5
+    
+    # Incremental aggregates
+    score_sum: float = 0.0
+    asked_per_stage: Dict[str, int] = field(default_factory=Counter)
+    answered_per_stage: Dict[str, int] = field(default_factory=Counter)
+    answered_per_category: Dict[str, int] = field(default_factory=Counter)
+    asked_counted: int = 0  # Entries of questions_asked already in asked_per_stage
+    
+    # This interview's question sampling RNG (seeded for reproducible plans)
+    rng: np.random.Generator = field(default_factory=np.random.default_rng, repr=False)
     
     def __post_init__(self):
         self.stage_index = list(InterviewStage).index(self.current_stage)
+        # Accept lists of categories (older callers) as counters
+        self.candidate_strengths = Counter(self.candidate_strengths)
+        self.candidate_weaknesses = Counter(self.candidate_weaknesses)
+        
+        existing, self.scores = self.scores, []
+        for score in existing:
+            self._count_score(score)
+            self.scores.append(score)
     
     def get_average_score(self) -> float:
-        """Calculate average score from all answers."""
+        """Average score from all answers (running sum, O(1))."""
         if not self.scores:
             return 0.5  # Start neutral
-        return sum(s.score for s in self.scores) / len(self.scores)
+        return self.score_sum / len(self.scores)
     
     def advance_stage(self) -> bool:
         """Move to next stage. Returns True if advanced, False if already at end."""
-        if self.stage_index < len(InterviewStage) - 2:  # -2 to skip COMPLETE
+        if self.stage_index < len(STAGE_ORDER) - 1:
             self.stage_index += 1
-            stages = [s.value for s in InterviewStage if s != InterviewStage.COMPLETE]
-            self.current_stage = InterviewStage(stages[self.stage_index])
+            self.current_stage = STAGE_ORDER[self.stage_index]
             return True
         return False
     
+    def _count_score(self, score: QuestionScore):
+        self.score_sum += score.score
+        if score.stage:
+            self.answered_per_stage[score.stage] += 1
+        self.answered_per_category[score.category] += 1
+    
     def add_score(self, score: QuestionScore):
         """Add a question score to history."""
         self.scores.append(score)
+        self._count_score(score)
         self.average_score = self.get_average_score()
         
         # Track weaknesses and strengths
@@ -82,36 +125,96 @@ class InterviewState:
             self.red_flags_total += score.red_flags_detected
         
         if score.score > 0.8:
-            self.candidate_strengths.append(score.category)
+            self.candidate_strengths[score.category] += 1
         elif score.score < 0.5:
-            self.candidate_weaknesses.append(score.category)
+            self.candidate_weaknesses[score.category] += 1
         
         # Update max difficulty achieved
         if score.difficulty > self.max_achieved_difficulty:
             self.max_achieved_difficulty = score.difficulty
+    
+    def to_dict(self) -> Dict:
+        """Compact, JSON-serializable form for the session store"""
+        return {
+            'role': self.role,
+            'level': self.level,
+            'stage': self.current_stage.value,
+            'asked': list(self.questions_asked),
+            'scores': [
+                [s.question_id, s.score, s.red_flags_detected, s.category, s.difficulty, s.timestamp, s.stage]
+                for s in self.scores
+            ],
+            'rng': self.rng.bit_generator.state
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> "InterviewState":
+        """Rebuild a state (aggregates included) from to_dict() output"""
+        rng = np.random.default_rng()
+        if data.get('rng'):
+            rng.bit_generator.state = data['rng']
+        state = cls(
+            role=data['role'],
+            level=data['level'],
+            current_stage=InterviewStage(data.get('stage', InterviewStage.INTRODUCTION.value)),
+            questions_asked=list(data.get('asked', [])),
+            scores=[],
+            stage_index=0,
+            average_score=0.5,
+            max_achieved_difficulty=0,
+            red_flags_total=0,
+            candidate_strengths=Counter(),
+            candidate_weaknesses=Counter(),
+            rng=rng
+        )
+        for row in data.get('scores', []):
+            state.add_score(QuestionScore(*row))
+        return state
 
 
-class InterviewFlowController:
-    """Master controller for interview flow and question selection."""
+class InterviewFlowEngine:
+    """
+    Shared, read-only interview engine: flow config plus the indexed bank.
     
-    def __init__(self, flow_config_path: str, questions_data: List[Dict]):
+    Holds no per-interview data. Every call takes the interview's
+    InterviewState, so one engine (and one copy of the bank) serves any
+    number of concurrent interviews.
+    """
+    
+    def __init__(self, flow_config_path: str, questions_data: List[Dict],
+                 question_index: Optional[QuestionIndex] = None,
+                 filters: Optional[MetadataFilter] = None):
         """
-        Initialize controller with flow config and questions.
+        Initialize the engine with flow config and questions.
         
         Args:
             flow_config_path: Path to interview_flow.json
             questions_data: List of all loaded question dictionaries
+            question_index: id -> record index over questions_data (e.g. the
+                retriever's question_index); shared per bank when omitted
+            filters: Inverted metadata indexes over questions_data (e.g. the
+                retriever's filters); built when omitted
         """
-        with open(flow_config_path, 'r', encoding='utf-8') as f:
-            self.flow_config = json.load(f)
+        # Served from the compiled question bundle when it is current
+        self.flow_config = load_data_file(flow_config_path)
         
         self.interview_flow = self.flow_config['interview_flow']
+        self._stage_configs = {stage_config['stage']: stage_config for stage_config in self.interview_flow}
         self.all_questions = questions_data
-        self.state: Optional[InterviewState] = None
+        self.question_index = question_index or get_question_index(questions_data)
+        self.filters = filters or MetadataFilter(questions_data)
     
-    def initialize_interview(self, role: str, level: str) -> InterviewState:
-        """Start a new interview session."""
-        self.state = InterviewState(
+    def new_interview(self, role: str, level: str, seed: Optional[int] = None) -> InterviewState:
+        """
+        State for a new interview.
+        
+        Args:
+            role: Candidate role
+            level: Candidate level
+            seed: Seed for this interview's question sampling (same seed and
+                answers -> same interview plan); random when omitted
+        """
+        return InterviewState(
             role=role,
             level=level,
             current_stage=InterviewStage.INTRODUCTION,
@@ -121,29 +224,33 @@ class InterviewFlowController:
             average_score=0.5,
             max_achieved_difficulty=0,
             red_flags_total=0,
-            candidate_strengths=[],
-            candidate_weaknesses=[]
+            candidate_strengths=Counter(),
+            candidate_weaknesses=Counter(),
+            rng=np.random.default_rng(seed)
         )
-        return self.state
     
-    def get_current_stage_config(self) -> Dict:
+    def get_current_stage_config(self, state: InterviewState) -> Dict:
         """Get configuration for current stage."""
-        stage_name = self.state.current_stage.value
-        for stage_config in self.interview_flow:
-            if stage_config['stage'] == stage_name:
-                return stage_config
-        raise ValueError(f"Stage {stage_name} not found in config")
+        stage_name = state.current_stage.value
+        stage_config = self._stage_configs.get(stage_name)
+        if stage_config is None:
+            raise ValueError(f"Stage {stage_name} not found in config")
+        return stage_config
     
-    def get_eligible_questions(self, stage_config: Dict, difficulty_override: Optional[int] = None) -> List[Dict]:
+    def _count_new_asked(self, state: InterviewState):
+        """Add questions appended to questions_asked since the last call to asked_per_stage"""
+        for q_id in state.questions_asked[state.asked_counted:]:
+            for stage in {q.get('stage') for q in self.question_index.get_all(q_id)}:
+                state.asked_per_stage[stage] += 1
+        state.asked_counted = len(state.questions_asked)
+    
+    def eligible_positions(self, state: InterviewState, stage_config: Dict, difficulty_override: Optional[int] = None) -> np.ndarray:
         """
-        Filter questions eligible for current stage.
+        Bank positions eligible for the current stage (sorted).
         
         Args:
             stage_config: Stage configuration dict
             difficulty_override: Override difficulty range (for adaptive difficulty)
-        
-        Returns:
-            List of eligible questions
         """
         stage = stage_config['stage']
         categories = stage_config['allowed_categories']
@@ -154,20 +261,47 @@ class InterviewFlowController:
         else:
             difficulty_range = stage_config['difficulty_range']
         
-        eligible = [
-            q for q in self.all_questions
-            if (
-                q.get('stage') == stage and
-                q.get('category') in categories and
-                difficulty_range[0] <= q.get('difficulty', 2) <= difficulty_range[1] and
-                (q.get('role') == self.state.role or q.get('role') == 'any') and
-                q['id'] not in self.state.questions_asked  # Don't repeat questions
-            )
-        ]
+        # Intersect the inverted indexes (cost follows the matches, not the bank)
+        return self.filters.select(
+            stages=[stage],
+            categories=categories,
+            difficulty=(difficulty_range[0], difficulty_range[1]),
+            role=state.role,
+            exclude_ids=state.questions_asked  # Don't repeat questions
+        )
+    
+    def get_eligible_questions(self, state: InterviewState, stage_config: Dict, difficulty_override: Optional[int] = None) -> List[Dict]:
+        """
+        Filter questions eligible for current stage.
+        
+        Args:
+            stage_config: Stage configuration dict
+            difficulty_override: Override difficulty range (for adaptive difficulty)
         
-        return eligible
+        Returns:
+            List of eligible questions
+        """
+        positions = self.eligible_positions(state, stage_config, difficulty_override)
+        return [self.all_questions[pos] for pos in positions]
     
-    def weight_questions(self, questions: List[Dict]) -> List[Tuple[Dict, float]]:
+    def _adjust_weights(self, state: InterviewState, weights: np.ndarray, category_codes: np.ndarray) -> np.ndarray:
+        """Weakness bonus (x1.3) and strength malus (x0.7) by category, as array operations"""
+        if state.candidate_weaknesses:
+            weak = self.filters.code_table('category', state.candidate_weaknesses)[category_codes]
+            weights = np.where(weak, weights * 1.3, weights)
+        if state.candidate_strengths:
+            strong = self.filters.code_table('category', state.candidate_strengths)[category_codes]
+            weights = np.where(strong, weights * 0.7, weights)
+        return weights
+    
+    def position_weights(self, state: InterviewState, positions: np.ndarray) -> np.ndarray:
+        """Selection weight of each bank position (see weight_questions)"""
+        return self._adjust_weights(state, 
+            self.filters.weights[positions],
+            self.filters.codes['category'][positions]
+        )
+    
+    def weight_questions(self, state: InterviewState, questions: List[Dict]) -> List[Tuple[Dict, float]]:
         """
         Apply weight-based scoring to questions.
         
@@ -177,29 +311,23 @@ class InterviewFlowController:
         - 1.6-1.8: Challenging (expertise)
         - 1.9-2.5: Elite/Killer (FAANG level)
         
+        Bonus: questions matching candidate weaknesses get higher priority (x1.3).
+        Malus: categories the candidate is already strong in (x0.7).
+        
         Args:
             questions: List of eligible questions
         
         Returns:
             List of (question, weight_score) tuples
         """
-        weighted = []
-        for q in questions:
-            weight = q.get('weight', 1.0)
-            
-            # Bonus: questions matching candidate weaknesses get higher priority
-            if q.get('category') in self.state.candidate_weaknesses:
-                weight *= 1.3
-            
-            # Malus: questions already asked similar category
-            if q.get('category') in self.state.candidate_strengths:
-                weight *= 0.7
-            
-            weighted.append((q, weight))
-        
-        return weighted
+        category_codes = self.filters.value_codes['category']
+        weights = self._adjust_weights(state, 
+            np.array([q.get('weight', 1.0) for q in questions], dtype=np.float64),
+            np.array([category_codes.get(normalize_value(q.get('category')), -1) for q in questions], dtype=np.int16)
+        )
+        return list(zip(questions, weights.tolist()))
     
-    def select_questions(self, count: int, use_adaptive_difficulty: bool = True) -> List[Dict]:
+    def select_questions(self, state: InterviewState, count: int, use_adaptive_difficulty: bool = True) -> List[Dict]:
         """
         Intelligently select N questions for current stage using weighted sampling.
         
@@ -216,44 +344,30 @@ class InterviewFlowController:
         Returns:
             List of selected questions
         """
-        stage_config = self.get_current_stage_config()
+        stage_config = self.get_current_stage_config(state)
         
         # Determine adaptive difficulty if enabled
         difficulty_override = None
         if use_adaptive_difficulty:
-            difficulty_override = self._calculate_adaptive_difficulty(stage_config)
+            difficulty_override = self._calculate_adaptive_difficulty(state, stage_config)
         
-        # Get eligible questions
-        eligible = self.get_eligible_questions(stage_config, difficulty_override)
+        # Eligible bank positions
+        eligible = self.eligible_positions(state, stage_config, difficulty_override)
         
         if len(eligible) == 0:
             # Fallback: relax constraints
-            eligible = self.get_eligible_questions(stage_config, None)
+            eligible = self.eligible_positions(state, stage_config, None)
         
         if len(eligible) == 0:
             raise ValueError(f"No eligible questions for stage {stage_config['stage']}")
         
-        # Weight the questions
-        weighted = self.weight_questions(eligible)
-        
-        # Create weighted pool for sampling
-        pool = []
-        for question, weight in weighted:
-            # Convert weight to pool multiplicity
-            multiplicity = max(1, int(weight * 10))
-            pool.extend([question] * multiplicity)
-        
-        # Random sample without replacement
-        selected = []
-        random.shuffle(pool)
-        
-        for question in pool:
-            if question not in selected and len(selected) < count:
-                selected.append(question)
-        
-        return selected[:count]
+        # Weight the questions (column arrays), then weighted sampling without
+        # replacement (higher weight -> picked more often)
+        weights = self.position_weights(state, eligible)
+        picked = weighted_sample_indices(weights, count, state.rng)
+        return [self.all_questions[pos] for pos in eligible[picked]]
     
-    def _calculate_adaptive_difficulty(self, stage_config: Dict) -> Optional[int]:
+    def _calculate_adaptive_difficulty(self, state: InterviewState, stage_config: Dict) -> Optional[int]:
         """
         Adjust difficulty based on candidate performance.
         
@@ -265,21 +379,21 @@ class InterviewFlowController:
         Returns:
             Overridden difficulty level or None to use stage default
         """
-        if not self.state.scores:
+        if not state.scores:
             return None  # First stage, use default
         
-        avg_score = self.state.get_average_score()
+        avg_score = state.get_average_score()
         
         if avg_score > 0.75:
             # Candidate is performing well, increase difficulty
-            return min(5, self.state.max_achieved_difficulty + 1)
+            return min(5, state.max_achieved_difficulty + 1)
         elif avg_score < 0.45:
             # Candidate struggling, decrease difficulty
-            return max(1, self.state.max_achieved_difficulty - 1)
+            return max(1, state.max_achieved_difficulty - 1)
         else:
             return None  # Keep current difficulty
     
-    def get_next_questions(self, num_questions: Optional[int] = None) -> List[Dict]:
+    def get_next_questions(self, state: InterviewState, num_questions: Optional[int] = None) -> List[Dict]:
         """
         Get the next batch of questions for the current stage.
         
@@ -289,18 +403,19 @@ class InterviewFlowController:
         Returns:
             List of questions ready for interview
         """
-        stage_config = self.get_current_stage_config()
+        stage_config = self.get_current_stage_config(state)
         count = num_questions or stage_config['question_count']
         
-        questions = self.select_questions(count)
+        questions = self.select_questions(state, count)
         
         # Record that we're asking these questions
         for q in questions:
-            self.state.questions_asked.append(q['id'])
+            state.questions_asked.append(q['id'])
+        self._count_new_asked(state)
         
         return questions
     
-    def should_advance_stage(self) -> bool:
+    def should_advance_stage(self, state: InterviewState) -> bool:
         """
         Determine if candidate should advance to next stage.
         
@@ -311,36 +426,33 @@ class InterviewFlowController:
         Returns:
             True if should advance, False to repeat current stage
         """
-        stage_config = self.get_current_stage_config()
+        stage_config = self.get_current_stage_config(state)
         num_questions_in_stage = stage_config['question_count']
         
-        # Count questions from current stage
-        questions_in_stage = sum(
-            1 for q_id in self.state.questions_asked
-            if any(q['id'] == q_id and q['stage'] == stage_config['stage'] 
-                   for q in self.all_questions)
-        )
+        # Questions asked from current stage (incremental counter)
+        self._count_new_asked(state)
+        questions_in_stage = state.asked_per_stage[stage_config['stage']]
         
         # Check if enough questions asked in this stage
         if questions_in_stage < num_questions_in_stage:
             return False
         
         # Check minimum competency (you need at least 40% to pass)
-        recent_scores = self.state.scores[-num_questions_in_stage:]
+        recent_scores = state.scores[-num_questions_in_stage:]
         if recent_scores:
             stage_avg = sum(s.score for s in recent_scores) / len(recent_scores)
             return stage_avg >= 0.4
         
         return True
     
-    def advance_stage_if_ready(self) -> bool:
+    def advance_stage_if_ready(self, state: InterviewState) -> bool:
         """Advance to next stage if conditions are met."""
-        if self.should_advance_stage():
-            result = self.state.advance_stage()
+        if self.should_advance_stage(state):
+            result = state.advance_stage()
             return result
         return False
     
-    def generate_full_interview(self) -> Dict:
+    def generate_full_interview(self, state: InterviewState) -> Dict:
         """
         Generate a complete interview plan for the candidate.
         
@@ -349,8 +461,8 @@ class InterviewFlowController:
         """
         interview_plan = {
             'candidate': {
-                'role': self.state.role,
-                'level': self.state.level
+                'role': state.role,
+                'level': state.level
             },
             'interview': [],
             'stats': {
@@ -372,17 +484,17 @@ class InterviewFlowController:
             # Set current stage to get questions
             session_stage_index = [s['stage'] for s in self.interview_flow].index(stage_config['stage'])
             stages = [s['stage'] for s in self.interview_flow]
-            self.state.current_stage = InterviewStage(stages[session_stage_index])
+            state.current_stage = InterviewStage(stages[session_stage_index])
             
             # Get questions for this stage
-            questions = self.select_questions(stage_config['question_count'], use_adaptive_difficulty=False)
+            questions = self.select_questions(state, stage_config['question_count'], use_adaptive_difficulty=False)
             stage_dict['questions'] = [{'id': q['id'], 'question': q['question']} for q in questions]
             
             interview_plan['interview'].append(stage_dict)
         
         return interview_plan
     
-    def record_answer(self, question_id: str, score: float, red_flags: int = 0) -> None:
+    def record_answer(self, state: InterviewState, question_id: str, score: float, red_flags: int = 0) -> None:
         """
         Record a candidate's answer and update state.
         
@@ -392,7 +504,7 @@ class InterviewFlowController:
             red_flags: Number of red flags detected
         """
         # Find question to get metadata
-        question = next((q for q in self.all_questions if q['id'] == question_id), None)
+        question = self.question_index.get(question_id)
         if not question:
             raise ValueError(f"Question {question_id} not found")
         
@@ -402,12 +514,13 @@ class InterviewFlowController:
             red_flags_detected=red_flags,
             category=question.get('category', 'unknown'),
             difficulty=question.get('difficulty', 2),
-            timestamp=datetime.now().isoformat()
+            timestamp=datetime.now().isoformat(),
+            stage=question.get('stage', '')
         )
         
-        self.state.add_score(q_score)
+        state.add_score(q_score)
     
-    def get_interview_summary(self) -> Dict:
+    def get_interview_summary(self, state: InterviewState) -> Dict:
         """
         Generate summary of interview so far.
         
@@ -415,15 +528,15 @@ class InterviewFlowController:
             Dictionary with performance metrics
         """
         return {
-            'role': self.state.role,
-            'level': self.state.level,
-            'current_stage': self.state.current_stage.value,
-            'progress': f"{len(self.state.questions_asked)} questions answered",
-            'average_score': round(self.state.average_score, 2),
-            'red_flags_total': self.state.red_flags_total,
-            'max_difficulty_reached': self.state.max_achieved_difficulty,
-            'strengths': list(set(self.state.candidate_strengths)),
-            'weaknesses': list(set(self.state.candidate_weaknesses)),
+            'role': state.role,
+            'level': state.level,
+            'current_stage': state.current_stage.value,
+            'progress': f"{len(state.questions_asked)} questions answered",
+            'average_score': round(state.average_score, 2),
+            'red_flags_total': state.red_flags_total,
+            'max_difficulty_reached': state.max_achieved_difficulty,
+            'strengths': list(state.candidate_strengths),
+            'weaknesses': list(state.candidate_weaknesses),
             'scores': [
                 {
                     'question_id': s.question_id,
@@ -431,36 +544,132 @@ class InterviewFlowController:
                     'category': s.category,
                     'red_flags': s.red_flags_detected
                 }
-                for s in self.state.scores
+                for s in state.scores
             ]
         }
 
 
+class InterviewFlowController:
+    """
+    Master controller for a single interview: an InterviewFlowEngine plus
+    that interview's state.
+    
+    For many concurrent interviews, share one engine and keep each
+    interview's InterviewState (InterviewState.to_dict) in the session
+    store instead of creating a controller per candidate.
+    """
+    
+    def __init__(self, flow_config_path: str, questions_data: List[Dict],
+                 question_index: Optional[QuestionIndex] = None,
+                 filters: Optional[MetadataFilter] = None,
+                 engine: Optional[InterviewFlowEngine] = None):
+        """
+        Initialize controller with flow config and questions (or a shared engine).
+        
+        Args:
+            flow_config_path: Path to interview_flow.json
+            questions_data: List of all loaded question dictionaries
+            question_index: id -> record index over questions_data
+            filters: Inverted metadata indexes over questions_data
+            engine: Existing engine to reuse (the other arguments are then ignored)
+        """
+        self.engine = engine or InterviewFlowEngine(flow_config_path, questions_data, question_index, filters)
+        self.flow_config = self.engine.flow_config
+        self.interview_flow = self.engine.interview_flow
+        self.all_questions = self.engine.all_questions
+        self.question_index = self.engine.question_index
+        self.filters = self.engine.filters
+        self.state: Optional[InterviewState] = None
+    
+    def initialize_interview(self, role: str, level: str, seed: Optional[int] = None) -> InterviewState:
+        """Start a new interview session (seed makes question sampling reproducible)."""
+        self.state = self.engine.new_interview(role, level, seed)
+        return self.state
+    
+    def get_current_stage_config(self) -> Dict:
+        return self.engine.get_current_stage_config(self.state)
+    
+    def eligible_positions(self, stage_config: Dict, difficulty_override: Optional[int] = None) -> np.ndarray:
+        return self.engine.eligible_positions(self.state, stage_config, difficulty_override)
+    
+    def get_eligible_questions(self, stage_config: Dict, difficulty_override: Optional[int] = None) -> List[Dict]:
+        return self.engine.get_eligible_questions(self.state, stage_config, difficulty_override)
+    
+    def position_weights(self, positions: np.ndarray) -> np.ndarray:
+        return self.engine.position_weights(self.state, positions)
+    
+    def weight_questions(self, questions: List[Dict]) -> List[Tuple[Dict, float]]:
+        return self.engine.weight_questions(self.state, questions)
+    
+    def select_questions(self, count: int, use_adaptive_difficulty: bool = True) -> List[Dict]:
+        return self.engine.select_questions(self.state, count, use_adaptive_difficulty)
+    
+    def get_next_questions(self, num_questions: Optional[int] = None) -> List[Dict]:
+        return self.engine.get_next_questions(self.state, num_questions)
+    
+    def should_advance_stage(self) -> bool:
+        return self.engine.should_advance_stage(self.state)
+    
+    def advance_stage_if_ready(self) -> bool:
+        return self.engine.advance_stage_if_ready(self.state)
+    
+    def generate_full_interview(self) -> Dict:
+        return self.engine.generate_full_interview(self.state)
+    
+    def record_answer(self, question_id: str, score: float, red_flags: int = 0) -> None:
+        self.engine.record_answer(self.state, question_id, score, red_flags)
+    
+    def get_interview_summary(self) -> Dict:
+        return self.engine.get_interview_summary(self.state)
+
+
+def weighted_sample_indices(weights, count: int, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    """
+    Exact weighted sampling without replacement (Efraimidis-Spirakis).
+    
+    Each item gets the key log(u) / weight with u ~ U(0, 1); the count
+    largest keys are the sample, already in draw order. O(n) time and
+    memory, one vectorized pass.
+    
+    Args:
+        weights: Positive weight per item (non-positive weights are treated
+            as a tiny positive weight, so every item stays selectable)
+        count: Number of items to draw
+        rng: numpy Generator (seed it for reproducible draws)
+    
+    Returns:
+        Indices of the selected items, in draw order
+    """
+    weights = np.asarray(weights, dtype=np.float64)
+    count = min(count, len(weights))
+    if count <= 0:
+        return np.zeros(0, dtype=np.int64)
+    
+    rng = rng if rng is not None else np.random.default_rng()
+    keys = np.log(rng.random(len(weights))) / np.maximum(weights, 1e-12)
+    if count < len(keys):
+        top = np.argpartition(-keys, count - 1)[:count]
+    else:
+        top = np.arange(len(keys))
+    return top[np.argsort(-keys[top], kind='stable')]
+
+
 # Utility function for basic weighted selection (without full state tracking)
-def weighted_random_selection(items: List[Tuple], count: int) -> List:
+def weighted_random_selection(items: List[Tuple], count: int,
+                              rng: Optional[np.random.Generator] = None) -> List:
     """
     Simple weighted random selection from list of (item, weight) tuples.
     
     Args:
         items: List of (item, weight) tuples
         count: Number to select
+        rng: Optional seeded numpy Generator
     
     Returns:
         List of selected items
     """
-    pool = []
-    for item, weight in items:
-        multiplicity = max(1, int(weight * 10))
-        pool.extend([item] * multiplicity)
-    
-    random.shuffle(pool)
-    
-    selected = []
-    for item in pool:
-        if item not in selected and len(selected) < count:
-            selected.append(item)
-    
-    return selected
+    indices = weighted_sample_indices([weight for _, weight in items], count, rng)
+    return [items[i][0] for i in indices]
 
 
 # Example usage
@@ -472,7 +681,8 @@ if __name__ == "__main__":
     # Load all questions (pseudo-code - load from your files)
     # questions = load_all_questions()
     
-    # Initialize controller
+    # Initialize controller (or share one InterviewFlowEngine across interviews:
+    # state = engine.new_interview("backend", "mid"); engine.get_next_questions(state))
     # controller = InterviewFlowController(flow_config, questions)
     # controller.initialize_interview(role="backend", level="mid")
     
@@ -0,0 +1,315 @@
+"""
+Metadata Filter Module
+
+Handles:
+- Bitmaps over bank positions for each role/level/skill/stage/category/difficulty value
+- Combining filters (role, level, skill, difficulty range, pools, asked ids) into one mask
+- Turning a mask into a FAISS ID selector so filters run inside the vector search
+- Inverted indexes (value -> sorted positions) and select(), whose cost follows
+  the size of the matching lists rather than the bank size
+- Numeric columns (difficulty, weight, expected_duration_sec) for array-based
+  weighting and timing
+
+Filtering before the search (instead of over-fetching and discarding) means
+a selective filter still returns exactly top_k matches in one pass.
+
+Usage:
+    from rag.metadata_filter import MetadataFilter
+
+    filters = MetadataFilter(retriever.all_questions)
+    mask = filters.match(role='backend', level='junior', difficulty=(2, 4))
+    mask &= ~filters.ids_mask(session.asked_questions)
+    retriever.search(query_embedding, k=10, mask=mask)
+
+    positions = filters.select(stages=['resume_technical'], role='backend',
+                               difficulty=(3, 4), exclude_ids=asked)
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from rag.question_bank import get_question_index
+
+# Question fields with one bitmap per distinct value
+FILTER_FIELDS = ('role', 'level', 'skill', 'stage', 'category', 'difficulty')
+
+# Role/level value that matches every filter value
+WILDCARD = 'any'
+
+
+def normalize_value(value):
+    """Bitmap key for a field value (strings compare case-insensitively)"""
+    if isinstance(value, str):
+        return value.strip().lower()
+    return value
+
+
+def _number(value, default: float) -> float:
+    return float(value) if isinstance(value, (int, float)) and not isinstance(value, bool) else default
+
+
+POSITION_DTYPE = np.int32
+
+_EMPTY = np.zeros(0, dtype=POSITION_DTYPE)
+_EMPTY.setflags(write=False)
+
+
+def union_sorted(lists: Iterable[np.ndarray]) -> np.ndarray:
+    """Union of disjoint sorted position arrays (one field's value lists never overlap)"""
+    lists = [positions for positions in lists if len(positions)]
+    if not lists:
+        return _EMPTY
+    if len(lists) == 1:
+        return lists[0]
+    return np.sort(np.concatenate(lists))
+
+
+def subtract_sorted(positions: np.ndarray, removed: np.ndarray) -> np.ndarray:
+    """positions without removed (both sorted); O(len(positions) * log(len(removed)))"""
+    if len(positions) == 0 or len(removed) == 0:
+        return positions
+    found = np.searchsorted(removed, positions)
+    found[found == len(removed)] = 0
+    return positions[removed[found] != positions]
+
+
+class MetadataFilter:
+    """Precomputed boolean masks and inverted indexes over bank positions"""
+
+    def __init__(self, questions: List[Dict], columns: Optional[Dict[str, Tuple[np.ndarray, List]]] = None):
+        """
+        Args:
+            questions: The bank, in position order
+            columns: Precomputed {field: (value codes per position, code -> value)}
+                from the question bundle; computed from questions when omitted
+        """
+        self.size = len(questions)
+
+        # Forward index: one value code per position and field (-1 = unset)
+        self.codes: Dict[str, np.ndarray] = {}
+        self.value_codes: Dict[str, Dict[object, int]] = {}
+        for field in FILTER_FIELDS:
+            if columns is not None:
+                codes, values = columns[field]
+            else:
+                normalized = [normalize_value(q.get(field)) for q in questions]
+                values = sorted({value for value in normalized if value is not None}, key=str)
+                code_of = {value: code for code, value in enumerate(values)}
+                codes = np.array([code_of.get(value, -1) for value in normalized], dtype='int16')
+            self.codes[field] = codes
+            self.value_codes[field] = {value: code for code, value in enumerate(values)}
+
+        # Bitmaps and inverted indexes (value -> sorted, read-only positions)
+        self.bitmaps: Dict[str, Dict[object, np.ndarray]] = {field: {} for field in FILTER_FIELDS}
+        self.postings: Dict[str, Dict[object, np.ndarray]] = {field: {} for field in FILTER_FIELDS}
+        for field, value_codes in self.value_codes.items():
+            for value, code in value_codes.items():
+                bitmap = self.codes[field] == code
+                positions = np.flatnonzero(bitmap).astype(POSITION_DTYPE)
+                positions.setflags(write=False)
+                self.bitmaps[field][value] = bitmap
+                self.postings[field][value] = positions
+
+        # Several files reuse an id, so one id can map to several positions
+        self.id_positions = get_question_index(questions).positions
+
+        self.difficulties = np.array(
+            [q.get('difficulty') if isinstance(q.get('difficulty'), int) else 0 for q in questions],
+            dtype='int16'
+        )
+        self.weights = np.array([_number(q.get('weight'), 1.0) for q in questions], dtype=np.float64)
+        self.expected_durations = np.array(
+            [_number(q.get('expected_duration_sec'), 0.0) for q in questions], dtype=np.float32
+        )
+        self.skills = [normalize_value(q.get('skill')) or '' for q in questions]
+
+    def all(self) -> np.ndarray:
+        return np.ones(self.size, dtype=bool)
+
+    def none(self) -> np.ndarray:
+        return np.zeros(self.size, dtype=bool)
+
+    def bitmap(self, field: str, value) -> np.ndarray:
+        """Positions whose field equals value (read-only view; copy before mutating)"""
+        bitmap = self.bitmaps[field].get(normalize_value(value))
+        return bitmap if bitmap is not None else self.none()
+
+    def any_of(self, field: str, values: Iterable) -> np.ndarray:
+        """Positions whose field equals any of the values"""
+        mask = self.none()
+        for value in values:
+            bitmap = self.bitmaps[field].get(normalize_value(value))
+            if bitmap is not None:
+                mask |= bitmap
+        return mask
+
+    def ids_mask(self, question_ids: Iterable[str]) -> np.ndarray:
+        """Positions of the given question ids (e.g. a session's asked questions)"""
+        mask = self.none()
+        for question_id in question_ids:
+            positions = self.id_positions.get(question_id)
+            if positions:
+                mask[positions] = True
+        return mask
+
+    def range_mask(self, start: int, stop: int) -> np.ndarray:
+        """Positions in [start, stop) (a pool's slice of the bank)"""
+        mask = self.none()
+        mask[start:stop] = True
+        return mask
+
+    def has(self, field: str) -> np.ndarray:
+        """Positions where the field is set"""
+        return self.any_of(field, self.bitmaps[field].keys())
+
+    def difficulty_mask(self, difficulty_range: Tuple[int, Optional[int]]) -> np.ndarray:
+        """Positions with low <= difficulty <= high (high None = no upper bound)"""
+        low, high = difficulty_range
+        mask = self.difficulties >= low
+        if high is not None:
+            mask &= self.difficulties <= high
+        return mask
+
+    def match(
+        self,
+        role: Optional[str] = None,
+        level: Optional[str] = None,
+        skill: Optional[str] = None,
+        difficulty: Optional[Tuple[int, int]] = None,
+        stages: Optional[Iterable[str]] = None,
+        categories: Optional[Iterable[str]] = None,
+        exclude_ids: Optional[Iterable[str]] = None
+    ) -> np.ndarray:
+        """
+        Combined mask for the usual retrieval filters.
+
+        role/level also match questions tagged 'any'; None means no filter.
+        """
+        mask = self.all()
+        if role:
+            mask &= self.bitmap('role', role) | self.bitmap('role', WILDCARD)
+        if level:
+            mask &= self.bitmap('level', level) | self.bitmap('level', WILDCARD)
+        if skill:
+            mask &= self.bitmap('skill', skill)
+        if difficulty:
+            mask &= self.difficulty_mask(difficulty)
+        if stages is not None:
+            mask &= self.any_of('stage', stages)
+        if categories is not None:
+            mask &= self.any_of('category', categories)
+        if exclude_ids:
+            mask &= ~self.ids_mask(exclude_ids)
+        return mask
+
+    def positions(self, field: str, value) -> np.ndarray:
+        """Sorted positions whose field equals value"""
+        return self.postings[field].get(normalize_value(value), _EMPTY)
+
+    def positions_any(self, field: str, values: Iterable) -> np.ndarray:
+        """Sorted positions whose field equals any of the values"""
+        return union_sorted(self.positions(field, value) for value in values)
+
+    def ids_positions(self, question_ids: Iterable[str]) -> np.ndarray:
+        """Sorted positions of the given question ids"""
+        positions = [pos for question_id in question_ids for pos in self.id_positions.get(question_id, ())]
+        return np.unique(np.asarray(positions, dtype=POSITION_DTYPE)) if positions else _EMPTY
+
+    def difficulty_positions(self, difficulty_range: Tuple[int, Optional[int]]) -> np.ndarray:
+        """Sorted positions with low <= difficulty <= high (high None = no upper bound)"""
+        low, high = difficulty_range
+        return self.positions_any('difficulty', [
+            value for value in self.postings['difficulty']
+            if value >= low and (high is None or value <= high)
+        ])
+
+    def select(
+        self,
+        role: Optional[str] = None,
+        level: Optional[str] = None,
+        skill: Optional[str] = None,
+        difficulty: Optional[Tuple[int, Optional[int]]] = None,
+        stages: Optional[Iterable[str]] = None,
+        categories: Optional[Iterable[str]] = None,
+        exclude_ids: Optional[Iterable[str]] = None
+    ) -> np.ndarray:
+        """
+        Sorted positions matching the same filters as match(), via the inverted indexes.
+
+        The most selective filter's posting lists give the candidates; the
+        other filters are checked on just those candidates through the
+        per-position value codes. Cost follows the smallest matching list,
+        not the bank size. With no filters every position is returned.
+        """
+        terms = []  # (field, normalized values)
+        if role:
+            terms.append(('role', [normalize_value(role), WILDCARD]))
+        if level:
+            terms.append(('level', [normalize_value(level), WILDCARD]))
+        if skill:
+            terms.append(('skill', [normalize_value(skill)]))
+        if difficulty:
+            low, high = difficulty
+            terms.append(('difficulty', [
+                value for value in self.postings['difficulty']
+                if value >= low and (high is None or value <= high)
+            ]))
+        if stages is not None:
+            terms.append(('stage', [normalize_value(value) for value in stages]))
+        if categories is not None:
+            terms.append(('category', [normalize_value(value) for value in categories]))
+
+        if terms:
+            def matches(term):
+                field, values = term
+                return sum(len(self.postings[field].get(value, _EMPTY)) for value in values)
+
+            terms.sort(key=matches)
+            field, values = terms[0]
+            result = self.positions_any(field, values)
+            for field, values in terms[1:]:
+                if len(result) == 0:
+                    break
+                result = result[self.code_table(field, values)[self.codes[field][result]]]
+        else:
+            result = np.arange(self.size, dtype=POSITION_DTYPE)
+
+        if exclude_ids:
+            result = subtract_sorted(result, self.ids_positions(exclude_ids))
+        return result
+
+    def code_table(self, field: str, values: Iterable) -> np.ndarray:
+        """
+        Lookup table over value codes: table[codes] is True where the field
+        equals one of the values. The extra last slot keeps unset (-1) False.
+        """
+        value_codes = self.value_codes[field]
+        table = np.zeros(len(value_codes) + 1, dtype=bool)
+        for value in values:
+            code = value_codes.get(normalize_value(value))
+            if code is not None:
+                table[code] = True
+        return table
+
+    def any_of_at(self, field: str, values: Iterable, positions: np.ndarray) -> np.ndarray:
+        """any_of() evaluated only at the given positions (a bool per position)"""
+        return self.code_table(field, values)[self.codes[field][positions]]
+
+    def skill_of(self, position: int) -> str:
+        """Lower-cased skill at a bank position ('' when untagged)"""
+        return self.skills[position]
+
+
+def mask_selector(mask: np.ndarray):
+    """
+    FAISS ID selector restricting results to the positions set in mask.
+
+    Returns (selector, keepalive): the packed bitmap must outlive the search
+    because FAISS only holds a pointer to it.
+    """
+    import faiss
+
+    packed = np.packbits(mask.astype(bool), bitorder='little')
+    selector = faiss.IDSelectorBitmap(len(mask), faiss.swig_ptr(packed))
+    return selector, packed
@@ -0,0 +1,235 @@
+"""
+ONNX Runtime Embedding Backend
+
+Handles:
+- Exporting all-MiniLM-L6-v2 to ONNX and quantizing it to int8
+- Encoding text with ONNX Runtime (no torch import at serving time)
+- Mean pooling + L2 normalization, matching the SentenceTransformer pipeline
+
+Usage:
+    # One-off export (needs torch + transformers, run on a build machine)
+    python rag/onnx_encoder.py --output models/all-MiniLM-L6-v2-onnx
+
+    # Serving (onnxruntime + tokenizers only)
+    from rag.onnx_encoder import OnnxSentenceEncoder
+    encoder = OnnxSentenceEncoder("models/all-MiniLM-L6-v2-onnx")
+    embedding = encoder.encode("Senior backend engineer", convert_to_numpy=True)
+"""
+
+import argparse
+import json
+import os
+from typing import Dict, List, Union
+
+import numpy as np
+
+CONFIG_FILE = "onnx_config.json"
+FP32_MODEL_FILE = "model.onnx"
+INT8_MODEL_FILE = "model_int8.onnx"
+
+
+class OnnxSentenceEncoder:
+    """Drop-in replacement for SentenceTransformer.encode backed by ONNX Runtime"""
+
+    def __init__(self, model_dir: str, quantized: bool = None, intra_op_threads: int = 0):
+        try:
+            import onnxruntime as ort
+            from tokenizers import Tokenizer
+        except ImportError as e:
+            raise ImportError(
+                "ONNX embedding backend requires onnxruntime and tokenizers "
+                "(pip install onnxruntime tokenizers)"
+            ) from e
+
+        config_path = os.path.join(model_dir, CONFIG_FILE)
+        if not os.path.exists(config_path):
+            raise FileNotFoundError(
+                f"{config_path} not found. Export the model first: "
+                f"python rag/onnx_encoder.py --output {model_dir}"
+            )
+
+        with open(config_path, 'r', encoding='utf-8') as f:
+            self.config = json.load(f)
+
+        self.model_name = self.config["model_name"]
+        self.max_seq_length = self.config.get("max_seq_length", 256)
+        self.normalize = self.config.get("normalize", True)
+        self.quantized = self.config.get("quantized", True) if quantized is None else quantized
+
+        # Tokenizer (fast Rust tokenizer, same vocab as the torch model)
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=self.max_seq_length)
+        self.tokenizer.enable_padding(
+            pad_id=self.config.get("pad_token_id", 0),
+            pad_token=self.config.get("pad_token", "[PAD]")
+        )
+
+        # Inference session
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if intra_op_threads:
+            options.intra_op_num_threads = intra_op_threads
+
+        model_file = INT8_MODEL_FILE if self.quantized else FP32_MODEL_FILE
+        self.session = ort.InferenceSession(
+            os.path.join(model_dir, model_file),
+            options,
+            providers=["CPUExecutionProvider"]
+        )
+        self._input_names = {i.name for i in self.session.get_inputs()}
+        self._dimension = self.config.get("dimension")
+
+    def get_sentence_embedding_dimension(self) -> int:
+        """Embedding size (384 for all-MiniLM-L6-v2)"""
+        if self._dimension is None:
+            self._dimension = int(self.encode("dimension probe").shape[-1])
+        return self._dimension
+
+    def encode(
+        self,
+        sentences: Union[str, List[str]],
+        batch_size: int = 32,
+        convert_to_numpy: bool = True,
+        normalize_embeddings: bool = None,
+        show_progress_bar: bool = False,
+        **kwargs
+    ) -> np.ndarray:
+        """Encode one text or a list of texts (same contract as SentenceTransformer.encode)"""
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        normalize = self.normalize if normalize_embeddings is None else normalize_embeddings
+
+        batches = []
+        for start in range(0, len(texts), batch_size):
+            batches.append(self._encode_batch(texts[start:start + batch_size], normalize))
+
+        if batches:
+            embeddings = np.concatenate(batches, axis=0)
+        else:
+            embeddings = np.zeros((0, self._dimension or 0), dtype='float32')
+
+        return embeddings[0] if single else embeddings
+
+    def _encode_batch(self, texts: List[str], normalize: bool) -> np.ndarray:
+        """Tokenize, run the transformer and mean-pool one batch"""
+        encodings = self.tokenizer.encode_batch(texts)
+        input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+        attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+
+        feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self._input_names:
+            feeds["token_type_ids"] = np.array([e.type_ids for e in encodings], dtype=np.int64)
+
+        token_embeddings = self.session.run(None, feeds)[0]
+
+        # Mean pooling over real (non-padding) tokens
+        mask = attention_mask[..., None].astype(np.float32)
+        summed = (token_embeddings * mask).sum(axis=1)
+        counts = np.clip(mask.sum(axis=1), 1e-9, None)
+        embeddings = (summed / counts).astype('float32')
+
+        if normalize:
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            embeddings = embeddings / np.clip(norms, 1e-12, None)
+
+        return embeddings
+
+
+def _hub_id(model_name: str) -> str:
+    """SentenceTransformer short names live under the sentence-transformers org"""
+    if os.path.isdir(model_name) or "/" in model_name:
+        return model_name
+    return f"sentence-transformers/{model_name}"
+
+
+def export_onnx_model(model_name: str, output_dir: str, max_seq_length: int = 256,
+                      opset: int = 17, quantize: bool = True) -> Dict:
+    """
+    Export a SentenceTransformer's transformer to ONNX and quantize weights to int8.
+
+    Pooling and normalization stay in numpy (OnnxSentenceEncoder), so the
+    exported graph only returns token embeddings.
+    """
+    import torch
+    from transformers import AutoModel, AutoTokenizer
+
+    os.makedirs(output_dir, exist_ok=True)
+    hub_id = _hub_id(model_name)
+
+    tokenizer = AutoTokenizer.from_pretrained(hub_id)
+    transformer = AutoModel.from_pretrained(hub_id).eval()
+
+    class TokenEmbeddings(torch.nn.Module):
+        """Expose last_hidden_state as a plain tensor output"""
+
+        def __init__(self, model):
+            super().__init__()
+            self.model = model
+
+        def forward(self, input_ids, attention_mask, token_type_ids):
+            return self.model(
+                input_ids=input_ids,
+                attention_mask=attention_mask,
+                token_type_ids=token_type_ids
+            ).last_hidden_state
+
+    sample = tokenizer(["Tell me about yourself"], return_tensors="pt")
+    fp32_path = os.path.join(output_dir, FP32_MODEL_FILE)
+
+    print(f"Exporting {hub_id} to {fp32_path}...")
+    torch.onnx.export(
+        TokenEmbeddings(transformer),
+        (sample["input_ids"], sample["attention_mask"], sample["token_type_ids"]),
+        fp32_path,
+        input_names=["input_ids", "attention_mask", "token_type_ids"],
+        output_names=["token_embeddings"],
+        dynamic_axes={
+            "input_ids": {0: "batch", 1: "sequence"},
+            "attention_mask": {0: "batch", 1: "sequence"},
+            "token_type_ids": {0: "batch", 1: "sequence"},
+            "token_embeddings": {0: "batch", 1: "sequence"}
+        },
+        opset_version=opset,
+        dynamo=False
+    )
+
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        int8_path = os.path.join(output_dir, INT8_MODEL_FILE)
+        print(f"Quantizing to int8: {int8_path}")
+        quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+
+    tokenizer.save_pretrained(output_dir)
+
+    config = {
+        "model_name": model_name,
+        "max_seq_length": max_seq_length,
+        "normalize": True,  # all-MiniLM-L6-v2 ends with a Normalize module
+        "pooling": "mean",
+        "dimension": int(transformer.config.hidden_size),
+        "pad_token": tokenizer.pad_token,
+        "pad_token_id": int(tokenizer.pad_token_id),
+        "quantized": quantize
+    }
+    with open(os.path.join(output_dir, CONFIG_FILE), 'w', encoding='utf-8') as f:
+        json.dump(config, f, indent=2)
+
+    print(f"✅ ONNX model exported to {output_dir}")
+    return config
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export the embedding model to quantized ONNX")
+    parser.add_argument("--model", default="all-MiniLM-L6-v2")
+    parser.add_argument("--output", default="models/all-MiniLM-L6-v2-onnx")
+    parser.add_argument("--max-seq-length", type=int, default=256)
+    parser.add_argument("--no-quantize", action="store_true")
+    args = parser.parse_args()
+
+    export_onnx_model(
+        args.model,
+        args.output,
+        max_seq_length=args.max_seq_length,
+        quantize=not args.no_quantize
+    )
@@ -0,0 +1,180 @@
+"""
+Query Embedding Cache
+
+Handles:
+- LRU cache of query embeddings (resume/JD text -> vector)
+- Keys hashed from normalized query text + embedding model name
+- Optional on-disk SQLite tier that survives restarts
+- Hit ratio and saved encode time reporting
+
+Usage:
+    from rag.query_cache import QueryEmbeddingCache
+
+    cache = QueryEmbeddingCache(model_name="all-MiniLM-L6-v2", disk_path="data/query_cache.sqlite3")
+    embedding = cache.get_or_compute(query_text, model_encode_fn)
+    print(cache.get_statistics())
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+# Defaults (override with env vars)
+QUERY_CACHE_SIZE = int(os.getenv("QUERY_CACHE_SIZE", "2048"))
+QUERY_CACHE_PATH = os.getenv("QUERY_CACHE_PATH", "")  # Empty = memory only
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(text: str) -> str:
+    """Normalize query text so trivially different inputs share a cache entry"""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text or "")).strip()
+
+
+def query_key(text: str, model_name: str) -> str:
+    """Cache key: hash of model name + normalized text"""
+    payload = f"{model_name}\x00{normalize_query(text)}".encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+
+class QueryEmbeddingCache:
+    """Two-tier (memory LRU + optional SQLite) cache of query embeddings"""
+
+    def __init__(self, model_name: str, max_entries: int = QUERY_CACHE_SIZE,
+                 disk_path: Optional[str] = QUERY_CACHE_PATH or None):
+        self.model_name = model_name
+        self.max_entries = max_entries
+        self.disk_path = disk_path
+
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk: Optional[sqlite3.Connection] = None
+
+        if disk_path:
+            self._open_disk(disk_path)
+
+        # Statistics
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.encode_seconds = 0.0
+
+    def _open_disk(self, path: str):
+        """Open (or create) the persistent tier"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._disk = sqlite3.connect(path, check_same_thread=False)
+        self._disk.execute("PRAGMA journal_mode=WAL")
+        self._disk.execute(
+            "CREATE TABLE IF NOT EXISTS query_embeddings ("
+            "key TEXT PRIMARY KEY, model TEXT NOT NULL, vector BLOB NOT NULL)"
+        )
+        self._disk.commit()
+
+    def get(self, text: str) -> Optional[np.ndarray]:
+        """Look up a cached embedding (memory first, then disk)"""
+        key = query_key(text, self.model_name)
+
+        with self._lock:
+            embedding = self._memory.get(key)
+            if embedding is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return embedding
+
+            if self._disk is not None:
+                row = self._disk.execute(
+                    "SELECT vector FROM query_embeddings WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    embedding = self._freeze(np.frombuffer(row[0], dtype="float32"))
+                    self._remember(key, embedding)
+                    self.disk_hits += 1
+                    return embedding
+
+        return None
+
+    def put(self, text: str, embedding: np.ndarray) -> np.ndarray:
+        """Store an embedding in both tiers and return the cached copy"""
+        key = query_key(text, self.model_name)
+        embedding = self._freeze(np.asarray(embedding, dtype="float32").ravel())
+
+        with self._lock:
+            self._remember(key, embedding)
+            if self._disk is not None:
+                self._disk.execute(
+                    "INSERT OR REPLACE INTO query_embeddings (key, model, vector) VALUES (?, ?, ?)",
+                    (key, self.model_name, embedding.tobytes())
+                )
+                self._disk.commit()
+
+        return embedding
+
+    def get_or_compute(self, text: str, encode: Callable[[str], np.ndarray]) -> np.ndarray:
+        """Return cached embedding, encoding (and caching) on a miss"""
+        embedding = self.get(text)
+        if embedding is not None:
+            return embedding
+
+        started = time.perf_counter()
+        embedding = encode(text)
+        elapsed = time.perf_counter() - started
+
+        with self._lock:
+            self.misses += 1
+            self.encode_seconds += elapsed
+
+        return self.put(text, embedding)
+
+    def _remember(self, key: str, embedding: np.ndarray):
+        """Insert into the memory tier, evicting least recently used entries"""
+        self._memory[key] = embedding
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    @staticmethod
+    def _freeze(embedding: np.ndarray) -> np.ndarray:
+        """Cached vectors are shared between callers, so make them read-only"""
+        embedding = np.array(embedding, dtype="float32", copy=True)
+        embedding.flags.writeable = False
+        return embedding
+
+    def clear(self):
+        """Drop the memory tier (disk tier is kept)"""
+        with self._lock:
+            self._memory.clear()
+
+    def close(self):
+        """Close the disk tier"""
+        with self._lock:
+            if self._disk is not None:
+                self._disk.close()
+                self._disk = None
+
+    def get_statistics(self) -> Dict:
+        """Hit ratio and encode time saved by the cache"""
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+        avg_encode = self.encode_seconds / self.misses if self.misses else 0.0
+        return {
+            "model": self.model_name,
+            "entries": len(self._memory),
+            "max_entries": self.max_entries,
+            "persistent": self._disk is not None,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+            "avg_encode_ms": round(avg_encode * 1000, 2),
+            "saved_encode_ms": round(hits * avg_encode * 1000, 2)
+        }
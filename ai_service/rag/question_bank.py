@@ -0,0 +1,313 @@
+"""
+Question Bank Module
+
+Handles:
+- The list of question bank files served by the retriever
+- Loading them into named pools (warmup_questions, dsa_questions, ...)
+- Flattening pools into one bank with stable positions (used as vector ids)
+- Loading from the compiled bundle (rag/question_bundle.py), JSON only in dev mode
+- One id -> record index over the whole bank, shared by the retriever and flow controller
+- Questions as immutable QuestionRecords (rag/question_record.py), not dicts
+- Empirical difficulty/weight overrides from question_weight_calibration.json
+  (written by question_calibration.py), applied when pools are loaded
+
+Paths are resolved against the ai_service directory, not the working directory.
+
+Usage:
+    from rag.question_bank import load_bank
+
+    pools, bank, pool_ranges = load_bank()
+    start, stop = pool_ranges['warmup_questions']   # bank[start:stop] are warmup questions
+
+    index = get_question_index(bank)
+    index.get('dsa_001')                            # O(1), any pool
+"""
+
+import json
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+from rag.question_record import freeze_pools
+
+AI_SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.getenv("MOCKMATE_DATA_DIR", os.path.join(AI_SERVICE_DIR, 'data'))
+
+# "production" requires the compiled bundle; anything else may fall back to JSON
+MOCKMATE_ENV = os.getenv("MOCKMATE_ENV", "development").lower()
+
+# Questions indexed by the original embeddings.index build
+INDEXED_QUESTIONS_FILE = 'data/embeddings_questions.json'
+
+# Fitted difficulty/weight overrides live in its "empirical_calibration" section
+CALIBRATION_FILE = 'data/question_weight_calibration.json'
+CALIBRATION_ENABLED = os.getenv("QUESTION_CALIBRATION_ENABLED", "true").lower() == "true"
+
+# (file, pool name) in bank order
+QUESTION_FILES = [
+    # General interview questions
+    ('data/warmup_questions.json', 'warmup_questions'),
+    ('data/introductory_icebreaker.json', 'introductory_questions'),
+    ('data/hr_basic_questions.json', 'hr_basic_questions'),
+    ('data/behavioral_questions.json', 'behavioral_questions'),
+    ('data/situational_questions.json', 'situational_questions'),
+    ('data/self_awareness.json', 'self_awareness_questions'),
+    ('data/personality_questions.json', 'personality_questions'),
+    ('data/career_questions.json', 'career_questions'),
+    ('data/communication_teamwork.json', 'communication_questions'),
+    ('data/work_ethic_professionalism.json', 'work_ethic_questions'),
+    ('data/values_ethics_integrity.json', 'ethics_questions'),
+    ('data/company_role_fit.json', 'company_fit_questions'),
+    ('data/pressure_trick_questions.json', 'pressure_questions'),
+    # Technical questions
+    ('data/programming_fundamentals.json', 'programming_questions'),
+    ('data/dsa_questions.json', 'dsa_questions'),
+    ('data/database_backend.json', 'database_questions'),
+    ('data/web_frontend.json', 'web_frontend_questions'),
+    ('data/problem_solving.json', 'problem_solving_questions'),
+    # Profession-specific questions
+    ('data/medical_professional.json', 'medical_questions'),
+    ('data/pilot_aviation.json', 'pilot_questions'),
+    ('data/lawyer_legal.json', 'lawyer_questions'),
+    ('data/teacher_education.json', 'teacher_questions'),
+    ('data/police_defense.json', 'police_defense_questions'),
+    ('data/mba_management.json', 'mba_management_questions'),
+    ('data/cabin_crew.json', 'cabin_crew_questions'),
+    ('data/civil_services.json', 'civil_services_questions'),
+    ('data/journalist_media.json', 'journalist_questions'),
+    ('data/psychologist_therapist.json', 'psychologist_questions'),
+    ('data/hotel_hospitality.json', 'hotel_hospitality_questions'),
+    ('data/actor_artist.json', 'actor_artist_questions'),
+    ('data/entrepreneur_startup.json', 'entrepreneur_questions'),
+    ('data/designer_creative.json', 'designer_creative_questions')
+]
+
+# Pool names in bank order ('questions' = the indexed set)
+BANK_POOLS = ['questions'] + [pool for _, pool in QUESTION_FILES]
+
+
+def resolve_path(path: str) -> str:
+    """Absolute path for a 'data/...' path, independent of the working directory"""
+    if os.path.isabs(path):
+        return path
+    if path.startswith('data/') or path.startswith('data' + os.sep):
+        return os.path.join(DATA_DIR, path[len('data/'):])
+    if os.path.exists(path):
+        return os.path.abspath(path)
+    return os.path.join(AI_SERVICE_DIR, path)
+
+
+def apply_calibration(pools: Dict[str, List[Dict]], calibration) -> int:
+    """
+    Overwrite difficulty and weight with the fitted values in calibration's
+    "empirical_calibration" section (in place, before the pools are frozen).
+
+    Returns the number of questions changed.
+    """
+    fitted = ((calibration or {}).get('empirical_calibration') or {}).get('questions') or {}
+    if not CALIBRATION_ENABLED or not fitted:
+        return 0
+    changed = 0
+    for questions in pools.values():
+        for q in questions:
+            entry = fitted.get(q.get('id'))
+            if entry:
+                q['difficulty'] = entry['difficulty']
+                q['weight'] = entry['weight']
+                changed += 1
+    return changed
+
+
+def load_question_sets(indexed_questions_file: str = INDEXED_QUESTIONS_FILE,
+                       calibrated: bool = True) -> Dict[str, List[Dict]]:
+    """
+    Load every question file that exists into {pool name: questions} (JSON sources).
+
+    calibrated=False keeps the hand-assigned difficulty and weight.
+    """
+    with open(resolve_path(indexed_questions_file), 'r', encoding='utf-8') as f:
+        pools = {'questions': json.load(f)}
+
+    for file_path, pool_name in QUESTION_FILES:
+        path = resolve_path(file_path)
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                pools[pool_name] = json.load(f)
+            print(f"✓ Loaded {len(pools[pool_name])} questions from {file_path}")
+        else:
+            pools[pool_name] = []
+
+    calibration_path = resolve_path(CALIBRATION_FILE)
+    if calibrated and os.path.exists(calibration_path):
+        with open(calibration_path, 'r', encoding='utf-8') as f:
+            changed = apply_calibration(pools, json.load(f))
+        if changed:
+            print(f"✓ Applied empirical calibration to {changed} questions")
+
+    return pools
+
+
+def is_production() -> bool:
+    return MOCKMATE_ENV == "production"
+
+
+# (bundle file stamp, loaded bundle): the retriever and flow controller share one load
+_bundle_cache = (None, None)
+
+
+def open_bundle():
+    """
+    The compiled bundle, or None when JSON should be used instead (dev mode only).
+
+    In production a missing or corrupt bundle is an error.
+    """
+    global _bundle_cache
+    from rag.question_bundle import BUNDLE_PATH, BundleError, load_bundle
+
+    try:
+        stat = os.stat(BUNDLE_PATH)
+        stamp = (stat.st_size, stat.st_mtime_ns)
+    except OSError:
+        stamp = None
+    if stamp is not None and _bundle_cache[0] == stamp:
+        return _bundle_cache[1]
+
+    try:
+        bundle = load_bundle()
+    except BundleError as e:
+        if is_production():
+            raise RuntimeError(f"Question bundle required in production: {e}")
+        print(f"⚠️  {e}; loading JSON files (dev mode)")
+        return None
+
+    if not is_production():
+        stale = bundle.stale_sources(DATA_DIR)
+        if stale:
+            print(f"⚠️  Question bundle is out of date ({', '.join(stale[:5])}"
+                  f"{'...' if len(stale) > 5 else ''}); loading JSON files (dev mode). "
+                  f"Recompile: python rag/question_bundle.py")
+            return None
+
+    _bundle_cache = (stamp, bundle)
+    return bundle
+
+
+def load_pools(indexed_questions_file: str = INDEXED_QUESTIONS_FILE) -> Dict[str, List[Dict]]:
+    """Pools from the compiled bundle, or the JSON files in dev mode"""
+    started = time.perf_counter()
+    bundle = open_bundle() if indexed_questions_file == INDEXED_QUESTIONS_FILE else None
+    if bundle is not None:
+        pools = bundle.pools
+        source = "bundle"
+    else:
+        pools = freeze_pools(load_question_sets(indexed_questions_file))
+        source = "JSON"
+
+    total = sum(len(questions) for questions in pools.values())
+    print(f"✓ Question bank loaded from {source}: {total} questions in {(time.perf_counter() - started) * 1000:.1f}ms")
+    return pools
+
+
+def bank_columns(pools: Dict[str, List[Dict]]):
+    """
+    Precomputed metadata columns {field: (codes, values)} when pools came from
+    the bundle (None for JSON-loaded pools)
+    """
+    bundle = _bundle_cache[1]
+    if bundle is None or bundle.pools is not pools:
+        return None
+    return {field: (bundle.codes(field), values) for field, values in bundle.code_tables.items()}
+
+
+def load_data_file(path: str):
+    """A data/*.json file (e.g. interview_flow.json) from the bundle when available"""
+    resolved = resolve_path(path)
+    if os.path.dirname(resolved) == os.path.abspath(DATA_DIR):
+        bundle = open_bundle()
+        if bundle is not None and os.path.basename(resolved) in bundle.files:
+            return bundle.files[os.path.basename(resolved)]
+    with open(resolved, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def flatten_pools(pools: Dict[str, List[Dict]]) -> Tuple[List[Dict], Dict[str, Tuple[int, int]]]:
+    """
+    Concatenate pools in BANK_POOLS order.
+
+    Returns the bank and each pool's [start, stop) range in it. Positions are
+    the bank's identity: several files reuse the same id string for
+    different questions, so ids alone are not unique.
+    """
+    bank = []
+    ranges = {}
+    for pool_name in BANK_POOLS:
+        questions = pools.get(pool_name, [])
+        ranges[pool_name] = (len(bank), len(bank) + len(questions))
+        bank.extend(questions)
+    return bank, ranges
+
+
+class QuestionIndex:
+    """
+    O(1) lookup of bank records by question id.
+
+    A few files reuse an id for different questions. Those duplicates are
+    reported when the index is built; get() returns the first record in
+    bank order and get_all() returns every record with the id.
+    """
+
+    def __init__(self, bank: List[Dict]):
+        self.bank = bank
+        self.positions: Dict[str, List[int]] = {}
+        for pos, question in enumerate(bank):
+            self.positions.setdefault(question.get('id'), []).append(pos)
+
+        self.duplicates = {
+            question_id: positions
+            for question_id, positions in self.positions.items()
+            if len(positions) > 1
+        }
+        if self.duplicates:
+            names = ', '.join(sorted(map(str, self.duplicates))[:5])
+            more = '...' if len(self.duplicates) > 5 else ''
+            print(f"⚠️  {len(self.duplicates)} question id(s) used by more than one question ({names}{more}); "
+                  f"lookups return the first in bank order")
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def __contains__(self, question_id: str) -> bool:
+        return question_id in self.positions
+
+    def position(self, question_id: str) -> Optional[int]:
+        """Bank position of the first record with this id"""
+        positions = self.positions.get(question_id)
+        return positions[0] if positions else None
+
+    def get(self, question_id: str) -> Optional[Dict]:
+        """The record with this id (first in bank order), or None"""
+        positions = self.positions.get(question_id)
+        return self.bank[positions[0]] if positions else None
+
+    def get_all(self, question_id: str) -> List[Dict]:
+        """Every record using this id"""
+        return [self.bank[pos] for pos in self.positions.get(question_id, ())]
+
+
+# (bank, index) for the most recently indexed bank: one index per loaded bank
+_index_cache = (None, None)
+
+
+def get_question_index(bank: List[Dict]) -> QuestionIndex:
+    """The shared QuestionIndex for a bank list (built once per bank object)"""
+    global _index_cache
+    if _index_cache[0] is not bank:
+        _index_cache = (bank, QuestionIndex(bank))
+    return _index_cache[1]
+
+
+def load_bank(indexed_questions_file: str = INDEXED_QUESTIONS_FILE):
+    """Load all pools and the flattened bank"""
+    pools = load_pools(indexed_questions_file)
+    bank, ranges = flatten_pools(pools)
+    return pools, bank, ranges
@@ -0,0 +1,336 @@
+"""
+Question Bank Bundle
+
+Handles:
+- Compiling every data/*.json file into one validated, versioned binary bundle
+- Loading the bundle through mmap (one file, no per-file JSON parsing)
+- Precomputed metadata columns for the bank (role/level/skill/stage/category/difficulty codes)
+- Staleness checks against the JSON sources (dev mode)
+
+File layout (little-endian):
+    magic     8 bytes  b"MMQBUNDL"
+    version   uint32
+    header    uint32 length + JSON (sections, pool ranges, code tables, sources)
+    sha256    32 bytes over the body
+    body      sections at the offsets listed in the header:
+              - "pools":  pickle of {pool name: questions} served by the retriever
+                          (strings interned, so repeated values are stored once)
+              - "files":  pickle of every other data file (configs, unindexed
+                          banks), only unpickled when first used
+              - "codes/<field>": int16 array, one value code per bank position
+
+Usage:
+    python rag/question_bundle.py                  # compile data/*.json -> data/question_bank.bundle
+    python rag/question_bundle.py --check          # validate only
+
+    from rag.question_bundle import load_bundle
+    bundle = load_bundle()
+    pools, bank, ranges = bundle.pools, bundle.bank, bundle.ranges
+"""
+
+import glob
+import hashlib
+import json
+import mmap
+import os
+import pickle
+import struct
+import sys
+import time
+from typing import Dict, List
+
+if __package__ in (None, ""):
+    # Allow `python rag/question_bundle.py` from the ai_service directory
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rag.question_bank import (
+    CALIBRATION_FILE, DATA_DIR, INDEXED_QUESTIONS_FILE, QUESTION_FILES, apply_calibration, flatten_pools
+)
+from rag.question_record import QuestionRecord, freeze_pools
+
+BUNDLE_MAGIC = b"MMQBUNDL"
+BUNDLE_VERSION = 1
+BUNDLE_PATH = os.getenv("QUESTION_BUNDLE_PATH", os.path.join(DATA_DIR, "question_bank.bundle"))
+
+_PREAMBLE = struct.Struct("<8sII")  # magic, version, header length
+
+
+class BundleError(Exception):
+    """Bundle missing, corrupt, from another format version or out of date"""
+
+
+def validate_file(name: str, content) -> List[str]:
+    """Problems with one data file (question banks are lists of question records)"""
+    if name == os.path.basename(CALIBRATION_FILE) and isinstance(content, dict):
+        return validate_calibration(name, content)
+    if not isinstance(content, list):
+        return []  # Config files (interview_flow.json, taxonomy.json, ...)
+
+    problems = []
+    for i, q in enumerate(content):
+        where = f"{name}[{i}]"
+        if not isinstance(q, dict):
+            problems.append(f"{where}: not an object")
+            continue
+        if not isinstance(q.get('id'), str) or not q['id']:
+            problems.append(f"{where}: missing id")
+        if not isinstance(q.get('question'), str) or not q['question'].strip():
+            problems.append(f"{where} ({q.get('id')}): missing question text")
+        difficulty = q.get('difficulty')
+        if difficulty is not None and (not isinstance(difficulty, int) or not 1 <= difficulty <= 5):
+            problems.append(f"{where} ({q.get('id')}): difficulty {difficulty!r} not an int in 1-5")
+        weight = q.get('weight')
+        if weight is not None and not isinstance(weight, (int, float)):
+            problems.append(f"{where} ({q.get('id')}): weight {weight!r} not a number")
+        if q.get('ideal_points') is not None and not isinstance(q['ideal_points'], list):
+            problems.append(f"{where} ({q.get('id')}): ideal_points not a list")
+    return problems
+
+
+def validate_calibration(name: str, content: Dict) -> List[str]:
+    """Problems with the fitted overrides in question_weight_calibration.json"""
+    fitted = (content.get('empirical_calibration') or {}).get('questions') or {}
+    problems = []
+    for question_id, entry in fitted.items():
+        where = f"{name}[empirical_calibration][{question_id}]"
+        difficulty, weight = entry.get('difficulty'), entry.get('weight')
+        if not isinstance(difficulty, int) or not 1 <= difficulty <= 5:
+            problems.append(f"{where}: difficulty {difficulty!r} not an int in 1-5")
+        if not isinstance(weight, (int, float)) or weight <= 0:
+            problems.append(f"{where}: weight {weight!r} not a positive number")
+    return problems
+
+
+def _intern(value):
+    """Recursively intern strings so equal values share one object (and one pickle entry)"""
+    if isinstance(value, str):
+        return sys.intern(value)
+    if isinstance(value, list):
+        return [_intern(v) for v in value]
+    if isinstance(value, dict):
+        return {sys.intern(k): _intern(v) for k, v in value.items()}
+    return value
+
+
+def _source_files(data_dir: str) -> List[str]:
+    return sorted(glob.glob(os.path.join(data_dir, "*.json")))
+
+
+def _source_stamp(path: str) -> List:
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+# Data file name -> retriever pool name
+POOL_FILES = {os.path.basename(INDEXED_QUESTIONS_FILE): 'questions'}
+POOL_FILES.update({os.path.basename(file_path): pool_name for file_path, pool_name in QUESTION_FILES})
+
+
+def pools_from_files(files: Dict[str, object]) -> Dict[str, List[Dict]]:
+    """Retriever pools from parsed data files (same rules as load_question_sets)"""
+    pools = {pool_name: [] for pool_name in POOL_FILES.values()}
+    for name, pool_name in POOL_FILES.items():
+        if name in files:
+            pools[pool_name] = files[name]
+    apply_calibration(pools, files.get(os.path.basename(CALIBRATION_FILE)))
+    return pools
+
+
+def metadata_columns(bank: List[Dict]):
+    """Per-field value codes over bank positions and the code -> value tables"""
+    import numpy as np
+    from rag.metadata_filter import FILTER_FIELDS, normalize_value
+
+    columns, tables = {}, {}
+    for field in FILTER_FIELDS:
+        values = sorted({normalize_value(q.get(field)) for q in bank} - {None}, key=str)
+        code_of = {value: code for code, value in enumerate(values)}
+        columns[field] = np.array(
+            [code_of.get(normalize_value(q.get(field)), -1) for q in bank], dtype='<i2'
+        )
+        tables[field] = values
+    return columns, tables
+
+
+def compile_bundle(data_dir: str = DATA_DIR, output_path: str = BUNDLE_PATH) -> Dict:
+    """
+    Validate data/*.json and write the bundle.
+
+    Raises BundleError listing every problem if any file is invalid.
+    """
+    started = time.perf_counter()
+    files, sources, problems = {}, {}, []
+
+    for path in _source_files(data_dir):
+        name = os.path.basename(path)
+        with open(path, 'rb') as f:
+            raw = f.read()
+        try:
+            content = json.loads(raw.decode('utf-8'))
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            problems.append(f"{name}: invalid JSON ({e})")
+            continue
+        problems.extend(validate_file(name, content))
+        files[name] = _intern(content)
+        sources[name] = _source_stamp(path) + [hashlib.sha256(raw).hexdigest()]
+
+    if problems:
+        raise BundleError(f"{len(problems)} problem(s) in {data_dir}:\n  " + "\n  ".join(problems))
+
+    pools = pools_from_files(files)
+    bank, ranges = flatten_pools(pools)
+    columns, tables = metadata_columns(bank)
+
+    # Body: pickled pools, pickled other files, then 8-byte aligned code columns
+    sections = {}
+    body = bytearray()
+    other_files = {name: content for name, content in files.items() if name not in POOL_FILES}
+    for section, value in (("pools", pools), ("files", other_files)):
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        sections[section] = {"offset": len(body), "length": len(payload)}
+        body += payload
+    for field, column in columns.items():
+        body += b"\0" * (-len(body) % 8)
+        sections[f"codes/{field}"] = {"offset": len(body), "length": column.nbytes, "dtype": column.dtype.str}
+        body += column.tobytes()
+
+    header = json.dumps({
+        "created": time.time(),
+        "bank_size": len(bank),
+        "pool_ranges": ranges,
+        "code_tables": tables,
+        "sections": sections,
+        "sources": sources
+    }).encode('utf-8')
+
+    tmp_path = output_path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(_PREAMBLE.pack(BUNDLE_MAGIC, BUNDLE_VERSION, len(header)))
+        f.write(header)
+        f.write(hashlib.sha256(body).digest())
+        f.write(body)
+    os.replace(tmp_path, output_path)
+
+    return {
+        "files": len(files),
+        "questions": len(bank),
+        "bytes": os.path.getsize(output_path),
+        "seconds": round(time.perf_counter() - started, 3)
+    }
+
+
+class QuestionBundle:
+    """A loaded bundle: retriever pools, metadata columns and (lazily) every other data file"""
+
+    def __init__(self, path: str, verify: bool = True):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            magic, version, header_length = _PREAMBLE.unpack_from(self._mm, 0)
+        except struct.error:
+            raise BundleError(f"{path} is truncated")
+        if magic != BUNDLE_MAGIC:
+            raise BundleError(f"{path} is not a question bundle")
+        if version != BUNDLE_VERSION:
+            raise BundleError(f"{path} is bundle version {version}, expected {BUNDLE_VERSION} (recompile)")
+
+        header_start = _PREAMBLE.size
+        self.header = json.loads(self._mm[header_start:header_start + header_length])
+        digest_start = header_start + header_length
+        self._body_start = digest_start + 32
+        body = memoryview(self._mm)[self._body_start:]
+
+        if verify and hashlib.sha256(body).digest() != self._mm[digest_start:self._body_start]:
+            body.release()
+            raise BundleError(f"{path} failed its content hash check (corrupt or partially written)")
+
+        body.release()
+
+        self.pools: Dict[str, List[QuestionRecord]] = freeze_pools(self._unpickle("pools"))
+        self.bank, self.ranges = flatten_pools(self.pools)
+        self.code_tables: Dict[str, List] = self.header["code_tables"]
+        self._files = None
+
+    def _section(self, name: str) -> memoryview:
+        section = self.header["sections"][name]
+        start = self._body_start + section["offset"]
+        return memoryview(self._mm)[start:start + section["length"]]
+
+    def _unpickle(self, name: str):
+        view = self._section(name)
+        try:
+            return pickle.loads(view)
+        finally:
+            view.release()
+
+    @property
+    def files(self) -> Dict[str, object]:
+        """Every data file by name ({'interview_flow.json': {...}, ...})"""
+        if self._files is None:
+            files = self._unpickle("files")
+            for name, pool_name in POOL_FILES.items():
+                if name in self.header["sources"]:
+                    files[name] = self.pools[pool_name]
+            self._files = files
+        return self._files
+
+    def codes(self, field: str):
+        """Value codes for a filter field over bank positions (-1 = unset), zero-copy from the mmap"""
+        import numpy as np
+
+        section = self.header["sections"][f"codes/{field}"]
+        dtype = np.dtype(section["dtype"])
+        return np.frombuffer(
+            self._mm, dtype=dtype, count=section["length"] // dtype.itemsize,
+            offset=self._body_start + section["offset"]
+        )
+
+    def stale_sources(self, data_dir: str = DATA_DIR) -> List[str]:
+        """JSON files added, removed or changed since the bundle was compiled"""
+        sources = self.header["sources"]
+        current = {os.path.basename(p): p for p in _source_files(data_dir)}
+        stale = sorted(set(sources) ^ set(current))
+        for name in set(sources) & set(current):
+            size, mtime_ns, sha = sources[name]
+            if _source_stamp(current[name]) == [size, mtime_ns]:
+                continue
+            with open(current[name], 'rb') as f:
+                if hashlib.sha256(f.read()).hexdigest() != sha:
+                    stale.append(name)
+        return sorted(stale)
+
+
+def load_bundle(path: str = BUNDLE_PATH, verify: bool = True) -> QuestionBundle:
+    """Open and verify a compiled bundle (raises BundleError)"""
+    if not os.path.exists(path):
+        raise BundleError(f"{path} not found (run: python rag/question_bundle.py)")
+    return QuestionBundle(path, verify=verify)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compile data/*.json into the question bank bundle")
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--output", default=BUNDLE_PATH)
+    parser.add_argument("--check", action="store_true", help="Validate the JSON files without writing")
+    args = parser.parse_args()
+
+    try:
+        if args.check:
+            problems = []
+            for path in _source_files(args.data_dir):
+                with open(path, 'r', encoding='utf-8') as f:
+                    problems.extend(validate_file(os.path.basename(path), json.load(f)))
+            if problems:
+                raise BundleError(f"{len(problems)} problem(s):\n  " + "\n  ".join(problems))
+            print(f"✅ {len(_source_files(args.data_dir))} data files valid")
+        else:
+            stats = compile_bundle(args.data_dir, args.output)
+            print(f"✅ Compiled {stats['files']} files ({stats['questions']} bank questions) "
+                  f"-> {args.output} ({stats['bytes'] / 1024:.0f} KB) in {stats['seconds']}s")
+    except BundleError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
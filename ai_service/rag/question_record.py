@@ -0,0 +1,210 @@
+"""
+Question Records
+
+Handles:
+- Immutable, slotted records for bank questions (no per-question dict)
+- Interned categorical values (role, level, stage, ...): one string object per
+  distinct value across the whole bank
+- Nested lists/dicts frozen into tuples and read-only mappings
+- Retrieval results as (record, score) views instead of copied dicts
+
+Records and views are read-only mappings, so code written against question
+dicts (q['id'], q.get('skill'), 'level' in q) keeps working. to_dict()
+returns the JSON form.
+
+Usage:
+    from rag.question_record import QuestionRecord, ScoredQuestion, freeze_pools
+
+    record = QuestionRecord({'id': 'dsa_001', 'question': '...', 'role': 'backend'})
+    record.role is QuestionRecord({'id': 'x', 'role': 'backend'}).role   # True (interned)
+
+    result = ScoredQuestion((record, 0.42))
+    record, score = result
+    result['id'], result['score'], result.skill
+"""
+
+import sys
+from collections.abc import Mapping
+from operator import itemgetter
+from types import MappingProxyType
+from typing import Dict, List, Tuple
+
+# Keys every bank question (or nearly every one) carries: stored in slots.
+# Anything else goes to a small read-only `extra` mapping.
+RECORD_FIELDS = (
+    'id', 'question', 'category', 'stage', 'role', 'level', 'skill', 'priority',
+    'difficulty', 'weight', 'expected_duration_sec', 'interviewer_goal',
+    'ideal_points', 'follow_ups', 'evaluation_rubric'
+)
+_FIELD_SET = frozenset(RECORD_FIELDS)
+
+# Repeated categorical values, shared through sys.intern
+INTERNED_FIELDS = frozenset({
+    'category', 'stage', 'role', 'level', 'skill', 'priority', 'interviewer_goal'
+})
+
+# Key-order tuples, shared by every record with the same layout
+_layouts: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+
+
+def _layout(keys: Tuple[str, ...]) -> Tuple[str, ...]:
+    return _layouts.setdefault(keys, tuple(sys.intern(key) for key in keys))
+
+
+def _freeze(value, intern: bool = False):
+    """Read-only copy of a JSON value (lists -> tuples, dicts -> mapping proxies)"""
+    if isinstance(value, str):
+        return sys.intern(value) if intern else value
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return MappingProxyType({sys.intern(k): _freeze(v) for k, v in value.items()})
+    return value
+
+
+def _thaw(value):
+    """JSON form of a frozen value"""
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    if isinstance(value, Mapping):
+        return {k: _thaw(v) for k, v in value.items()}
+    return value
+
+
+class QuestionRecord(Mapping):
+    """One bank question: immutable, slotted, read like a dict"""
+
+    __slots__ = RECORD_FIELDS + ('extra', '_keys')
+
+    def __init__(self, data: Mapping):
+        extra = {}
+        for key, value in data.items():
+            frozen = _freeze(value, intern=key in INTERNED_FIELDS)
+            if key in _FIELD_SET:
+                object.__setattr__(self, key, frozen)
+            else:
+                extra[sys.intern(key)] = frozen
+        object.__setattr__(self, 'extra', MappingProxyType(extra) if extra else None)
+        object.__setattr__(self, '_keys', _layout(tuple(data)))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("QuestionRecord is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("QuestionRecord is immutable")
+
+    def __getitem__(self, key):
+        if key in _FIELD_SET:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        if self.extra is not None and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        if key in _FIELD_SET:
+            return getattr(self, key, default)
+        if self.extra is not None:
+            return self.extra.get(key, default)
+        return default
+
+    def __contains__(self, key) -> bool:
+        if key in _FIELD_SET:
+            return hasattr(self, key)
+        return self.extra is not None and key in self.extra
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def to_dict(self) -> Dict:
+        """The question as plain JSON data (lists and dicts)"""
+        return {key: _thaw(self[key]) for key in self._keys}
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if isinstance(other, QuestionRecord):
+            return self.to_dict() == other.to_dict()
+        if isinstance(other, Mapping):
+            return self.to_dict() == _thaw(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __reduce__(self):
+        return (QuestionRecord, (self.to_dict(),))
+
+    def __repr__(self) -> str:
+        return f"QuestionRecord(id={self.get('id')!r})"
+
+
+class ScoredQuestion(tuple):
+    """
+    A retrieval result: a (record, score) pair that also reads like the old
+    copied result dict (result['id'], result['score'], result.get('skill')).
+
+    Built from a pair like a namedtuple's _make (ScoredQuestion((record, score))),
+    which keeps construction in C. Nothing from the record is copied.
+    """
+
+    __slots__ = ()
+
+    record = property(itemgetter(0), doc="The bank QuestionRecord")
+    score = property(itemgetter(1), doc="Similarity score from the search")
+
+    def __getattr__(self, name):
+        # Question fields as attributes (result.id, result.skill)
+        return getattr(tuple.__getitem__(self, 0), name)
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            if key == 'score':
+                return tuple.__getitem__(self, 1)
+            return tuple.__getitem__(self, 0)[key]
+        return tuple.__getitem__(self, key)
+
+    def get(self, key, default=None):
+        if key == 'score':
+            return self.score
+        return self.record.get(key, default)
+
+    def __contains__(self, key) -> bool:
+        if isinstance(key, str):
+            return key == 'score' or key in self.record
+        return tuple.__contains__(self, key)
+
+    def keys(self) -> List[str]:
+        return [*self.record, 'score']
+
+    def items(self):
+        return [(key, self[key]) for key in self.keys()]
+
+    def to_dict(self) -> Dict:
+        return dict(self.record.to_dict(), score=self.score)
+
+    def __eq__(self, other):
+        if isinstance(other, Mapping):
+            return self.to_dict() == _thaw(other)
+        return tuple.__eq__(self, other)
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"ScoredQuestion(id={self.record.get('id')!r}, score={self.score:.4f})"
+
+
+def freeze_pools(pools: Dict[str, List[Dict]]) -> Dict[str, List[QuestionRecord]]:
+    """{pool name: questions} with every question as a QuestionRecord"""
+    return {
+        pool_name: [q if isinstance(q, QuestionRecord) else QuestionRecord(q) for q in questions]
+        for pool_name, questions in pools.items()
+    }
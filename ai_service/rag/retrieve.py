@@ -2,9 +2,9 @@
 RAG Retrieval Module
 
 Handles:
-- Semantic search over question bank
+- Semantic search over question bank (one index over every question file)
 - Filtering by metadata (role, level, skill)
-- Ranking and scoring
+- Ranking and scoring (results are (record, score) views, never copies)
 - Phased interview flow (warmup -> behavioral -> technical)
 - Question state tracking (asked/answered/skipped)
 - Follow-up question generation
@@ -27,145 +27,238 @@ Usage:
 import numpy as np
 import json
 import os
+import sys
 from typing import List, Dict, Optional, Set
-from sentence_transformers import SentenceTransformer
 import faiss
 
+if __package__ in (None, ""):
+    # Allow `python rag/retrieve.py` from the ai_service directory
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rag.embeddings import BANK_INDEX_PREFIX, get_model, get_model_id, load_or_build_bank_index
+from rag.metadata_filter import MetadataFilter, mask_selector
+from rag.query_cache import QueryEmbeddingCache
+from rag.question_bank import (
+    BANK_POOLS, bank_columns, flatten_pools, get_question_index, load_pools, resolve_path
+)
+from rag.question_record import ScoredQuestion
+from rag.vector_index import is_exact, search_index
+
+# Score of picks made by rule rather than by search (what an empty query scores)
+RULE_PICK_SCORE = 0.0
+
+# Curated pools served in each phase
+BEHAVIORAL_PHASE_POOLS = [
+    'hr_basic_questions', 'behavioral_questions', 'situational_questions',
+    'personality_questions', 'career_questions'
+]
+TECHNICAL_PHASE_POOLS = {
+    'technical': ['programming_questions', 'dsa_questions', 'database_questions', 'web_frontend_questions'],
+    'advanced': ['problem_solving_questions']
+}
+
+# Difficulty window for indexed questions in each phase (inclusive; None = no upper bound)
+PHASE_DIFFICULTY = {
+    'technical': (2, 4),
+    'advanced': (4, None)
+}
+
+# Warmup questions put first when they apply, tagged by a phrase in their text
+WARMUP_TAGS = {
+    'introduction': 'introduce',
+    'education': 'educational background',
+    'target_role': 'this role'
+}
+
 class QuestionRetriever:
-    def __init__(self, index_path: str = 'data/embeddings'):
+    def __init__(self, index_path: str = 'data/embeddings', bank_index_path: str = BANK_INDEX_PREFIX):
         """Initialize retriever with pre-built index"""
-        self.model = SentenceTransformer("all-MiniLM-L6-v2")
-        
-        # Load index and questions
-        self.index = faiss.read_index(f"{index_path}.index")
-        with open(f"{index_path}_questions.json", 'r') as f:
-            self.questions = json.load(f)
-        
-        # Load all additional question sets
-        self.warmup_questions = []
-        self.introductory_questions = []
-        self.hr_basic_questions = []
-        self.behavioral_questions = []
-        self.situational_questions = []
-        self.self_awareness_questions = []
-        self.personality_questions = []
-        self.career_questions = []
-        self.communication_questions = []
-        self.work_ethic_questions = []
-        self.ethics_questions = []
-        self.company_fit_questions = []
-        self.pressure_questions = []
-        self.programming_questions = []
-        self.dsa_questions = []
-        self.database_questions = []
-        self.web_frontend_questions = []
-        self.problem_solving_questions = []
-        
-        # Profession-specific question banks
-        self.medical_questions = []
-        self.pilot_questions = []
-        self.lawyer_questions = []
-        self.teacher_questions = []
-        self.police_defense_questions = []
-        self.mba_management_questions = []
-        self.cabin_crew_questions = []
-        self.civil_services_questions = []
-        self.journalist_questions = []
-        self.psychologist_questions = []
-        self.hotel_hospitality_questions = []
-        self.actor_artist_questions = []
-        self.entrepreneur_questions = []
-        self.designer_creative_questions = []
-        
-        # Load each question set if file exists
-        question_files = [
-            # General interview questions
-            ('data/warmup_questions.json', 'warmup_questions'),
-            ('data/introductory_icebreaker.json', 'introductory_questions'),
-            ('data/hr_basic_questions.json', 'hr_basic_questions'),
-            ('data/behavioral_questions.json', 'behavioral_questions'),
-            ('data/situational_questions.json', 'situational_questions'),
-            ('data/self_awareness.json', 'self_awareness_questions'),
-            ('data/personality_questions.json', 'personality_questions'),
-            ('data/career_questions.json', 'career_questions'),
-            ('data/communication_teamwork.json', 'communication_questions'),
-            ('data/work_ethic_professionalism.json', 'work_ethic_questions'),
-            ('data/values_ethics_integrity.json', 'ethics_questions'),
-            ('data/company_role_fit.json', 'company_fit_questions'),
-            ('data/pressure_trick_questions.json', 'pressure_questions'),
-            # Technical questions
-            ('data/programming_fundamentals.json', 'programming_questions'),
-            ('data/dsa_questions.json', 'dsa_questions'),
-            ('data/database_backend.json', 'database_questions'),
-            ('data/web_frontend.json', 'web_frontend_questions'),
-            ('data/problem_solving.json', 'problem_solving_questions'),
-            # Profession-specific questions
-            ('data/medical_professional.json', 'medical_questions'),
-            ('data/pilot_aviation.json', 'pilot_questions'),
-            ('data/lawyer_legal.json', 'lawyer_questions'),
-            ('data/teacher_education.json', 'teacher_questions'),
-            ('data/police_defense.json', 'police_defense_questions'),
-            ('data/mba_management.json', 'mba_management_questions'),
-            ('data/cabin_crew.json', 'cabin_crew_questions'),
-            ('data/civil_services.json', 'civil_services_questions'),
-            ('data/journalist_media.json', 'journalist_questions'),
-            ('data/psychologist_therapist.json', 'psychologist_questions'),
-            ('data/hotel_hospitality.json', 'hotel_hospitality_questions'),
-            ('data/actor_artist.json', 'actor_artist_questions'),
-            ('data/entrepreneur_startup.json', 'entrepreneur_questions'),
-            ('data/designer_creative.json', 'designer_creative_questions')
-        ]
+        # Backend chosen by EMBEDDING_BACKEND (torch SentenceTransformer or int8 ONNX)
+        self.model = get_model()
+        self.query_cache = QueryEmbeddingCache(model_name=get_model_id())
         
-        for file_path, attr_name in question_files:
-            if os.path.exists(file_path):
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    setattr(self, attr_name, json.load(f))
-                print(f"✓ Loaded {len(getattr(self, attr_name))} questions from {file_path}")
+        # Load all question sets ('questions' is the original indexed set):
+        # compiled bundle, or JSON files in dev mode
+        pools = load_pools(f"{index_path}_questions.json")
+        for pool_name in BANK_POOLS:
+            setattr(self, pool_name, pools.get(pool_name, []))
         
         # Combine all questions for comprehensive search
-        self.all_questions = (
-            self.questions + 
-            self.warmup_questions + 
-            self.introductory_questions +
-            self.hr_basic_questions + 
-            self.behavioral_questions +
-            self.situational_questions +
-            self.self_awareness_questions +
-            self.personality_questions +
-            self.career_questions +
-            self.communication_questions +
-            self.work_ethic_questions +
-            self.ethics_questions +
-            self.company_fit_questions +
-            self.pressure_questions +
-            self.programming_questions +
-            self.dsa_questions +
-            self.database_questions +
-            self.web_frontend_questions +
-            self.problem_solving_questions +
-            # Profession-specific questions
-            self.medical_questions +
-            self.pilot_questions +
-            self.lawyer_questions +
-            self.teacher_questions +
-            self.police_defense_questions +
-            self.mba_management_questions +
-            self.cabin_crew_questions +
-            self.civil_services_questions +
-            self.journalist_questions +
-            self.psychologist_questions +
-            self.hotel_hospitality_questions +
-            self.actor_artist_questions +
-            self.entrepreneur_questions +
-            self.designer_creative_questions
-        )
+        self.all_questions, self.pool_ranges = flatten_pools(pools)
+        
+        # Unified vector index over every question; vector id = position in all_questions
+        self.index = load_or_build_bank_index(self.all_questions, resolve_path(bank_index_path))
+        self._bank_position = {id(q): i for i, q in enumerate(self.all_questions)}
+        
+        # id -> record over every pool (shared with the flow controller and filters)
+        self.question_index = get_question_index(self.all_questions)
+        
+        # Metadata bitmaps, applied inside the vector search
+        self.filters = MetadataFilter(self.all_questions, bank_columns(pools))
+        
+        # Per-phase pools and warmup tags never change after load: compute once
+        self._precompute_phases()
         
         print(f"✓ Total questions loaded: {len(self.all_questions)}")
     
+    def _precompute_phases(self):
+        """Read-only phase positions and warmup tag positions used by retrieve_phased"""
+        def positions_of(mask: np.ndarray) -> np.ndarray:
+            positions = np.flatnonzero(mask)
+            positions.setflags(write=False)
+            return positions
+        
+        # Curated pools per phase (sorted bank positions)
+        self.phase_positions = {'behavioral': positions_of(self.pool_mask(*BEHAVIORAL_PHASE_POOLS))}
+        for phase, pool_names in TECHNICAL_PHASE_POOLS.items():
+            self.phase_positions[phase] = positions_of(self.pool_mask(*pool_names))
+        self._no_positions = positions_of(self.filters.none())
+        
+        # Indexed questions at each phase's difficulty
+        indexed_mask = self.pool_mask('questions')
+        self.indexed_positions = positions_of(indexed_mask)
+        self.indexed_phase_positions = {
+            phase: positions_of(indexed_mask & self.filters.difficulty_mask(difficulty))
+            for phase, difficulty in PHASE_DIFFICULTY.items()
+        }
+        
+        # Warmup positions (bank order) and the ones carrying each tag
+        self.warmup_positions = self.pool_positions('warmup_questions')
+        self.warmup_positions.setflags(write=False)
+        self.warmup_tags = {
+            tag: tuple(
+                int(pos) for pos in self.warmup_positions
+                if phrase in self.all_questions[pos]['question'].lower()
+            )
+            for tag, phrase in WARMUP_TAGS.items()
+        }
+    
     def encode_query(self, text: str) -> np.ndarray:
-        """Encode query text to embedding"""
+        """Encode query text to embedding (cached by normalized text + model)"""
+        return self.query_cache.get_or_compute(text, self._encode_uncached)
+    
+    def _encode_uncached(self, text: str) -> np.ndarray:
+        """Run the embedding model on query text"""
         return self.model.encode(text, convert_to_numpy=True).astype('float32')
     
+    @staticmethod
+    def _build_query_text(resume_text: str, job_description: str) -> str:
+        """Query used for semantic search: JD plus the head of the resume"""
+        return f"{job_description} {resume_text[:500]}"
+    
+    def search(
+        self,
+        query_embedding: np.ndarray,
+        k: int,
+        positions: Optional[np.ndarray] = None,
+        mask: Optional[np.ndarray] = None
+    ) -> List[tuple]:
+        """
+        Nearest bank questions as (position, score) pairs, best first.
+        
+        Args:
+            query_embedding: Query vector
+            k: Number of neighbours
+            positions: Restrict the search to these bank positions (searched
+                inside FAISS with an ID selector, not by over-fetching)
+            mask: Boolean mask over bank positions (see MetadataFilter);
+                returns min(k, mask.sum()) results
+        """
+        selector = None
+        keepalive = None  # Packed bitmap referenced by the selector during search
+        limit = self.index.ntotal
+        if mask is not None:
+            limit = int(np.count_nonzero(mask))
+            if limit == 0:
+                return []
+            if limit < self.index.ntotal:
+                selector, keepalive = mask_selector(mask)
+        elif positions is not None:
+            positions = np.asarray(positions, dtype='int64')
+            if len(positions) == 0:
+                return []
+            selector = faiss.IDSelectorBatch(positions)
+            limit = len(positions)
+        
+        k = min(k, limit)
+        if k <= 0:
+            return []
+        
+        scores, ids = search_index(self.index, query_embedding, k, selector)
+        if len(ids) < k and not is_exact(self.index):
+            # Filter too selective for the approximate beam: search every partition
+            scores, ids = search_index(self.index, query_embedding, k, selector, exhaustive=True)
+        
+        return [(int(idx), float(score)) for score, idx in zip(scores, ids)]
+    
+    def pool_positions(self, *pool_names: str) -> np.ndarray:
+        """Bank positions of one or more named pools (e.g. 'dsa_questions')"""
+        ranges = [np.arange(*self.pool_ranges[name], dtype='int64') for name in pool_names]
+        return np.concatenate(ranges) if ranges else np.zeros(0, dtype='int64')
+    
+    def pool_mask(self, *pool_names: str) -> np.ndarray:
+        """Boolean mask over bank positions covering one or more named pools"""
+        mask = self.filters.none()
+        for name in pool_names:
+            mask |= self.filters.range_mask(*self.pool_ranges[name])
+        return mask
+    
+    def _search_positions(self, query_text: str, positions: np.ndarray, k: int) -> List[tuple]:
+        """Top-k of the given bank positions; bank order when there is no query text"""
+        if not query_text.strip():
+            return [(int(pos), 0.0) for pos in positions[:k]]
+        return self.search(self.encode_query(query_text), k, positions)
+    
+    def _search_diverse_skills(self, query_text: str, positions: np.ndarray, k: int) -> List[tuple]:
+        """
+        Top-k of the given bank positions with at most one question per skill.
+        
+        Each round drops the picks and the skills already picked from the
+        candidates and searches again, so it ends after at most one round per
+        distinct skill.
+        """
+        picked = []
+        seen_skills = set()
+        while len(picked) < k and len(positions):
+            matches = self._search_positions(query_text, positions, k - len(picked))
+            new_skills = set()
+            for pos, score in matches:
+                q_skill = self.filters.skill_of(pos)
+                if q_skill and q_skill in seen_skills:
+                    continue
+                picked.append((pos, score))
+                if q_skill:
+                    seen_skills.add(q_skill)
+                    new_skills.add(q_skill)
+            if not new_skills:
+                break  # Every match was taken; nothing left to diversify
+            taken = np.isin(positions, [pos for pos, _ in picked])
+            positions = positions[~(taken | self.filters.any_of_at('skill', new_skills, positions))]
+        return picked
+    
+    def rank_questions(self, query_text: str, questions: List[Dict]) -> List[Dict]:
+        """Order questions by similarity to the query (unchanged order for an empty query)"""
+        if not questions or not query_text.strip():
+            return list(questions)
+        
+        positions = [self._bank_position[id(q)] for q in questions]
+        ranked = self.search(self.encode_query(query_text), len(positions), positions)
+        return [self.all_questions[pos] for pos, _ in ranked]
+    
+    def search_pool(
+        self,
+        resume_text: str,
+        job_description: str,
+        pool_name: str,
+        top_k: int = 10
+    ) -> List[Dict]:
+        """Semantic search within a single named pool (behavioral, technical or profession bank)"""
+        query_embedding = self.encode_query(self._build_query_text(resume_text, job_description))
+        return [
+            ScoredQuestion((self.all_questions[pos], score))
+            for pos, score in self.search(query_embedding, top_k, self.pool_positions(pool_name))
+        ]
+    
     def retrieve(
         self,
         resume_text: str,
@@ -187,47 +280,24 @@ class QuestionRetriever:
             top_k: Number of questions to retrieve
         
         Returns:
-            List of question dicts with scores
+            List of (record, score) views (read like question dicts with a 'score' key)
         """
         
         # Create query embedding from resume + JD
-        query_text = f"{job_description} {resume_text[:500]}"
-        query_embedding = self.encode_query(query_text).reshape(1, -1)
-        
-        # Semantic search
-        distances, indices = self.index.search(query_embedding, min(top_k * 3, len(self.questions)))
+        query_text = self._build_query_text(resume_text, job_description)
+        query_embedding = self.encode_query(query_text)
         
-        # Filter and rank
-        results = []
-        for dist, idx in zip(distances[0], indices[0]):
-            question = self.questions[idx].copy()
-            question['score'] = float(1 / (1 + dist))  # Convert distance to similarity score
-            
-            # Apply metadata filters
-            if role and question.get('role') != role and question.get('role') != 'any':
-                continue
-            if level and question.get('level') != level and question.get('level') != 'any':
-                continue
-            if skill and question.get('skill') != skill:
-                continue
-            
-            results.append(question)
-            
-            if len(results) >= top_k:
-                break
+        # Metadata filters run inside the search, so a selective filter still
+        # returns exactly top_k matches
+        mask = self.filters.match(role=role, level=level, skill=skill)
+        matches = self.search(query_embedding, top_k, mask=mask)
         
-        # Ensure we have enough questions (fallback to unfiltered if needed)
-        if len(results) < top_k:
-            print(f"⚠️  Only found {len(results)} matching questions, adding more...")
-            for dist, idx in zip(distances[0], indices[0]):
-                if len(results) >= top_k:
-                    break
-                question = self.questions[idx].copy()
-                question['score'] = float(1 / (1 + dist))
-                if question not in results:
-                    results.append(question)
+        if len(matches) < top_k:
+            # Not enough questions match the filters: fill from the rest of the bank
+            print(f"⚠️  Only found {len(matches)} matching questions, adding more...")
+            matches += self.search(query_embedding, top_k - len(matches), mask=~mask)
         
-        return results[:top_k]
+        return [ScoredQuestion((self.all_questions[pos], score)) for pos, score in matches[:top_k]]
     
     def retrieve_phased(
         self,
@@ -254,12 +324,16 @@ class QuestionRetriever:
             force_phase: Override automatic phase detection
             
         Returns:
-            List of questions prioritized by phase and filtered by session state
+            List of (record, score) views prioritized by phase and filtered by
+            session state (warmup picks are by rule and score RULE_PICK_SCORE)
         """
         
         # Determine current phase
         current_phase = force_phase or session.current_phase
         
+        # Session keeps its asked questions as a bitmap over this bank
+        session.bind_bank(self.question_index)
+        
         results = []
         
         # Phase 1: Warmup questions (ALWAYS FIRST)
@@ -267,11 +341,8 @@ class QuestionRetriever:
             warmup_needed = max(0, 5 - len([q for q in session.asked_questions if q.startswith("warmup")]))
             
             if warmup_needed > 0:
-                # Get unused warmup questions
-                available_warmup = [
-                    q for q in self.warmup_questions 
-                    if q["id"] not in session.asked_questions
-                ]
+                # Get unused warmup questions (bank positions)
+                available_warmup = session.unasked(self.warmup_positions)
                 
                 # Prioritize based on resume context
                 warmup_selected = self._prioritize_warmup_questions(
@@ -310,39 +381,40 @@ class QuestionRetriever:
     
     def _prioritize_warmup_questions(
         self, 
-        questions: List[Dict], 
+        positions: np.ndarray, 
         session: 'InterviewSession',
         count: int
     ) -> List[Dict]:
-        """Prioritize warmup questions based on context"""
+        """Prioritize available warmup questions (bank positions) based on context"""
+        available = set(positions.tolist())
+        selected = []
         
-        # Always start with "introduce yourself"
-        intro_q = next((q for q in questions if "introduce" in q["question"].lower()), None)
+        def take(tag: str):
+            pos = next((p for p in self.warmup_tags[tag] if p in available), None)
+            if pos is not None:
+                selected.append(pos)
+                available.discard(pos)
         
-        selected = []
-        if intro_q and len(session.answered_questions) == 0:
-            selected.append(intro_q)
-            questions = [q for q in questions if q != intro_q]
+        # Always start with "introduce yourself"
+        if len(session.answered_questions) == 0:
+            take('introduction')
         
         # Then educational background if they have education in resume
         if session.resume_data.get("education"):
-            edu_q = next((q for q in questions if "educational background" in q["question"].lower()), None)
-            if edu_q:
-                selected.append(edu_q)
-                questions = [q for q in questions if q != edu_q]
+            take('education')
         
         # Company/role specific questions
         if session.resume_data.get("target_role"):
-            role_q = next((q for q in questions if "this role" in q["question"].lower()), None)
-            if role_q:
-                selected.append(role_q)
-                questions = [q for q in questions if q != role_q]
+            take('target_role')
         
         # Fill remaining with other warmup questions
-        remaining = count - len(selected)
-        selected.extend(questions[:remaining])
+        for pos in positions.tolist():
+            if len(selected) >= count:
+                break
+            if pos in available:
+                selected.append(pos)
         
-        return selected[:count]
+        return [ScoredQuestion((self.all_questions[pos], RULE_PICK_SCORE)) for pos in selected[:count]]
     
     def _retrieve_technical_filtered(
         self,
@@ -355,113 +427,47 @@ class QuestionRetriever:
     ) -> List[Dict]:
         """Retrieve technical questions filtered by session state"""
         
-        # Get phase-appropriate question pools
-        phase_questions = []
+        query_text = self._build_query_text(resume_text, job_description)
         
-        if phase == "behavioral":
-            # Behavioral phase: HR, behavioral STAR, situational, personality
-            phase_questions = (
-                self.hr_basic_questions + 
-                self.behavioral_questions + 
-                self.situational_questions +
-                self.personality_questions +
-                self.career_questions
-            )
-        elif phase == "technical":
-            # Technical phase: programming, DSA, database, web, plus indexed questions
-            phase_questions = (
-                self.programming_questions +
-                self.dsa_questions +
-                self.database_questions +
-                self.web_frontend_questions
-            )
-        elif phase == "advanced":
-            # Advanced phase: problem-solving, system design, plus high-difficulty indexed questions
-            phase_questions = self.problem_solving_questions.copy()
+        # Candidates are the unasked questions of each phase's precomputed positions:
+        # every filter below costs the size of the phase, not of the bank
+        session.bind_bank(self.question_index)
         
         # For behavioral phase, prioritize curated questions over indexed ones
         if phase == "behavioral":
-            results = []
-            
-            # Filter out already asked questions
-            available = [q for q in phase_questions if q["id"] not in session.asked_questions]
-            
-            # Add available questions up to top_k (no skill filtering for behavioral)
-            results = available[:top_k]
+            # Behavioral phase: HR, behavioral STAR, situational, personality
+            candidates = session.unasked(self.phase_positions['behavioral'])
             
-            return results
+            # Most relevant to resume/JD first (no skill filtering for behavioral)
+            matches = self._search_positions(query_text, candidates, top_k)
+            return [ScoredQuestion((self.all_questions[pos], score)) for pos, score in matches]
         
         # For technical/advanced, blend curated questions with indexed search
-        results = []
-        seen_skills = set()
-        
-        # First, add relevant curated questions (50% of results)
+        # First, add relevant curated questions (50% of results), one per uncovered skill
         curated_count = max(1, top_k // 2)
-        available_curated = [q for q in phase_questions if q["id"] not in session.asked_questions]
-        
-        for question in available_curated[:curated_count]:
-            q_skill = question.get('skill', '').lower()
-            if q_skill and session.is_skill_covered(q_skill):
-                continue
-            if q_skill and q_skill in seen_skills:
-                continue
-            
-            results.append(question)
-            if q_skill:
-                seen_skills.add(q_skill)
+        candidates = session.unasked(self.phase_positions.get(phase, self._no_positions))
+        candidates = candidates[~self.filters.any_of_at('skill', session.covered_skills, candidates)]
+        picked = self._search_diverse_skills(query_text, candidates, curated_count)
+        results = [ScoredQuestion((self.all_questions[pos], score)) for pos, score in picked]
         
         # Then, fill with indexed questions (remaining 50%)
         if len(results) < top_k:
-            # Create query embedding
-            query_text = f"{job_description} {resume_text[:500]}"
-            query_embedding = self.encode_query(query_text).reshape(1, -1)
+            # Phase-appropriate difficulty
+            candidates = session.unasked(self.indexed_phase_positions.get(phase, self.indexed_positions))
             
-            # Search with buffer for filtering
-            distances, indices = self.index.search(
-                query_embedding, 
-                min((top_k - len(results)) * 5, len(self.questions))
-            )
+            remaining = top_k - len(results)
+            if skills:
+                # Untagged questions, or uncovered target skills not already in this batch
+                seen_skills = {self.filters.skill_of(pos) for pos, _ in picked} - {''}
+                skill_at = lambda values: self.filters.any_of_at('skill', values, candidates)
+                keep = ~skill_at(self.filters.bitmaps['skill']) | (
+                    skill_at(skills) & ~skill_at(session.covered_skills) & ~skill_at(seen_skills)
+                )
+                matches = self._search_diverse_skills(query_text, candidates[keep], remaining)
+            else:
+                matches = self._search_positions(query_text, candidates, remaining)
             
-            for dist, idx in zip(distances[0], indices[0]):
-                if len(results) >= top_k:
-                    break
-                    
-                question = self.questions[idx].copy()
-                question['score'] = float(1 / (1 + dist))
-                
-                # Skip if already asked
-                if question["id"] in session.asked_questions:
-                    continue
-                
-                # Get question skill
-                q_skill = question.get('skill', '').lower()
-                
-                # Prioritize uncovered skills
-                if skills and q_skill:
-                    # Skip if this skill was already covered
-                    if session.is_skill_covered(q_skill):
-                        continue
-                        
-                    # Skip if we already asked a question for this skill in this batch
-                    if q_skill in seen_skills:
-                        continue
-                        
-                    # Only include if skill is in target skills
-                    if q_skill not in [s.lower() for s in skills]:
-                        continue
-                
-                # Phase-appropriate difficulty
-                difficulty = question.get('difficulty', 1)
-                if phase == "technical":
-                    if difficulty < 2 or difficulty > 4:
-                        continue
-                elif phase == "advanced":
-                    if difficulty < 4:
-                        continue
-                
-                results.append(question)
-                if q_skill:
-                    seen_skills.add(q_skill)
+            results.extend(ScoredQuestion((self.all_questions[pos], score)) for pos, score in matches)
         
         return results
 
@@ -530,18 +536,8 @@ class QuestionRetriever:
         return follow_up_text
     
     def get_by_id(self, question_id: str) -> Optional[Dict]:
-        """Get question by ID from any source"""
-        # Check technical questions
-        for q in self.questions:
-            if q.get('id') == question_id:
-                return q
-        
-        # Check warmup questions
-        for q in self.warmup_questions:
-            if q.get('id') == question_id:
-                return q
-        
-        return None
+        """Get question by ID from any pool (O(1); first in bank order for reused ids)"""
+        return self.question_index.get(question_id)
 
 
 def extract_metadata(resume_text: str, job_description: str) -> Dict:
@@ -0,0 +1,179 @@
+"""
+Vector Index Module
+
+Handles:
+- Configurable FAISS index types for the question bank
+- Cosine similarity via L2-normalized inner product
+- Training (IVF) and search-time parameters (HNSW efSearch, IVF nprobe)
+- Converting FAISS distances into similarity scores
+
+Index types (VECTOR_INDEX_TYPE):
+- flat_l2:  exact L2 search (default; score = 1 / (1 + distance))
+- flat_ip:  exact cosine search (normalized inner product; score = cosine)
+- hnsw:     approximate cosine search on an HNSW graph (no training)
+- ivf_flat: approximate cosine search over k-means partitions (trained at build)
+
+Flat indexes are right for today's bank; HNSW/IVF keep query latency flat
+as the bank grows (see benchmarks/bench_vector_index.py).
+
+Usage:
+    from rag.vector_index import build_vector_index, search_index
+
+    index = build_vector_index(embeddings, 'hnsw', ids=np.arange(len(embeddings)))
+    scores, ids = search_index(index, query_embedding, k=10)
+"""
+
+import math
+import os
+from typing import Dict, Optional
+
+import faiss
+import numpy as np
+
+INDEX_TYPES = ('flat_l2', 'flat_ip', 'hnsw', 'ivf_flat')
+
+VECTOR_INDEX_TYPE = os.getenv("VECTOR_INDEX_TYPE", "flat_l2").lower()
+
+# HNSW graph degree and beam widths
+HNSW_M = int(os.getenv("VECTOR_HNSW_M", "32"))
+HNSW_EF_CONSTRUCTION = int(os.getenv("VECTOR_HNSW_EF_CONSTRUCTION", "80"))
+HNSW_EF_SEARCH = int(os.getenv("VECTOR_HNSW_EF_SEARCH", "128"))
+
+# IVF partitions (0 = about 4 * sqrt(n)) and partitions probed per query
+IVF_NLIST = int(os.getenv("VECTOR_IVF_NLIST", "0"))
+IVF_NPROBE = int(os.getenv("VECTOR_IVF_NPROBE", "16"))
+
+# FAISS k-means wants ~39 training points per centroid
+IVF_MIN_POINTS_PER_CENTROID = 39
+
+
+def uses_inner_product(index_type: str) -> bool:
+    """Every type except flat_l2 searches normalized vectors by inner product (cosine)"""
+    return index_type != 'flat_l2'
+
+
+def ivf_nlist(n: int) -> int:
+    """Number of IVF partitions for n vectors"""
+    nlist = IVF_NLIST or int(4 * math.sqrt(n))
+    return max(1, min(nlist, n // IVF_MIN_POINTS_PER_CENTROID))
+
+
+def create_index(index_type: str, dimension: int, n: int):
+    """Empty (untrained) FAISS index of the given type for n vectors"""
+    if index_type == 'flat_l2':
+        return faiss.IndexFlatL2(dimension)
+    if index_type == 'flat_ip':
+        return faiss.IndexFlatIP(dimension)
+    if index_type == 'hnsw':
+        index = faiss.IndexHNSWFlat(dimension, HNSW_M, faiss.METRIC_INNER_PRODUCT)
+        index.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+        index.hnsw.efSearch = HNSW_EF_SEARCH
+        return index
+    if index_type == 'ivf_flat':
+        quantizer = faiss.IndexFlatIP(dimension)
+        index = faiss.IndexIVFFlat(quantizer, dimension, ivf_nlist(n), faiss.METRIC_INNER_PRODUCT)
+        index.nprobe = IVF_NPROBE
+        return index
+    raise ValueError(f"Unknown vector index type '{index_type}' (expected one of {', '.join(INDEX_TYPES)})")
+
+
+def prepare_vectors(embeddings: np.ndarray, index_type: str) -> np.ndarray:
+    """float32 copy of the vectors, L2-normalized for inner-product types"""
+    vectors = np.array(embeddings, dtype='float32', copy=True).reshape(-1, embeddings.shape[-1])
+    if uses_inner_product(index_type):
+        faiss.normalize_L2(vectors)
+    return vectors
+
+
+def build_vector_index(embeddings: np.ndarray, index_type: str = VECTOR_INDEX_TYPE, ids: Optional[np.ndarray] = None):
+    """
+    Build (and train, for IVF) an index of the given type.
+
+    With ids the index is wrapped in IndexIDMap2, so search returns those ids.
+    """
+    vectors = prepare_vectors(embeddings, index_type)
+    index = create_index(index_type, vectors.shape[1], len(vectors))
+
+    if not index.is_trained:
+        index.train(vectors)
+
+    if ids is not None:
+        index = faiss.IndexIDMap2(index)
+        index.add_with_ids(vectors, np.asarray(ids, dtype='int64'))
+    else:
+        index.add(vectors)
+    return index
+
+
+def base_index(index):
+    """The index under an IDMap wrapper, downcast to its concrete type"""
+    if isinstance(index, (faiss.IndexIDMap, faiss.IndexIDMap2)):
+        index = index.index
+    return faiss.downcast_index(index)
+
+
+def index_type_of(index) -> str:
+    """Index type name of a built or loaded index"""
+    inner = base_index(index)
+    if isinstance(inner, faiss.IndexHNSW):
+        return 'hnsw'
+    if isinstance(inner, faiss.IndexIVF):
+        return 'ivf_flat'
+    if inner.metric_type == faiss.METRIC_INNER_PRODUCT:
+        return 'flat_ip'
+    return 'flat_l2'
+
+
+def index_settings(index) -> Dict:
+    """Type and tuning parameters, recorded in index manifests"""
+    inner = base_index(index)
+    settings = {"index_type": index_type_of(index), "dimension": index.d}
+    if isinstance(inner, faiss.IndexHNSW):
+        settings.update(hnsw_m=HNSW_M, ef_construction=inner.hnsw.efConstruction, ef_search=inner.hnsw.efSearch)
+    elif isinstance(inner, faiss.IndexIVF):
+        settings.update(nlist=inner.nlist, nprobe=inner.nprobe)
+    return settings
+
+
+def search_parameters(index, selector=None, exhaustive: bool = False):
+    """
+    Search parameters for the index, optionally restricted by an ID selector.
+
+    exhaustive widens approximate searches (every IVF partition, efSearch
+    sized to the bank) for filters too selective for the default beam.
+    """
+    inner = base_index(index)
+    if isinstance(inner, faiss.IndexHNSW):
+        ef_search = max(inner.hnsw.efSearch, index.ntotal if exhaustive else 0)
+        return faiss.SearchParametersHNSW(sel=selector, efSearch=ef_search)
+    if isinstance(inner, faiss.IndexIVF):
+        nprobe = inner.nlist if exhaustive else inner.nprobe
+        return faiss.SearchParametersIVF(sel=selector, nprobe=nprobe)
+    if selector is not None:
+        return faiss.SearchParameters(sel=selector)
+    return None
+
+
+def is_exact(index) -> bool:
+    return index_type_of(index) in ('flat_l2', 'flat_ip')
+
+
+def search_index(index, query_embedding: np.ndarray, k: int, selector=None, exhaustive: bool = False):
+    """
+    Search one query and return (scores, ids) for valid hits, best first.
+
+    Scores are cosine similarity for inner-product indexes and
+    1 / (1 + L2 distance) for flat_l2.
+    """
+    inner_product = index.metric_type == faiss.METRIC_INNER_PRODUCT
+    query = np.array(query_embedding, dtype='float32', copy=True).reshape(1, -1)
+    if inner_product:
+        faiss.normalize_L2(query)
+
+    params = search_parameters(index, selector, exhaustive)
+    distances, ids = index.search(query, k, params=params)
+
+    valid = ids[0] >= 0
+    distances, ids = distances[0][valid], ids[0][valid]
+    scores = distances if inner_product else 1 / (1 + distances)
+    return scores, ids
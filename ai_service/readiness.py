@@ -0,0 +1,94 @@
+"""
+Startup Readiness
+
+Handles:
+- Timed imports of heavy dependencies (import-time report)
+- Readiness state for components loaded in the background (RAG retriever)
+
+The process answers /health immediately; /ready only flips once every
+background component has loaded.
+
+Usage:
+    from readiness import readiness, timed_import
+
+    faiss = timed_import("faiss")
+    readiness.mark_loading("retriever")
+    readiness.mark_ready("retriever")
+    print(readiness.report())
+"""
+
+import importlib
+import time
+from typing import Dict, Optional
+
+PROCESS_STARTED = time.perf_counter()
+
+# Module name -> seconds spent importing it (first import only)
+IMPORT_TIMINGS: Dict[str, float] = {}
+
+
+def timed_import(module_name: str):
+    """Import a module and record how long the first import took"""
+    started = time.perf_counter()
+    module = importlib.import_module(module_name)
+    IMPORT_TIMINGS.setdefault(module_name, time.perf_counter() - started)
+    return module
+
+
+class ReadinessState:
+    """Tracks background components: loading -> ready | failed"""
+
+    def __init__(self):
+        self.components: Dict[str, Dict] = {}
+
+    def mark_loading(self, name: str):
+        self.components[name] = {
+            "status": "loading",
+            "started": time.perf_counter(),
+            "seconds": None,
+            "error": None
+        }
+
+    def mark_ready(self, name: str):
+        component = self.components.setdefault(name, {"started": time.perf_counter()})
+        component["status"] = "ready"
+        component["seconds"] = time.perf_counter() - component["started"]
+        component["error"] = None
+
+    def mark_failed(self, name: str, error: Exception):
+        component = self.components.setdefault(name, {"started": time.perf_counter()})
+        component["status"] = "failed"
+        component["seconds"] = time.perf_counter() - component["started"]
+        component["error"] = str(error)
+
+    def status(self, name: str) -> Optional[str]:
+        component = self.components.get(name)
+        return component["status"] if component else None
+
+    def is_ready(self, name: Optional[str] = None) -> bool:
+        """Ready when the named component (or every component) has loaded"""
+        if name is not None:
+            return self.status(name) == "ready"
+        return all(c["status"] == "ready" for c in self.components.values())
+
+    def report(self) -> Dict:
+        """Component status and import-time report (milliseconds)"""
+        return {
+            "ready": self.is_ready(),
+            "uptime_ms": round((time.perf_counter() - PROCESS_STARTED) * 1000, 1),
+            "components": {
+                name: {
+                    "status": c["status"],
+                    "load_ms": round(c["seconds"] * 1000, 1) if c["seconds"] is not None else None,
+                    "error": c["error"]
+                }
+                for name, c in self.components.items()
+            },
+            "imports_ms": {
+                name: round(seconds * 1000, 1)
+                for name, seconds in sorted(IMPORT_TIMINGS.items(), key=lambda kv: -kv[1])
+            }
+        }
+
+
+readiness = ReadinessState()
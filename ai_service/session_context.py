@@ -7,14 +7,218 @@ Handles interview session state:
 - Covered skills
 - Mentioned topics (for follow-ups)
 - Interview phase tracking
+- Asked questions as a packed bitmap over the question bank (for retrieval)
+- Compact layout: __slots__, question ids as process-wide integer ordinals,
+  numeric timestamps, answer bodies in the on-disk AnswerLog (read on demand)
+- Change events for a SessionJournal (when one is attached), so sessions
+  survive restarts
+- Running statistics (score sum/count/histogram, per-phase and per-skill
+  counts) and a versioned delta of what changed since a client last looked
 """
 
+import itertools
 import json
+import math
+import threading
+import time
+from array import array
+from collections import Counter
+from collections.abc import Mapping, Set as AbstractSet
 from typing import List, Dict, Optional, Set
 from datetime import datetime
 
+import numpy as np
+
+from answer_log import AnswerLog, get_answer_log
+
+# Question id <-> ordinal, shared by every session in the process
+_ordinals: Dict[str, int] = {}
+_ordinal_ids: List[str] = []
+_ordinal_lock = threading.Lock()
+
+# QuestionIdSet.version stamps: unique across sets, so a reassigned set never looks in sync
+_set_versions = itertools.count(1)
+
+
+def question_ordinal(question_id: str) -> int:
+    """Process-wide integer for a question id (assigned on first use)"""
+    ordinal = _ordinals.get(question_id)
+    if ordinal is None:
+        with _ordinal_lock:
+            ordinal = _ordinals.get(question_id)
+            if ordinal is None:
+                ordinal = len(_ordinal_ids)
+                _ordinal_ids.append(question_id)
+                _ordinals[question_id] = ordinal
+    return ordinal
+
+
+class QuestionIdSet(AbstractSet):
+    """
+    A set of question ids stored as ordinals: a bitmap for membership and an
+    array for insertion order (a few hundred bytes instead of a set of strings).
+    """
+
+    __slots__ = ('_order', '_bits', 'version')
+
+    def __init__(self, question_ids=()):
+        self._order = array('I')
+        self._bits = bytearray()
+        self.version = next(_set_versions)  # Unique per content state; bumped by every add
+        for question_id in question_ids:
+            self.add(question_id)
+
+    def add(self, question_id: str):
+        ordinal = question_ordinal(question_id)
+        byte, bit = ordinal >> 3, 1 << (ordinal & 7)
+        if byte >= len(self._bits):
+            self._bits.extend(bytes(byte + 1 - len(self._bits)))
+        if not self._bits[byte] & bit:
+            self._bits[byte] |= bit
+            self._order.append(ordinal)
+            self.version = next(_set_versions)
+
+    def __contains__(self, question_id) -> bool:
+        ordinal = _ordinals.get(question_id)
+        if ordinal is None or ordinal >> 3 >= len(self._bits):
+            return False
+        return bool(self._bits[ordinal >> 3] & (1 << (ordinal & 7)))
+
+    def __iter__(self):
+        return (_ordinal_ids[ordinal] for ordinal in self._order)
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def copy(self) -> "QuestionIdSet":
+        clone = QuestionIdSet()
+        clone._order = array('I', self._order)
+        clone._bits = bytearray(self._bits)
+        clone.version = self.version  # Same contents
+        return clone
+
+    def __repr__(self) -> str:
+        return f"QuestionIdSet({list(self)!r})"
+
+
+class AnswerEntry(Mapping):
+    """{answer, score, timestamp} for one answered question; the answer is read from disk on access"""
+
+    __slots__ = ('_answers', '_row')
+
+    _KEYS = ("answer", "score", "timestamp")
+
+    def __init__(self, answers: "SessionAnswers", row: int):
+        self._answers = answers
+        self._row = row
+
+    def __getitem__(self, key):
+        if key == "answer":
+            return self._answers.answer_at(self._row)
+        if key == "score":
+            return self._answers.score_at(self._row)
+        if key == "timestamp":
+            return datetime.fromtimestamp(self._answers.times[self._row]).isoformat()
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self._KEYS)
+
+    def __len__(self) -> int:
+        return len(self._KEYS)
+
+
+class SessionAnswers(Mapping):
+    """
+    answered_questions as parallel arrays (ordinal, score, time, log offset):
+    ~28 bytes per answer in memory, answer text in the AnswerLog.
+    """
+
+    __slots__ = ('log', 'ordinals', 'scores', 'times', 'offsets')
+
+    def __init__(self, log: Optional[AnswerLog] = None):
+        self.log = log
+        self.ordinals = array('I')
+        self.scores = array('d')   # NaN = no score
+        self.times = array('d')    # Unix seconds
+        self.offsets = array('q')  # Byte offset in the log
+
+    def record(self, question_id: str, answer: str, score=None, timestamp: float = None) -> Optional[float]:
+        """Store (or replace) the answer to a question; returns the replaced score (if any)"""
+        if self.log is None:
+            self.log = get_answer_log()
+        ordinal = question_ordinal(question_id)
+        offset = self.log.append(answer or "")
+        values = (
+            float('nan') if score is None else float(score),
+            time.time() if timestamp is None else timestamp,
+            offset
+        )
+        row = self._row(ordinal)
+        if row is None:
+            self.ordinals.append(ordinal)
+            self.scores.append(values[0])
+            self.times.append(values[1])
+            self.offsets.append(values[2])
+            return None
+        replaced = self.score_at(row)
+        self.scores[row], self.times[row], self.offsets[row] = values
+        return replaced
+
+    def copy(self) -> "SessionAnswers":
+        """Independent arrays over the same log (answer text is append-only, so offsets stay valid)"""
+        clone = SessionAnswers(self.log)
+        clone.ordinals = array('I', self.ordinals)
+        clone.scores = array('d', self.scores)
+        clone.times = array('d', self.times)
+        clone.offsets = array('q', self.offsets)
+        return clone
+
+    def _row(self, ordinal: int) -> Optional[int]:
+        try:
+            return self.ordinals.index(ordinal)  # Tens of answers per session: a scan is cheapest
+        except ValueError:
+            return None
+
+    def score_at(self, row: int):
+        score = self.scores[row]
+        if math.isnan(score):
+            return None
+        return int(score) if score.is_integer() else score
+
+    def answer_at(self, row: int) -> str:
+        return self.log.read(self.offsets[row])
+
+    def __getitem__(self, question_id: str) -> AnswerEntry:
+        ordinal = _ordinals.get(question_id)
+        row = None if ordinal is None else self._row(ordinal)
+        if row is None:
+            raise KeyError(question_id)
+        return AnswerEntry(self, row)
+
+    def __iter__(self):
+        return (_ordinal_ids[ordinal] for ordinal in self.ordinals)
+
+    def __len__(self) -> int:
+        return len(self.ordinals)
+
+
 class InterviewSession:
-    def __init__(self, session_id: str = None):
+    __slots__ = (
+        'session_id', 'resume_data', '_phase', 'questions_in_current_phase', 'asked_questions', '_answers',
+        'skipped_questions', 'covered_skills', 'target_skills', 'mentioned_topics',
+        'interview_mode', '_bank', '_asked_bits', '_bits_synced', 'journal',
+        'score_sum', 'score_count', 'score_histogram', 'asked_per_phase', 'answered_per_phase', 'skill_counts',
+        '_version', '_changed', '_stats', '_stats_version'
+    )
+    
+    # Statistics holding lists/dicts: rebuilt only after the session changes them
+    _CACHED_STATISTICS = (
+        "covered_skills", "uncovered_skills", "score_histogram",
+        "asked_per_phase", "answered_per_phase", "skill_counts"
+    )
+    
+    def __init__(self, session_id: str = None, answer_log: Optional[AnswerLog] = None):
         self.session_id = session_id or datetime.now().strftime("%Y%m%d_%H%M%S")
         
         # User context (from resume/JD)
@@ -27,10 +231,11 @@ class InterviewSession:
         }
         
         # Interview state
-        self.current_phase = "warmup"  # warmup -> behavioral -> technical -> advanced
-        self.asked_questions: Set[str] = set()  # Question IDs
-        self.answered_questions: Dict[str, dict] = {}  # {question_id: {answer, score, timestamp}}
-        self.skipped_questions: Set[str] = set()
+        self._phase = "warmup"  # current_phase: warmup -> behavioral -> technical -> advanced
+        self.questions_in_current_phase = 0  # Asked since the phase last advanced
+        self.asked_questions = QuestionIdSet()  # Question IDs
+        self._answers = SessionAnswers(answer_log)  # answered_questions: {question_id: {answer, score, timestamp}}
+        self.skipped_questions = QuestionIdSet()
         
         # Skill tracking
         self.covered_skills: Set[str] = set()
@@ -43,14 +248,68 @@ class InterviewSession:
         # Interview mode
         self.interview_mode = "general"  # general, hr, technical, behavioral, managerial
         
+        # Asked questions as one bit per bank position (set by bind_bank):
+        # bank size / 8 bytes per session, updated in O(1) per question
+        self._bank = None  # Shared rag.question_bank.QuestionIndex
+        self._asked_bits: Optional[np.ndarray] = None
+        self._bits_synced = 0  # asked_questions.version reflected in _asked_bits
+        
+        # SessionJournal receiving this session's change events (None = not persisted)
+        self.journal = None
+        
+        # Running aggregates, updated as questions are asked and answered
+        self.score_sum = 0.0
+        self.score_count = 0  # Answers with a score
+        self.score_histogram = [0] * 11  # Answers per score 0..10
+        self.asked_per_phase: Dict[str, int] = Counter()
+        self.answered_per_phase: Dict[str, int] = Counter()
+        self.skill_counts: Dict[str, int] = Counter()  # Evaluated answers per skill
+        
+        # Statistics version: bumped on every change; _changed[key] = version it last changed at
+        self._version = 0
+        self._changed: Dict[str, int] = {}
+        self._stats: Dict = {}  # Cached list/dict statistics as of _stats_version
+        self._stats_version = -1
+        
+    def _journal(self, op: str, *args):
+        if self.journal is not None:
+            self.journal.append(self.session_id, op, *args)
+    
+    def _touch(self, *keys: str):
+        """Record that these statistics changed"""
+        self._version += 1
+        for key in keys:
+            self._changed[key] = self._version
+    
+    @property
+    def current_phase(self) -> str:
+        return self._phase
+    
+    @current_phase.setter
+    def current_phase(self, phase: str):
+        if phase != self._phase:
+            self._phase = phase
+            self._touch("current_phase")
+    
+    @property
+    def answered_questions(self) -> SessionAnswers:
+        """{question_id: {answer, score, timestamp}} (answers are read from the log on access)"""
+        return self._answers
+    
     def set_user_context(self, resume: str = "", job_description: str = "", 
                         skills: List[str] = None, education: str = "", 
                         projects: List[str] = None, experience_level: str = "",
                         target_role: str = ""):
         """Store user context from resume/JD"""
+        self._journal("context", {
+            "resume": resume, "job_description": job_description, "skills": skills,
+            "education": education, "projects": projects,
+            "experience_level": experience_level, "target_role": target_role
+        })
         if skills:
             self.resume_data["skills"] = skills
             self.target_skills = skills
+            self._touch("uncovered_skills")
         if education:
             self.resume_data["education"] = education
         if projects:
@@ -60,23 +319,85 @@ class InterviewSession:
         if target_role:
             self.resume_data["target_role"] = target_role
             
+    def bind_bank(self, question_index) -> None:
+        """Track asked questions as a bitmap over this bank (a shared QuestionIndex)"""
+        if self._bank is question_index:
+            return
+        self._bank = question_index
+        self._asked_bits = np.zeros((len(question_index.bank) + 7) // 8, dtype=np.uint8)
+        self._bits_synced = 0
+        self._sync_asked_bits()
+    
+    def _set_asked_bit(self, question_id: str):
+        for pos in self._bank.positions.get(question_id, ()):
+            self._asked_bits[pos >> 3] |= 1 << (pos & 7)
+    
+    def _sync_asked_bits(self):
+        """Catch the bitmap up with ids added to asked_questions directly"""
+        if self._bits_synced != self.asked_questions.version:
+            self._asked_bits[:] = 0
+            for question_id in self.asked_questions:
+                self._set_asked_bit(question_id)
+            self._bits_synced = self.asked_questions.version
+    
+    def _record_asked(self, question_id: str):
+        if question_id in self.asked_questions:
+            return
+        in_sync = self._bank is not None and self._bits_synced == self.asked_questions.version
+        self.asked_questions.add(question_id)
+        self.questions_in_current_phase += 1
+        self.asked_per_phase[self._phase] += 1
+        self._touch("total_asked", "asked_per_phase")
+        if in_sync:
+            self._set_asked_bit(question_id)
+            self._bits_synced = self.asked_questions.version
+    
+    def asked_mask(self) -> np.ndarray:
+        """Boolean mask over bank positions of asked questions (requires bind_bank)"""
+        self._sync_asked_bits()
+        bits = np.unpackbits(self._asked_bits, count=len(self._bank.bank), bitorder='little')
+        return bits.view(bool)
+    
+    def unasked(self, positions: np.ndarray) -> np.ndarray:
+        """The given bank positions minus asked ones; cost follows len(positions)"""
+        self._sync_asked_bits()
+        positions = np.asarray(positions)
+        asked = (self._asked_bits[positions >> 3] >> (positions & 7).astype(np.uint8)) & 1
+        return positions[asked == 0]
+    
     def mark_question_asked(self, question_id: str):
         """Mark a question as asked"""
-        self.asked_questions.add(question_id)
+        if question_id not in self.asked_questions:
+            self._journal("asked", question_id)
+        self._record_asked(question_id)
         
-    def mark_question_answered(self, question_id: str, answer: str, score: int = None):
+    def mark_question_answered(self, question_id: str, answer: str, score: int = None,
+                               timestamp: float = None):
         """Mark a question as answered with details"""
-        self.answered_questions[question_id] = {
-            "answer": answer,
-            "score": score,
-            "timestamp": datetime.now().isoformat()
-        }
-        self.asked_questions.add(question_id)
+        timestamp = time.time() if timestamp is None else timestamp
+        self._journal("answered", question_id, answer, score, timestamp)
+        is_new = question_id not in self._answers
+        replaced = self._answers.record(question_id, answer, score, timestamp)
+        if replaced is not None:
+            self._count_score(replaced, -1)
+        if score is not None:
+            self._count_score(score, 1)
+        if is_new:
+            self.answered_per_phase[self._phase] += 1
+        self._touch("total_answered", "answered_per_phase", "average_score", "score_histogram")
+        self._record_asked(question_id)
+    
+    def _count_score(self, score: float, sign: int):
+        self.score_sum += sign * score
+        self.score_count += sign
+        self.score_histogram[int(min(max(score, 0), 10))] += sign
         
     def mark_question_skipped(self, question_id: str):
         """Mark a question as skipped"""
+        self._journal("skipped", question_id)
         self.skipped_questions.add(question_id)
-        self.asked_questions.add(question_id)
+        self._touch("total_skipped")
+        self._record_asked(question_id)
         
     def is_question_used(self, question_id: str) -> bool:
         """Check if question has been asked/answered/skipped"""
@@ -84,7 +405,14 @@ class InterviewSession:
     
     def mark_skill_covered(self, skill: str):
         """Mark a skill as evaluated"""
-        self.covered_skills.add(skill.lower())
+        skill = skill.lower()
+        self._journal("skill", skill)
+        self.skill_counts[skill] += 1
+        if skill in self.covered_skills:
+            self._touch("skill_counts")
+        else:
+            self.covered_skills.add(skill)
+            self._touch("skill_counts", "covered_skills", "uncovered_skills")
         
     def is_skill_covered(self, skill: str) -> bool:
         """Check if skill has been evaluated"""
@@ -99,7 +427,9 @@ class InterviewSession:
         if category not in self.mentioned_topics:
             self.mentioned_topics[category] = []
         if topic not in self.mentioned_topics[category]:
+            self._journal("topic", category, topic)
             self.mentioned_topics[category].append(topic)
+            self._touch("mentioned_topics")
             
     def get_mentioned_topics(self, category: str = None) -> Dict[str, List[str]]:
         """Get mentioned topics, optionally filtered by category"""
@@ -112,7 +442,14 @@ class InterviewSession:
         phase_order = ["warmup", "behavioral", "technical", "advanced"]
         current_idx = phase_order.index(self.current_phase)
         if current_idx < len(phase_order) - 1:
-            self.current_phase = phase_order[current_idx + 1]
+            self.set_phase(phase_order[current_idx + 1])
+    
+    def set_phase(self, phase: str):
+        """Enter a phase (restarts the per-phase question count)"""
+        if phase != self.current_phase:
+            self._journal("phase", phase)
+            self.current_phase = phase
+            self.questions_in_current_phase = 0
             
     def should_advance_phase(self) -> bool:
         """Determine if it's time to move to next phase"""
@@ -136,7 +473,9 @@ class InterviewSession:
         """Set interview mode (hr, technical, behavioral, etc.)"""
         valid_modes = ["general", "hr", "technical", "behavioral", "managerial"]
         if mode in valid_modes:
+            self._journal("mode", mode)
             self.interview_mode = mode
+            self._touch("interview_mode")
             # Adjust phase based on mode
             if mode == "hr":
                 self.current_phase = "warmup"
@@ -146,7 +485,14 @@ class InterviewSession:
                 self.current_phase = "behavioral"
                 
     def get_statistics(self) -> Dict:
-        """Get session statistics"""
+        """Get session statistics (lists are rebuilt only after they change; callers get copies)"""
+        if self._stats_version != self._version:
+            for key in self._CACHED_STATISTICS:
+                if key not in self._stats or self._changed.get(key, 0) > self._stats_version:
+                    self._stats[key] = self._build_statistic(key)
+            self._stats_version = self._version
+        
+        cached = {key: value.copy() for key, value in self._stats.items()}
         return {
             "session_id": self.session_id,
             "current_phase": self.current_phase,
@@ -154,19 +500,41 @@ class InterviewSession:
             "total_asked": len(self.asked_questions),
             "total_answered": len(self.answered_questions),
             "total_skipped": len(self.skipped_questions),
-            "covered_skills": list(self.covered_skills),
-            "uncovered_skills": self.get_uncovered_skills(),
-            "mentioned_topics": self.mentioned_topics,
-            "average_score": self._calculate_average_score()
+            "covered_skills": cached["covered_skills"],
+            "uncovered_skills": cached["uncovered_skills"],
+            "mentioned_topics": {category: list(topics) for category, topics in self.mentioned_topics.items()},
+            "average_score": self._calculate_average_score(),
+            "score_histogram": cached["score_histogram"],
+            "asked_per_phase": cached["asked_per_phase"],
+            "answered_per_phase": cached["answered_per_phase"],
+            "skill_counts": cached["skill_counts"],
+            "version": self._version
         }
+    
+    def get_statistics_delta(self, since: int) -> Dict:
+        """
+        Statistics changed after version `since` (from an earlier response).
+        A version this session never had (e.g. from before a restart) gets everything.
+        """
+        stats = self.get_statistics()
+        if since < 0 or since > self._version:
+            changed = {key: value for key, value in stats.items() if key != "version"}
+        else:
+            changed = {key: stats[key] for key, version in self._changed.items() if version > since}
+        return {"version": self._version, "since": since, "changed": changed}
+    
+    def _build_statistic(self, key: str):
+        if key == "covered_skills":
+            return list(self.covered_skills)
+        if key == "uncovered_skills":
+            return self.get_uncovered_skills()
+        if key == "score_histogram":
+            return list(self.score_histogram)
+        return dict(getattr(self, key))  # Per-phase / per-skill counters
         
     def _calculate_average_score(self) -> Optional[float]:
-        """Calculate average score from answered questions"""
-        scores = [
-            data["score"] for data in self.answered_questions.values() 
-            if data.get("score") is not None
-        ]
-        return sum(scores) / len(scores) if scores else None
+        """Average score of answered questions (running sum)"""
+        return self.score_sum / self.score_count if self.score_count else None
     
     def to_dict(self) -> Dict:
         """Serialize session to dict"""
@@ -174,30 +542,75 @@ class InterviewSession:
             "session_id": self.session_id,
             "resume_data": self.resume_data,
             "current_phase": self.current_phase,
+            "questions_in_current_phase": self.questions_in_current_phase,
             "asked_questions": list(self.asked_questions),
-            "answered_questions": self.answered_questions,
+            "answered_questions": {
+                question_id: dict(entry) for question_id, entry in self.answered_questions.items()
+            },
             "skipped_questions": list(self.skipped_questions),
             "covered_skills": list(self.covered_skills),
             "target_skills": self.target_skills,
             "mentioned_topics": self.mentioned_topics,
-            "interview_mode": self.interview_mode
+            "interview_mode": self.interview_mode,
+            "statistics": {
+                "version": self._version,
+                "asked_per_phase": dict(self.asked_per_phase),
+                "answered_per_phase": dict(self.answered_per_phase),
+                "skill_counts": dict(self.skill_counts)
+            }
         }
     
     @classmethod
-    def from_dict(cls, data: Dict) -> "InterviewSession":
+    def from_dict(cls, data: Dict, answer_log: Optional[AnswerLog] = None) -> "InterviewSession":
         """Deserialize session from dict"""
-        session = cls(session_id=data.get("session_id"))
+        session = cls(session_id=data.get("session_id"), answer_log=answer_log)
         session.resume_data = data.get("resume_data", {})
         session.current_phase = data.get("current_phase", "warmup")
-        session.asked_questions = set(data.get("asked_questions", []))
-        session.answered_questions = data.get("answered_questions", {})
-        session.skipped_questions = set(data.get("skipped_questions", []))
+        session.questions_in_current_phase = data.get("questions_in_current_phase", 0)
+        session.asked_questions = QuestionIdSet(data.get("asked_questions", []))
+        for question_id, entry in data.get("answered_questions", {}).items():
+            timestamp = entry.get("timestamp")
+            session._answers.record(
+                question_id, entry.get("answer", ""), entry.get("score"),
+                datetime.fromisoformat(timestamp).timestamp() if timestamp else None
+            )
+            if entry.get("score") is not None:
+                session._count_score(entry["score"], 1)
+        session.skipped_questions = QuestionIdSet(data.get("skipped_questions", []))
         session.covered_skills = set(data.get("covered_skills", []))
         session.target_skills = data.get("target_skills", [])
         session.mentioned_topics = data.get("mentioned_topics", {})
         session.interview_mode = data.get("interview_mode", "general")
+        
+        # Counters that can't be rebuilt from the lists above (absent in older files)
+        stats = data.get("statistics", {})
+        session.asked_per_phase = Counter(stats.get("asked_per_phase", {}))
+        session.answered_per_phase = Counter(stats.get("answered_per_phase", {}))
+        session.skill_counts = Counter(stats.get("skill_counts", {}))
+        session._version = stats.get("version", 0)
+        session._changed = {key: session._version for key in session.get_statistics() if key not in ("session_id", "version")}
+        session._stats_version = -1
         return session
     
+    def snapshot(self) -> "InterviewSession":
+        """
+        Copy for speculative retrieval on a worker thread: nothing it reads or
+        writes is shared with the live session (answer text stays in the log).
+        """
+        clone = InterviewSession(self.session_id)
+        clone.resume_data = {key: list(value) if isinstance(value, list) else value
+                             for key, value in self.resume_data.items()}
+        clone.current_phase = self.current_phase
+        clone.questions_in_current_phase = self.questions_in_current_phase
+        clone.asked_questions = self.asked_questions.copy()
+        clone._answers = self._answers.copy()
+        clone.skipped_questions = self.skipped_questions.copy()
+        clone.covered_skills = set(self.covered_skills)
+        clone.target_skills = list(self.target_skills)
+        clone.mentioned_topics = {category: list(topics) for category, topics in self.mentioned_topics.items()}
+        clone.interview_mode = self.interview_mode
+        return clone
+    
     def save(self, filepath: str):
         """Save session to file"""
         with open(filepath, 'w') as f:
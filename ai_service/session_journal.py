@@ -0,0 +1,450 @@
+"""
+Session Journal
+
+Durable interview sessions without rewriting them on every change:
+- Append-only journal of session events (created, context set, mode, asked,
+  answered with score, skipped, skill covered, topic mentioned, phase, deleted)
+- Group commit: a writer thread packs every pending event into one compressed,
+  CRC-checked record and fsyncs once per batch; sync() waits for durability
+- Segments: when the active journal file grows past JOURNAL_SNAPSHOT_BYTES a new
+  one is started, and a background thread folds the closed segments into a
+  compact snapshot of the live sessions, bounding replay time
+- Recovery: latest snapshot + replay of newer segments; a torn tail (crash
+  mid-write) ends that segment's replay
+
+Layout of JOURNAL_DIR:
+    snapshot-00000007.jsonl.gz  sessions as of the start of segment 7 (header line,
+                                then one InterviewSession.to_dict() per line; older
+                                snapshot-*.json.gz single documents are still read)
+    journal-00000007.log        events since then
+    journal-00000008.log        ...
+
+Usage:
+    from session_journal import SessionJournal
+
+    journal = SessionJournal("data/session_journal")
+    active_sessions = journal.recover()    # Once at startup, attaches the journal
+
+    session = journal.attach(InterviewSession(session_id))  # Changes are journaled from now on
+    session.mark_question_answered(question_id, answer, score)
+    journal.sync()                         # Block until everything so far is on disk
+    journal.close()                        # At shutdown
+"""
+
+import gzip
+import json
+import os
+import re
+import threading
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from answer_log import AnswerLog, AnswerLogError, encode_record, read_record
+from compute_pool import _env_int
+from session_context import InterviewSession
+
+# Where journal segments and snapshots live
+JOURNAL_DIR = os.getenv("JOURNAL_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "session_journal"))
+
+# Master switch (off = sessions are in memory only, as before)
+JOURNAL_ENABLED = os.getenv("JOURNAL_ENABLED", "true").lower() not in ("0", "false", "no", "off")
+
+# Longest an event waits for its batch to be written when nobody is waiting on sync()
+JOURNAL_FLUSH_MS = _env_int("JOURNAL_FLUSH_MS", 20)
+
+# Pending events that trigger a write without waiting for the flush interval
+JOURNAL_BATCH_EVENTS = _env_int("JOURNAL_BATCH_EVENTS", 512)
+
+# Active segment size that starts a new segment and a snapshot of the closed ones
+JOURNAL_SNAPSHOT_BYTES = _env_int("JOURNAL_SNAPSHOT_BYTES", 16 * 1024 * 1024)
+
+# zlib level for event batches (answers and resumes compress well)
+JOURNAL_COMPRESSION = _env_int("JOURNAL_COMPRESSION", 1)
+
+_SEGMENT = re.compile(r"^journal-(\d{8})\.log$")
+_SNAPSHOT = re.compile(r"^snapshot-(\d{8})\.jsonl?\.gz$")  # .json.gz: legacy single-document layout
+
+# Event op -> InterviewSession method that replays it
+_REPLAY = {
+    "mode": "set_interview_mode",
+    "asked": "mark_question_asked",
+    "answered": "mark_question_answered",
+    "skipped": "mark_question_skipped",
+    "skill": "mark_skill_covered",
+    "topic": "add_mentioned_topic",
+    "phase": "set_phase",
+}
+
+
+def _fsync_dir(path: str):
+    """Make file creations/renames in path durable (no-op where unsupported)"""
+    try:
+        fd = os.open(path, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass  # Windows can't fsync a directory handle
+    finally:
+        os.close(fd)
+
+
+def apply_event(sessions: Dict[str, InterviewSession], event: list, answer_log: Optional[AnswerLog] = None):
+    """Replay one journaled event onto sessions (sessions must not have a journal attached)"""
+    session_id, op, *args = event
+    if op == "create":
+        sessions[session_id] = InterviewSession(session_id, answer_log=answer_log)
+        return
+    if op == "delete":
+        sessions.pop(session_id, None)
+        return
+
+    session = sessions.get(session_id)
+    if session is None:
+        return  # Created before a snapshot that already dropped it
+    if op == "context":
+        session.set_user_context(**args[0])
+    else:
+        getattr(session, _REPLAY[op])(*args)
+
+
+class SessionJournal:
+    """Event journal + snapshots for every live InterviewSession"""
+
+    def __init__(self, directory: str = JOURNAL_DIR, flush_ms: int = JOURNAL_FLUSH_MS,
+                 batch_events: int = JOURNAL_BATCH_EVENTS, snapshot_bytes: int = JOURNAL_SNAPSHOT_BYTES,
+                 compression: int = JOURNAL_COMPRESSION, fsync: bool = True):
+        self.directory = directory
+        self.flush_seconds = flush_ms / 1000
+        self.batch_events = batch_events
+        self.snapshot_bytes = snapshot_bytes
+        self.compression = compression
+        self.fsync = fsync
+
+        self._cond = threading.Condition()
+        self._pending: List[str] = []
+        self._seq = 0           # Last event handed to append()
+        self._durable_seq = 0   # Last event fsynced
+        self._waiters = 0
+        self._closed = False
+        self._rotate_requested = False
+        self._error: Optional[BaseException] = None
+
+        self._file = None
+        self._segment = 0
+        self._writer: Optional[threading.Thread] = None
+        self._compactor: Optional[threading.Thread] = None
+
+        # Counters
+        self.events = 0
+        self.batches = 0
+        self.bytes_written = 0
+        self.snapshots = 0
+        self.last_recovery: Optional[Dict] = None
+
+    # ---- Files ----
+
+    def _segment_path(self, n: int) -> str:
+        return os.path.join(self.directory, f"journal-{n:08d}.log")
+
+    def _snapshot_path(self, n: int) -> str:
+        return os.path.join(self.directory, f"snapshot-{n:08d}.jsonl.gz")
+
+    def _legacy_snapshot_path(self, n: int) -> str:
+        return os.path.join(self.directory, f"snapshot-{n:08d}.json.gz")
+
+    def _listing(self):
+        """(segment numbers, snapshot numbers) present on disk, ascending"""
+        segments, snapshots = [], []
+        for name in os.listdir(self.directory):
+            match = _SEGMENT.match(name)
+            if match:
+                segments.append(int(match.group(1)))
+                continue
+            match = _SNAPSHOT.match(name)
+            if match:
+                snapshots.append(int(match.group(1)))
+        return sorted(segments), sorted(set(snapshots))
+
+    def history(self) -> Tuple[Optional[int], List[int]]:
+        """(newest snapshot, segments from it on): what recovery reads, for offline readers"""
+        segments, snapshots = self._listing()
+        base = snapshots[-1] if snapshots else None
+        return base, [n for n in segments if base is None or n >= base]
+
+    def iter_snapshot(self, n: int) -> Iterator[Dict]:
+        """Session dicts (InterviewSession.to_dict() form) in snapshot n, one at a time"""
+        if not os.path.exists(self._snapshot_path(n)) and os.path.exists(self._legacy_snapshot_path(n)):
+            # Legacy layout: one {"segment", "created", "sessions": {id: state}} document
+            with gzip.open(self._legacy_snapshot_path(n), "rt", encoding="utf-8") as f:
+                yield from json.load(f)["sessions"].values()
+            return
+        with gzip.open(self._snapshot_path(n), "rt", encoding="utf-8") as f:
+            header = json.loads(f.readline())
+            count = 0
+            for line in f:
+                count += 1
+                yield json.loads(line)
+        if count != header["sessions"]:
+            raise ValueError(f"Snapshot {n} holds {count} of {header['sessions']} sessions")
+
+    def iter_segment(self, n: int) -> Iterator[list]:
+        """Events of segment n, stopping at a torn or corrupt batch"""
+        with open(self._segment_path(n), "rb") as f:
+            while True:
+                try:
+                    raw = read_record(f)
+                except AnswerLogError:
+                    print(f"⚠️ Journal segment {n} ends in a torn batch (ignored)")
+                    return
+                if raw is None:
+                    return
+                for line in raw.decode("utf-8").split("\n"):
+                    yield json.loads(line)
+
+    def _load_snapshot(self, n: int, answer_log: Optional[AnswerLog]) -> Dict[str, InterviewSession]:
+        sessions = {}
+        for state in self.iter_snapshot(n):
+            sessions[state["session_id"]] = InterviewSession.from_dict(state, answer_log=answer_log)
+        return sessions
+
+    def _open_segment(self, n: int):
+        self._segment = n
+        self._file = open(self._segment_path(n), "ab")
+        _fsync_dir(self.directory)
+
+    # ---- Recovery ----
+
+    def _restore(self, answer_log: Optional[AnswerLog], upto: Optional[int] = None):
+        """
+        Sessions from the newest readable snapshot plus the segments after it
+        (segments >= upto are left out). Returns (sessions, snapshot used, segments replayed).
+        """
+        segments, snapshots = self._listing()
+        base, sessions = None, {}
+        for n in reversed(snapshots):
+            if upto is not None and n > upto:
+                continue
+            try:
+                sessions = self._load_snapshot(n, answer_log)
+                base = n
+                break
+            except (OSError, EOFError, ValueError) as e:
+                print(f"⚠️ Skipping unreadable session snapshot {n}: {e}")
+
+        replayed = [n for n in segments if (base is None or n >= base) and (upto is None or n < upto)]
+        for n in replayed:
+            for event in self.iter_segment(n):
+                apply_event(sessions, event, answer_log)
+        return sessions, base, replayed
+
+    def recover(self) -> Dict[str, InterviewSession]:
+        """
+        Rebuild every live session, attach this journal to them and start
+        journaling into a fresh segment. Call once, before any append().
+        """
+        started = time.perf_counter()
+        os.makedirs(self.directory, exist_ok=True)
+        sessions, base, replayed = self._restore(answer_log=None)
+        for session in sessions.values():
+            session.journal = self
+
+        segments, _ = self._listing()
+        self._open_segment((segments[-1] + 1) if segments else (base or 0))
+        self._writer = threading.Thread(target=self._write_loop, name="session-journal", daemon=True)
+        self._writer.start()
+
+        self.last_recovery = {
+            "sessions": len(sessions),
+            "snapshot": base,
+            "segments_replayed": len(replayed),
+            "seconds": round(time.perf_counter() - started, 3)
+        }
+        if any(os.path.getsize(self._segment_path(n)) for n in replayed):
+            self._start_compaction()  # Fold what was just replayed into a snapshot
+        return sessions
+
+    # ---- Appending ----
+
+    def attach(self, session: InterviewSession) -> InterviewSession:
+        """Journal a new session and everything that happens to it from now on"""
+        self.append(session.session_id, "create")
+        session.journal = self
+        return session
+
+    def forget(self, session_id: str):
+        """Journal a session's deletion"""
+        self.append(session_id, "delete")
+
+    def append(self, session_id: str, op: str, *args) -> int:
+        """Queue an event for the next batch; returns its sequence number for sync()"""
+        line = json.dumps([session_id, op, *args], ensure_ascii=False, separators=(",", ":"))
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Session journal is closed")
+            self._pending.append(line)
+            self._seq += 1
+            if len(self._pending) == 1 or len(self._pending) >= self.batch_events:
+                self._cond.notify_all()
+            return self._seq
+
+    def sync(self, seq: Optional[int] = None, timeout: Optional[float] = None) -> bool:
+        """Wait until event seq (default: everything appended so far) is on disk"""
+        with self._cond:
+            target = self._seq if seq is None else seq
+            if self._durable_seq >= target:
+                return True
+            self._waiters += 1
+            self._cond.notify_all()  # Don't hold the batch back for the flush interval
+            try:
+                done = self._cond.wait_for(
+                    lambda: self._durable_seq >= target or self._error is not None or self._writer is None,
+                    timeout
+                )
+            finally:
+                self._waiters -= 1
+            if self._error is not None:
+                raise RuntimeError("Session journal write failed") from self._error
+            return done and self._durable_seq >= target
+
+    def _write_loop(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending or self._closed or self._rotate_requested)
+                # Give concurrent events a chance to share this fsync
+                if (self._pending and not self._waiters and not self._closed and not self._rotate_requested
+                        and len(self._pending) < self.batch_events):
+                    self._cond.wait_for(
+                        lambda: self._waiters or self._closed or len(self._pending) >= self.batch_events,
+                        self.flush_seconds
+                    )
+                batch, self._pending = self._pending, []
+                upto = self._seq
+                rotate, self._rotate_requested = self._rotate_requested, False
+
+            if batch:
+                try:
+                    record = encode_record("\n".join(batch).encode("utf-8"), self.compression)
+                    self._file.write(record)
+                    self._file.flush()
+                    if self.fsync:
+                        os.fsync(self._file.fileno())
+                except OSError as e:
+                    print(f"❌ Session journal write failed: {e}")
+                    with self._cond:
+                        self._error = e
+                        self._cond.notify_all()
+                    return
+
+                with self._cond:
+                    self._durable_seq = upto
+                    self.events += len(batch)
+                    self.batches += 1
+                    self.bytes_written += len(record)
+                    self._cond.notify_all()
+            elif self._closed:
+                return
+
+            if rotate or (self._file.tell() >= self.snapshot_bytes and not self.is_compacting):
+                self._rotate()
+
+    # ---- Snapshots ----
+
+    @property
+    def is_compacting(self) -> bool:
+        return self._compactor is not None and self._compactor.is_alive()
+
+    def _rotate(self):
+        """Close the active segment and snapshot everything before it (writer thread only)"""
+        if self.is_compacting:
+            self._compactor.join()  # Explicit checkpoint during a size-triggered snapshot
+        self._file.close()
+        with self._cond:
+            self._open_segment(self._segment + 1)
+            self._start_compaction()
+            self._cond.notify_all()
+
+    def _start_compaction(self):
+        self._compactor = threading.Thread(
+            target=self._compact, args=(self._segment,), name="session-journal-snapshot", daemon=True
+        )
+        self._compactor.start()
+
+    def _compact(self, upto: int):
+        """Write snapshot-upto from the previous snapshot + closed segments, then drop those files"""
+        started = time.perf_counter()
+        scratch = AnswerLog(os.path.join(self.directory, f"snapshot-{upto:08d}.answers"), remove_on_close=True)
+        path = self._snapshot_path(upto)
+        tmp = path + ".tmp"
+        try:
+            sessions, _, _ = self._restore(answer_log=scratch, upto=upto)
+            with gzip.open(tmp, "wt", encoding="utf-8", compresslevel=self.compression) as f:
+                f.write(json.dumps({"segment": upto, "created": time.time(), "sessions": len(sessions)}) + "\n")
+                for session in sessions.values():
+                    f.write(json.dumps(session.to_dict(), ensure_ascii=False, separators=(",", ":")) + "\n")
+        except Exception as e:
+            print(f"⚠️ Session snapshot {upto} failed: {e}")
+            return
+        finally:
+            scratch.close()
+
+        if self.fsync:
+            with open(tmp, "rb") as f:
+                os.fsync(f.fileno())
+        os.replace(tmp, path)
+        _fsync_dir(self.directory)
+
+        segments, snapshots = self._listing()
+        for n in segments:
+            if n < upto:
+                os.remove(self._segment_path(n))
+        for n in snapshots:
+            if n < upto:
+                for old in (self._snapshot_path(n), self._legacy_snapshot_path(n)):
+                    if os.path.exists(old):
+                        os.remove(old)
+
+        self.snapshots += 1
+        print(f"✓ Session snapshot {upto}: {len(sessions)} sessions in {time.perf_counter() - started:.2f}s")
+
+    def checkpoint(self, wait: bool = True):
+        """Write out pending events, start a new segment and snapshot everything before it"""
+        with self._cond:
+            target = self._segment + 1
+            self._rotate_requested = True
+            self._cond.notify_all()
+            self._cond.wait_for(lambda: self._segment >= target or self._error is not None)
+            compactor = self._compactor
+        if wait and compactor is not None:
+            compactor.join()
+
+    # ---- Lifecycle ----
+
+    def get_statistics(self) -> Dict:
+        with self._cond:
+            return {
+                "segment": self._segment,
+                "events": self.events,
+                "batches": self.batches,
+                "events_per_batch": round(self.events / self.batches, 1) if self.batches else None,
+                "bytes_written": self.bytes_written,
+                "pending": len(self._pending),
+                "snapshots": self.snapshots,
+                "compacting": self.is_compacting,
+                "last_recovery": self.last_recovery
+            }
+
+    def close(self):
+        """Write out pending events and stop the writer"""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        if self._writer is not None:
+            self._writer.join()
+        if self._compactor is not None:
+            self._compactor.join()
+        if self._file is not None:
+            self._file.close()
@@ -0,0 +1,122 @@
+"""
+Test Unified Bank Index
+
+Every question file is covered by one vector index, and pool searches
+only return questions from the requested pool.
+"""
+
+from rag.retrieve import QuestionRetriever
+from session_context import InterviewSession
+
+
+def test_index_covers_every_question():
+    """One vector per question in the bank"""
+    print("\n" + "="*60)
+    print("TEST 1: Index Covers Whole Bank")
+    print("="*60)
+
+    retriever = QuestionRetriever()
+
+    print(f"Bank: {len(retriever.all_questions)} questions, index: {retriever.index.ntotal} vectors")
+    assert retriever.index.ntotal == len(retriever.all_questions)
+
+    print("✅ Every question is searchable")
+
+
+def test_pool_search_stays_in_pool():
+    """Restricted searches never leave the requested pool"""
+    print("\n" + "="*60)
+    print("TEST 2: Pool-Restricted Search")
+    print("="*60)
+
+    retriever = QuestionRetriever()
+
+    for pool_name in ['behavioral_questions', 'dsa_questions', 'medical_questions']:
+        pool = getattr(retriever, pool_name)
+        results = retriever.search_pool(
+            resume_text="Backend engineer, Python and SQL",
+            job_description="Senior software engineer",
+            pool_name=pool_name,
+            top_k=5
+        )
+        pool_ids = {q['id'] for q in pool}
+
+        print(f"  {pool_name}: {[q['id'] for q in results]}")
+        assert len(results) == min(5, len(pool))
+        assert all(q['id'] in pool_ids for q in results)
+        assert [q['score'] for q in results] == sorted((q['score'] for q in results), reverse=True)
+
+    print("✅ Pool searches ranked by similarity and stay in pool")
+
+
+def test_rank_questions_is_permutation():
+    """Ranking reorders but never drops or adds questions"""
+    retriever = QuestionRetriever()
+    pool = retriever.hr_basic_questions + retriever.career_questions
+
+    ranked = retriever.rank_questions("Team lead who mentors junior developers", pool)
+
+    assert sorted(q['id'] for q in ranked) == sorted(q['id'] for q in pool)
+    assert retriever.rank_questions("   ", pool) == pool  # Empty query keeps file order
+
+    print("✅ Ranking is a permutation of the pool")
+
+
+def test_filtered_search_returns_exact_top_k():
+    """Selective filters are applied inside the search, not by over-fetching"""
+    print("\n" + "="*60)
+    print("TEST 4: Filtered Search")
+    print("="*60)
+
+    retriever = QuestionRetriever()
+    query = retriever.encode_query("Junior backend developer with SQL")
+
+    mask = retriever.filters.match(role='backend', level='junior', difficulty=(2, 4))
+    expected = int(mask.sum())
+    results = retriever.search(query, 50, mask=mask)
+
+    print(f"  {expected} questions match role=backend, level=junior, difficulty 2-4")
+    assert len(results) == min(50, expected)
+    for pos, _ in results:
+        q = retriever.all_questions[pos]
+        assert q.get('role') in ('backend', 'any')
+        assert q.get('level') in ('junior', 'any')
+        assert 2 <= q.get('difficulty') <= 4
+
+    # Excluding asked ids still returns a full page
+    asked = {retriever.all_questions[pos]['id'] for pos, _ in results[:5]}
+    mask &= ~retriever.filters.ids_mask(asked)
+    results = retriever.search(query, 5, mask=mask)
+    assert len(results) == min(5, int(mask.sum()))
+    assert not any(retriever.all_questions[pos]['id'] in asked for pos, _ in results)
+
+    print("✅ Exactly top_k filtered results in one search")
+
+
+def test_warmup_priority_uses_precomputed_tags():
+    """Intro, education and role warmups lead; asked ones are skipped"""
+    retriever = QuestionRetriever()
+
+    session = InterviewSession()
+    session.set_user_context(education="B.Tech", target_role="Backend Engineer")
+    session.mark_question_asked("warmup_003")
+    ids = [q['id'] for q in retriever.retrieve_phased(session, top_k=4)]
+
+    print(f"Warmup order: {ids}")
+    assert ids == ['warmup_001', 'warmup_002', 'warmup_006', 'warmup_004']
+
+    session.mark_question_answered('warmup_001', "answer")
+    session.mark_question_asked('warmup_002')
+    ids = [q['id'] for q in retriever.retrieve_phased(session, top_k=2)]
+    assert ids == ['warmup_006', 'warmup_004']
+
+    print("✅ Warmup priorities come from load-time tags")
+
+
+if __name__ == "__main__":
+    test_index_covers_every_question()
+    test_pool_search_stays_in_pool()
+    test_rank_questions_is_permutation()
+    test_filtered_search_returns_exact_top_k()
+    test_warmup_priority_uses_precomputed_tags()
+    print("\n✅ All bank index tests passed")
@@ -0,0 +1,104 @@
+"""
+Test Compute Pool and Event Loop Lag Monitor
+
+Verifies that blocking retrieval work no longer stalls the event loop.
+"""
+
+import asyncio
+import time
+
+from compute_pool import ComputePool, EventLoopLagMonitor
+
+
+def blocking_work(seconds: float) -> str:
+    """Stand-in for an embedding forward pass"""
+    time.sleep(seconds)
+    return "done"
+
+
+def test_pool_keeps_loop_responsive():
+    """Loop keeps ticking while workers run blocking jobs"""
+    print("\n" + "="*60)
+    print("TEST 1: Event Loop Stays Responsive")
+    print("="*60)
+
+    async def scenario():
+        pool = ComputePool(max_workers=2, max_queued=4)
+        monitor = EventLoopLagMonitor(interval=0.01, warn_threshold=0.1)
+        monitor.start()
+
+        results = await asyncio.gather(*(pool.run(blocking_work, 0.1) for _ in range(4)))
+
+        await monitor.stop()
+        pool.shutdown(wait=True)
+        return results, pool.get_statistics(), monitor.get_statistics()
+
+    results, pool_stats, lag_stats = asyncio.run(scenario())
+
+    print(f"Pool: {pool_stats}")
+    print(f"Loop: {lag_stats}")
+
+    assert results == ["done"] * 4
+    assert pool_stats["completed"] == 4
+    assert pool_stats["in_flight"] == 0
+    assert lag_stats["samples"] > 0
+    assert lag_stats["stalls"] == 0, "Event loop was blocked by pool work"
+
+    print("✅ Blocking work ran without stalling the loop")
+
+
+def test_monitor_detects_blocking():
+    """Synchronous work on the loop shows up as lag"""
+    print("\n" + "="*60)
+    print("TEST 2: Lag Monitor Detects Blocking")
+    print("="*60)
+
+    async def scenario():
+        monitor = EventLoopLagMonitor(interval=0.01, warn_threshold=0.1)
+        monitor.start()
+        await asyncio.sleep(0.03)
+        blocking_work(0.2)  # Deliberately block the loop
+        await asyncio.sleep(0.03)
+        await monitor.stop()
+        return monitor.get_statistics()
+
+    stats = asyncio.run(scenario())
+    print(f"Loop: {stats}")
+
+    assert stats["stalls"] >= 1
+    assert stats["max_lag_ms"] >= 150
+
+    print("✅ Blocked time reported")
+
+
+def test_pool_propagates_errors():
+    """Worker exceptions reach the awaiting handler"""
+    print("\n" + "="*60)
+    print("TEST 3: Error Propagation")
+    print("="*60)
+
+    def failing():
+        raise ValueError("boom")
+
+    async def scenario():
+        pool = ComputePool(max_workers=1)
+        try:
+            await pool.run(failing)
+        except ValueError as e:
+            return str(e), pool.get_statistics()
+        finally:
+            pool.shutdown(wait=True)
+
+    message, stats = asyncio.run(scenario())
+
+    assert message == "boom"
+    assert stats["failed"] == 1
+
+    print("✅ Errors propagate and are counted")
+
+
+if __name__ == "__main__":
+    test_pool_keeps_loop_responsive()
+    test_monitor_detects_blocking()
+    test_pool_propagates_errors()
+    print("\n✅ All compute pool tests passed")
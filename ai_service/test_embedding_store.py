@@ -0,0 +1,121 @@
+"""
+Test Embedding Store
+
+Verifies that index builds only encode new or changed question text, that
+the store survives restarts, and that encoding runs in length-sorted batches.
+"""
+
+import tempfile
+
+import numpy as np
+
+from rag import embeddings
+from rag.embedding_store import EmbeddingStore
+
+
+class CountingBatchEncoder:
+    """Deterministic fake batch encoder that counts encoded texts"""
+
+    def __init__(self):
+        self.encoded = 0
+
+    def __call__(self, texts):
+        self.encoded += len(texts)
+        return np.stack([
+            np.random.default_rng(abs(hash(text)) % (2 ** 32)).random(8).astype("float32")
+            for text in texts
+        ])
+
+
+def test_only_changed_text_is_encoded():
+    """A rebuild after one edit encodes exactly one question"""
+    print("\n" + "="*60)
+    print("TEST 1: Incremental Encoding")
+    print("="*60)
+
+    texts = [f"Question {i}" for i in range(20)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        encoder = CountingBatchEncoder()
+        store = EmbeddingStore(tmp, model_id="test-model")
+        first = store.embeddings_for(texts, encoder)
+        assert encoder.encoded == 20
+
+        edited = texts.copy()
+        edited[7] = "Question 7, reworded"
+        restarted = EmbeddingStore(tmp, model_id="test-model")
+        second = restarted.embeddings_for(edited, encoder)
+
+    print(f"Last build: {restarted.last_build}")
+    assert encoder.encoded == 21, "Unchanged questions were re-encoded"
+    assert restarted.last_build["reused"] == 19
+    assert np.array_equal(np.delete(first, 7, axis=0), np.delete(second, 7, axis=0))
+
+    print("✅ Only the edited question was encoded")
+
+
+def test_model_change_starts_fresh():
+    """Embeddings from another model are never reused"""
+    with tempfile.TemporaryDirectory() as tmp:
+        encoder = CountingBatchEncoder()
+        EmbeddingStore(tmp, model_id="model-a").embeddings_for(["same text"], encoder)
+        EmbeddingStore(tmp, model_id="model-b").embeddings_for(["same text"], encoder)
+
+    assert encoder.encoded == 2
+    print("✅ Model id is part of the store identity")
+
+
+def test_compaction_drops_removed_questions():
+    """Whole-bank builds drop embeddings of deleted questions"""
+    with tempfile.TemporaryDirectory() as tmp:
+        encoder = CountingBatchEncoder()
+        store = EmbeddingStore(tmp, model_id="test-model")
+        store.embeddings_for([f"Old {i}" for i in range(10)], encoder)
+
+        vectors = store.embeddings_for(["Old 0", "New 1"], encoder, compact=True)
+
+        assert len(store) == 2
+        assert vectors.shape == (2, 8)
+
+    print("✅ Stale rows compacted")
+
+
+def test_length_sorted_batches_keep_input_order():
+    """Batches group similar lengths; results come back in input order"""
+    print("\n" + "="*60)
+    print("TEST 4: Length-Sorted Batching")
+    print("="*60)
+
+    texts = ["x" * n for n in (50, 3, 47, 5, 48, 4, 49, 6)]
+    batches = embeddings.length_sorted_batches(texts, batch_size=4)
+
+    assert [sorted(len(texts[i]) for i in b) for b in batches] == [[3, 4, 5, 6], [47, 48, 49, 50]]
+    assert embeddings.padding_efficiency(texts, batches) > 0.9
+
+    class LengthModel:
+        """Fake model: one call per batch, vector = text length"""
+        calls = 0
+
+        def encode(self, batch, batch_size=32, convert_to_numpy=True):
+            LengthModel.calls += 1
+            return np.array([[len(text), 1.0] for text in batch], dtype="float32")
+
+    previous = embeddings.model
+    embeddings.model = LengthModel()
+    try:
+        vectors = embeddings.encode_texts(texts, batch_size=4, workers=1)
+    finally:
+        embeddings.model = previous
+
+    assert LengthModel.calls == 2, "Texts were not encoded in batches"
+    assert vectors[:, 0].tolist() == [len(t) for t in texts]
+
+    print("✅ Two batched model calls, rows in input order")
+
+
+if __name__ == "__main__":
+    test_only_changed_text_is_encoded()
+    test_model_change_starts_fresh()
+    test_compaction_drops_removed_questions()
+    test_length_sorted_batches_keep_input_order()
+    print("\n✅ All embedding store tests passed")
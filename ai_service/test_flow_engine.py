@@ -0,0 +1,66 @@
+"""
+Test Shared Interview Flow Engine
+
+Verifies that one engine drives independent interviews through their own
+state objects, and that a state survives a round trip through the
+session store unchanged.
+"""
+
+import json
+
+from rag.interview_flow_controller import InterviewFlowEngine, InterviewState
+from rag.question_bank import load_bank
+
+
+def _engine():
+    _, bank, _ = load_bank()
+    return InterviewFlowEngine('data/interview_flow.json', bank)
+
+
+def test_interviews_are_independent():
+    """Two interviews on one engine never share asked questions or scores"""
+    print("\n" + "="*60)
+    print("TEST 1: One Engine, Many Interviews")
+    print("="*60)
+
+    engine = _engine()
+    states = [engine.new_interview('backend', 'junior', seed=i) for i in range(50)]
+    for state in states:
+        for question in engine.get_next_questions(state, 2):
+            engine.record_answer(state, question['id'], 0.9)
+
+    assert all(len(state.questions_asked) == 2 and len(state.scores) == 2 for state in states)
+    assert len({tuple(state.questions_asked) for state in states}) > 1
+    print(f"✅ {len(states)} interviews on one engine")
+
+
+def test_state_round_trip_is_exact():
+    """A restored state continues exactly as the original would"""
+    engine = _engine()
+    state = engine.new_interview('backend', 'junior', seed=11)
+    for score in (0.9, 0.3, 0.7):
+        question = engine.get_next_questions(state, 1)[0]
+        engine.record_answer(state, question['id'], score, red_flags=1)
+
+    payload = json.dumps(state.to_dict())
+    restored = InterviewState.from_dict(json.loads(payload))
+
+    print(f"Serialized state: {len(payload)} bytes")
+    assert restored.questions_asked == state.questions_asked
+    assert restored.average_score == state.average_score
+    assert restored.red_flags_total == state.red_flags_total
+    assert restored.candidate_weaknesses == state.candidate_weaknesses
+    assert restored.current_stage == state.current_stage
+
+    original_next = [q['id'] for q in engine.get_next_questions(state, 1)]
+    restored_next = [q['id'] for q in engine.get_next_questions(restored, 1)]
+    assert original_next == restored_next, "Restored RNG diverged"
+    assert engine.should_advance_stage(restored) == engine.should_advance_stage(state)
+
+    print("✅ Round trip preserves progress and sampling")
+
+
+if __name__ == "__main__":
+    test_interviews_are_independent()
+    test_state_round_trip_is_exact()
+    print("\n✅ All flow engine tests passed")
@@ -0,0 +1,181 @@
+"""
+Test Interview Analytics
+
+Verifies that chunked streaming aggregates equal an in-memory NumPy
+computation (mean, variance, percentiles, distributions) whatever the chunk
+size, and that a journal directory and a JSONL export of the same sessions
+produce the same report.
+"""
+
+import gzip
+import json
+import os
+import random
+import tempfile
+
+import numpy as np
+
+from interview_analytics import PERCENTILES, InterviewAnalytics
+from session_context import InterviewSession
+from session_journal import SessionJournal
+
+METADATA = {f"q{n}": (["python", "sql", "react"][n % 3], "backend") for n in range(40)}
+
+
+def synthetic_sessions(count: int, seed: int = 3, start: int = 0, make=InterviewSession):
+    """Sessions with integer scores spread over a few months, roles and modes"""
+    rng = random.Random(seed)
+    sessions = []
+    for n in range(start, start + count):
+        session = make(f"s{n}")
+        session.set_user_context(target_role=rng.choice(["Backend", "Frontend", ""]))
+        session.set_interview_mode(rng.choice(["general", "technical", "hr"]))
+        for k in rng.sample(range(40), 12):
+            timestamp = 1767225600 + rng.randint(0, 120) * 86400  # 2026-01-01 + up to 4 months
+            session.mark_question_answered(f"q{k}", "answer", rng.choice([None, 2, 4, 6, 7, 8, 10]), timestamp)
+        sessions.append(session)
+    return sessions
+
+
+def test_streaming_matches_numpy():
+    """Per-question statistics equal NumPy on the full data, for any chunk size"""
+    print("\n" + "="*60)
+    print("TEST 1: Streaming vs NumPy")
+    print("="*60)
+
+    sessions = synthetic_sessions(150)
+    scores = {}
+    for session in sessions:
+        for question_id, entry in session.answered_questions.items():
+            if entry["score"] is not None:
+                scores.setdefault(question_id, []).append(entry["score"])
+
+    reports = []
+    for chunk_size in (7, 1000):
+        analytics = InterviewAnalytics(chunk_size=chunk_size, question_metadata=METADATA)
+        for session in sessions:
+            analytics.add_session(session.to_dict())
+        reports.append(analytics.report())
+
+    for report in reports:
+        assert report["records"] == sum(len(v) for v in scores.values())
+        for row in report["questions"]:
+            values = np.array(scores[row["question_id"]], dtype=float)
+            assert row["count"] == len(values)
+            assert abs(row["mean"] - values.mean()) < 1e-3
+            assert abs(row["variance"] - values.var(ddof=1)) < 1e-3
+            expected = np.percentile(values, PERCENTILES, method="inverted_cdf")
+            assert [row["percentiles"][f"p{p}"] for p in PERCENTILES] == expected.tolist()
+            assert row["distribution"] == np.bincount(values.astype(int), minlength=11).tolist()
+            assert row["skill"] == METADATA[row["question_id"]][0]
+
+    small, large = reports
+    assert small["questions"] == large["questions"] and small["skills"] == large["skills"]
+    print(f"✓ {small['records']} answers: chunk size 7 ({small['chunks']} chunks) == chunk size 1000")
+
+    trends = small["skill_trends"]["skills"]
+    assert set(trends) == {"python", "sql", "react"}
+    assert sum(point["count"] for point in trends["python"]) == next(
+        row["count"] for row in small["skills"] if row["skill"] == "python")
+    assert {point["period"] for point in trends["sql"]} <= {"2026-01", "2026-02", "2026-03", "2026-04", "2026-05"}
+    print(f"✓ Monthly trends: {[(p['period'], p['mean']) for p in trends['python']]}")
+    print("✅ Streaming aggregates match NumPy")
+
+
+def test_journal_and_export_agree():
+    """A journal (snapshot + later segments) and an export give the same cohorts"""
+    print("\n" + "="*60)
+    print("TEST 2: Journal vs Export")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        journal_dir = os.path.join(tmp, "journal")
+        journal = SessionJournal(journal_dir)
+        journal.recover()
+        make = lambda session_id: journal.attach(InterviewSession(session_id))
+        live = synthetic_sessions(20, make=make)
+        journal.checkpoint(wait=True)  # These end up in the snapshot, the rest in segments
+        live += synthetic_sessions(20, seed=4, start=20, make=make)
+        journal.close()
+
+        export = os.path.join(tmp, "sessions.jsonl.gz")
+        with gzip.open(export, "wt", encoding="utf-8") as f:
+            for session in live:
+                f.write(json.dumps(session.to_dict()) + "\n")
+
+        from_journal = InterviewAnalytics(question_metadata=METADATA)
+        from_journal.add_source(journal_dir)
+        from_export = InterviewAnalytics(question_metadata=METADATA)
+        from_export.add_source(export)
+        a, b = from_journal.report(), from_export.report()
+
+        assert a["records"] == b["records"] and a["sessions"] == b["sessions"] == 40
+        for key in ("questions", "skills", "roles", "interview_modes", "skill_trends"):
+            assert a[key] == b[key], key
+        print(f"✓ {a['records']} answers, roles {[r['role'] for r in a['roles']]}, "
+              f"modes {[m['interview_mode'] for m in a['interview_modes']]}")
+
+    print("✅ Journal and export agree")
+
+
+def replay_history(journal_dir: str, compact: bool) -> dict:
+    """The same interview events, optionally with a compaction halfway; final session states by id"""
+    journal = SessionJournal(journal_dir)
+    journal.recover()
+    make = lambda session_id: journal.attach(InterviewSession(session_id))
+    live = {session.session_id: session for session in synthetic_sessions(10, make=make)}
+    if compact:
+        journal.checkpoint(wait=True)
+
+    rng = random.Random(9)
+    for session in list(live.values())[:6]:
+        # Retakes of snapshotted answers, including one that ends up unscored
+        for question_id in rng.sample(sorted(session.answered_questions), 3):
+            session.mark_question_answered(question_id, "retake", rng.choice([None, 3, 9]), 1772323200)
+    live["s1"].set_user_context(target_role="Data")
+    live["s2"].set_interview_mode("behavioral")
+    journal.forget("s3")
+    del live["s3"]
+    journal.forget("s4")
+    live.update((session.session_id, session) for session in synthetic_sessions(1, seed=6, start=4, make=make))
+    for session in synthetic_sessions(5, seed=7, start=10, make=make):
+        session.mark_question_answered(next(iter(session.answered_questions)), "retake", 5, 1772323200)
+        live[session.session_id] = session
+    journal.close()
+    return live
+
+
+def test_compaction_does_not_change_report():
+    """Replaying the same events with and without a snapshot in between gives identical reports"""
+    print("\n" + "="*60)
+    print("TEST 3: Reports Across Compaction")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        reports = []
+        for compact in (False, True):
+            journal_dir = os.path.join(tmp, f"journal-{compact}")
+            live = replay_history(journal_dir, compact)
+            analytics = InterviewAnalytics(question_metadata=METADATA)
+            analytics.add_source(journal_dir)
+            reports.append(analytics.report())
+        plain, compacted = reports
+
+        scored = sum(entry["score"] is not None for session in live.values()
+                     for entry in session.answered_questions.values())
+        assert plain["records"] == compacted["records"] == scored, "One record per final scored attempt"
+        assert plain["sessions"] == compacted["sessions"] == len(live) == 14
+        for key in ("overall", "questions", "skills", "roles", "interview_modes", "skill_trends"):
+            assert plain[key] == compacted[key], key
+        assert {role["role"] for role in plain["roles"]} >= {"Data"}
+        assert {mode["interview_mode"] for mode in plain["interview_modes"]} >= {"behavioral"}
+        print(f"✓ {scored} answers from {len(live)} sessions, retakes/deletes/recreates identical either way")
+
+    print("✅ Reports survive compaction")
+
+
+if __name__ == "__main__":
+    test_streaming_matches_numpy()
+    test_journal_and_export_agree()
+    test_compaction_does_not_change_report()
+    print("\n✅ All interview analytics tests passed")
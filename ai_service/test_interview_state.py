@@ -0,0 +1,73 @@
+"""
+Test Interview State Aggregates
+
+Verifies that the incremental counters and running averages in
+InterviewState always agree with recomputing them from history.
+"""
+
+from collections import Counter
+
+from rag.interview_flow_controller import InterviewFlowController, InterviewStage
+from rag.question_bank import load_bank
+
+
+def _controller(seed=3):
+    _, bank, _ = load_bank()
+    controller = InterviewFlowController('data/interview_flow.json', bank)
+    controller.initialize_interview('backend', 'junior', seed=seed)
+    return controller, bank
+
+
+def test_aggregates_match_history():
+    """Average, per-stage and per-category counts equal a full recount"""
+    print("\n" + "="*60)
+    print("TEST 1: Incremental Aggregates")
+    print("="*60)
+
+    controller, bank = _controller()
+    scores = [0.9, 0.3, 0.85, 0.6, 0.2, 0.95, 0.7]
+    stages = ["introduction", "resume_technical", "real_life"]
+    for i, score in enumerate(scores):
+        controller.state.current_stage = InterviewStage(stages[i % 3])
+        question = controller.get_next_questions(1)[0]
+        controller.record_answer(question['id'], score, red_flags=i % 2)
+
+    state = controller.state
+    assert abs(state.get_average_score() - sum(scores) / len(scores)) < 1e-9
+    assert abs(state.average_score - sum(scores) / len(scores)) < 1e-9
+    assert state.answered_per_category == Counter(s.category for s in state.scores)
+    assert state.answered_per_stage == Counter(s.stage for s in state.scores)
+    assert sum(state.asked_per_stage.values()) >= len(state.questions_asked)
+    assert state.candidate_strengths == Counter(s.category for s in state.scores if s.score > 0.8)
+    assert state.candidate_weaknesses == Counter(s.category for s in state.scores if s.score < 0.5)
+    assert state.red_flags_total == sum(i % 2 for i in range(len(scores)))
+
+    print(f"Per stage: {dict(state.answered_per_stage)}, per category: {dict(state.answered_per_category)}")
+    print("✅ Aggregates match a full recount")
+
+
+def test_stage_progress_counts_direct_appends():
+    """Ids appended to questions_asked directly still count toward the stage"""
+    controller, bank = _controller()
+    stage = controller.get_current_stage_config()
+    stage_questions = [q for q in bank if q.get('stage') == stage['stage']][:stage['question_count']]
+
+    for question in stage_questions[:-1]:
+        controller.state.questions_asked.append(question['id'])
+        controller.record_answer(question['id'], 0.7)
+    assert not controller.should_advance_stage()
+
+    controller.state.questions_asked.append(stage_questions[-1]['id'])
+    controller.record_answer(stage_questions[-1]['id'], 0.7)
+    assert controller.should_advance_stage()
+    assert controller.state.asked_per_stage[stage['stage']] == stage['question_count']
+
+    assert controller.advance_stage_if_ready()
+    assert controller.state.current_stage == InterviewStage.WARMUP
+    print("✅ Stage progress counted incrementally")
+
+
+if __name__ == "__main__":
+    test_aggregates_match_history()
+    test_stage_progress_counts_direct_appends()
+    print("\n✅ All interview state tests passed")
@@ -0,0 +1,91 @@
+"""
+Test Inverted Metadata Indexes
+
+Verifies that MetadataFilter.select() (posting-list intersection) returns
+exactly what the list comprehensions and bitmap masks return.
+"""
+
+import itertools
+
+import numpy as np
+
+from rag.interview_flow_controller import InterviewFlowController, InterviewStage
+from rag.metadata_filter import MetadataFilter, subtract_sorted, union_sorted
+from rag.question_bank import load_bank
+
+
+def test_sorted_list_operations():
+    """Union and subtraction on sorted position arrays"""
+    a = np.array([1, 4, 7, 9, 12], dtype=np.int32)
+    b = np.array([0, 4, 9, 13], dtype=np.int32)
+    c = np.array([2, 5, 10], dtype=np.int32)
+
+    assert union_sorted([a, c, np.zeros(0, dtype=np.int32)]).tolist() == [1, 2, 4, 5, 7, 9, 10, 12]
+    assert subtract_sorted(a, b).tolist() == [1, 7, 12]
+    assert subtract_sorted(a, np.array([13], dtype=np.int32)).tolist() == a.tolist()
+    print("✅ Sorted list operations")
+
+
+def test_select_matches_bitmaps():
+    """select() equals np.flatnonzero(match()) across filter combinations"""
+    print("\n" + "="*60)
+    print("TEST 2: Posting Lists vs Bitmaps")
+    print("="*60)
+
+    _, bank, _ = load_bank()
+    filters = MetadataFilter(bank)
+    asked = [q['id'] for q in bank[::7]]
+
+    combos = 0
+    for role, level, difficulty, stages, categories, exclude in itertools.product(
+        [None, 'backend', 'frontend'],
+        [None, 'junior', 'intern'],
+        [None, (2, 4), (4, None)],
+        [None, ['technical'], ['resume_technical', 'real_life']],
+        [None, ['behavioral'], ['technical', 'behavioral']],
+        [None, asked]
+    ):
+        expected = np.flatnonzero(filters.match(
+            role=role, level=level, difficulty=difficulty,
+            stages=stages, categories=categories, exclude_ids=exclude
+        ))
+        selected = filters.select(
+            role=role, level=level, difficulty=difficulty,
+            stages=stages, categories=categories, exclude_ids=exclude
+        )
+        assert selected.tolist() == expected.tolist(), (role, level, difficulty, stages, categories)
+        combos += 1
+
+    print(f"✅ {combos} filter combinations agree")
+
+
+def test_flow_controller_eligibility_unchanged():
+    """get_eligible_questions returns the same questions as the old full scan"""
+    _, bank, _ = load_bank()
+    controller = InterviewFlowController('data/interview_flow.json', bank)
+    controller.initialize_interview('backend', 'junior')
+    controller.state.questions_asked = [q['id'] for q in bank[::5]]
+
+    for stage_config in controller.interview_flow:
+        controller.state.current_stage = InterviewStage(stage_config['stage'])
+        low, high = stage_config['difficulty_range']
+        expected = [
+            q for q in bank
+            if (
+                q.get('stage') == stage_config['stage'] and
+                q.get('category') in stage_config['allowed_categories'] and
+                low <= q.get('difficulty', 2) <= high and
+                (q.get('role') == 'backend' or q.get('role') == 'any') and
+                q['id'] not in controller.state.questions_asked
+            )
+        ]
+        assert controller.get_eligible_questions(stage_config) == expected, stage_config['stage']
+
+    print("✅ Flow controller eligibility unchanged")
+
+
+if __name__ == "__main__":
+    test_sorted_list_operations()
+    test_select_matches_bitmaps()
+    test_flow_controller_eligibility_unchanged()
+    print("\n✅ All inverted index tests passed")
@@ -0,0 +1,258 @@
+"""
+Test Speculative Prefetch
+
+Verifies that prefetched batches and guidance are served only while still
+valid, that stale work is cancelled, that speculative work yields to
+foreground requests, and that it runs on a copy sharing no mutable state.
+"""
+
+import asyncio
+import os
+
+from prefetch import Prefetcher
+from session_context import InterviewSession
+
+
+def fake_retrieve(session, resume_text="", job_description="", top_k=10):
+    """Stand-in for retrieve_phased: next unasked ids, advancing past warmup like the real one"""
+    if session.current_phase == "warmup":
+        session.advance_phase()
+    start = len(session.asked_questions)
+    return [{"id": f"q_{i}", "question": f"Question {i}?"} for i in range(start, start + top_k)]
+
+
+def worker_niceness():
+    """Nice value of the calling thread (None where unsupported)"""
+    return os.getpriority(os.PRIO_PROCESS, 0) if hasattr(os, "getpriority") else None
+
+
+def _session():
+    session = InterviewSession("prefetch")
+    session.set_user_context(skills=["python"])
+    return session
+
+
+async def _settle():
+    """Give speculative tasks time to run"""
+    await asyncio.sleep(0.2)
+
+
+def test_prefetched_batch_matches_retrieval():
+    """A valid prefetched batch equals a fresh retrieval, including the phase change"""
+    print("\n" + "="*60)
+    print("TEST 1: Prefetched Batch Served")
+    print("="*60)
+
+    async def scenario():
+        prefetcher = Prefetcher(workers=1)
+        session = _session()
+        prefetcher.schedule_batch(session, fake_retrieve, "resume", "jd", top_k=3)
+        await _settle()
+
+        assert session.current_phase == "warmup", "Prefetch must not touch the live session"
+        prefetched = await prefetcher.take_batch(session, "resume", "jd", top_k=3)
+        expected = fake_retrieve(InterviewSession.from_dict(session.to_dict()), top_k=3)
+        prefetcher.shutdown()
+        return prefetched, expected, prefetcher.get_statistics()
+
+    (questions, phase), expected, stats = asyncio.run(scenario())
+    print(f"Stats: {stats}")
+
+    assert questions == expected
+    assert phase == "behavioral"
+    assert stats["batch_hits"] == 1
+    print("✅ Prefetched batch matches retrieval")
+
+
+def test_stale_batch_discarded():
+    """New asks, covered skills or a different request invalidate the batch"""
+    print("\n" + "="*60)
+    print("TEST 2: Stale Batches Discarded")
+    print("="*60)
+
+    async def scenario():
+        prefetcher = Prefetcher(workers=1)
+        session = _session()
+
+        prefetcher.schedule_batch(session, fake_retrieve, top_k=3)
+        await _settle()
+        session.mark_question_asked("other")
+        assert await prefetcher.take_batch(session, top_k=3) is None
+
+        prefetcher.schedule_batch(session, fake_retrieve, top_k=3)
+        await _settle()
+        assert await prefetcher.take_batch(session, top_k=5) is None
+
+        # An answer changes the session: refresh_batch recomputes from the new state
+        prefetcher.schedule_batch(session, fake_retrieve, top_k=3)
+        session.mark_skill_covered("python")
+        prefetcher.refresh_batch(session)
+        await _settle()
+        assert await prefetcher.take_batch(session, top_k=3) is not None
+
+        prefetcher.shutdown()
+        return prefetcher.get_statistics()
+
+    stats = asyncio.run(scenario())
+    print(f"Stats: {stats}")
+
+    assert stats["batch_hits"] == 1
+    assert stats["batch_misses"] == 2
+    print("✅ Stale batches are never served")
+
+
+def test_speculative_work_yields_to_foreground():
+    """Work waits while requests are in flight; a waiting job is computed in the foreground"""
+    print("\n" + "="*60)
+    print("TEST 3: Low Priority")
+    print("="*60)
+
+    async def scenario():
+        prefetcher = Prefetcher(workers=1)
+        session = _session()
+
+        with prefetcher.foreground():
+            prefetcher.schedule_batch(session, fake_retrieve, top_k=3)
+            await _settle()
+            assert prefetcher.get_statistics()["pool"]["completed"] == 0
+            # Not started yet: the request retrieves itself rather than wait behind it
+            assert await prefetcher.take_batch(session, top_k=3) is None
+
+        prefetcher.schedule_batch(session, fake_retrieve, top_k=3)
+        await _settle()
+        assert await prefetcher.take_batch(session, top_k=3) is not None
+
+        niceness = await prefetcher.pool.run(worker_niceness)
+        prefetcher.shutdown()
+        return prefetcher.get_statistics(), niceness
+
+    stats, niceness = asyncio.run(scenario())
+    print(f"Stats: {stats}, worker nice: {niceness}")
+
+    assert stats["deferrals"] > 0
+    assert stats["batch_cancelled"] == 1
+    print("✅ Speculative work deferred to foreground requests")
+
+
+def test_guidance_cache():
+    """Warmed guidance is served; failures aren't cached; a phase change drops pending work"""
+    print("\n" + "="*60)
+    print("TEST 4: Guidance Prefetch")
+    print("="*60)
+
+    calls = []
+
+    def guidance(text):
+        async def compute():
+            calls.append(text)
+            return None if text == "fails" else {"answer": text}
+        return compute
+
+    async def scenario():
+        prefetcher = Prefetcher(workers=1)
+        session = _session()
+
+        prefetcher.schedule_guidance(session.session_id, session.current_phase, "q1", guidance("q1"))
+        prefetcher.schedule_guidance(session.session_id, session.current_phase, "fails", guidance("fails"))
+        await _settle()
+
+        assert await prefetcher.take_guidance("q1") == {"answer": "q1"}
+        assert await prefetcher.take_guidance("q1") == {"answer": "q1"}  # Reopened: still cached
+        assert await prefetcher.take_guidance("fails") is None
+        assert await prefetcher.take_guidance("never scheduled") is None
+
+        # Pending guidance for the old phase is cancelled when the session moves on
+        with prefetcher.foreground():
+            prefetcher.schedule_guidance(session.session_id, session.current_phase, "q2", guidance("q2"))
+            session.advance_phase()
+            prefetcher.schedule_batch(session, fake_retrieve, top_k=3)
+        await _settle()
+        assert await prefetcher.take_guidance("q2") is None
+
+        prefetcher.shutdown()
+        return prefetcher.get_statistics()
+
+    stats = asyncio.run(scenario())
+    print(f"Stats: {stats}")
+
+    assert calls == ["q1", "fails"]
+    assert stats["guidance_hits"] == 2
+    assert stats["guidance_cancelled"] == 1
+    print("✅ Guidance served from the prefetch cache")
+
+
+def test_prefetched_guidance_key_matches_client_request():
+    """Guidance warmed for a qaPairs entry has the key of the client's /api/guidance call"""
+    print("\n" + "="*60)
+    print("TEST 5: Guidance Prefetch Key")
+    print("="*60)
+
+    import app
+    import prefetch
+
+    assert not prefetch.GUIDANCE_PREFETCH_ENABLED, "Guidance warming must be opt-in"
+    assert prefetch.GUIDANCE_PREFETCH_QUESTIONS <= 2
+
+    qa_pair = {"id": "dsa_001", "question": "Reverse a linked list.", "phase": "technical_core"}
+    session = InterviewSession("guidance_key")
+    keys = []
+    original = app.prefetcher.schedule_guidance
+    app.prefetcher.schedule_guidance = lambda session_id, phase, key, compute: keys.append(key)
+    try:
+        # generate-qa without experience_level / skills, then with them
+        for skills, level in ((None, None), (["Python", "SQL"], "senior")):
+            app.prefetch_guidance(session, app.guidance_request_for(
+                qa_pair, resume_summary="5 years backend", job_description="Backend engineer",
+                skills=skills, experience_level=level
+            ))
+            body = {"question": qa_pair["question"], "stage": qa_pair["phase"],
+                    "resume_summary": "5 years backend", "job_description": "Backend engineer"}
+            if skills:
+                body.update(skills=skills, experience_level=level)
+            assert keys[-1] == app.build_guidance_prompt(app.GuidanceRequest(**body))
+    finally:
+        app.prefetcher.schedule_guidance = original
+
+    assert "Experience Level: mid-level" in keys[0] and "Experience Level: senior" in keys[1]
+    print("✓ Prefetched keys equal the keys of /api/guidance requests built from qaPairs")
+    print("✅ Guidance prefetch key passed")
+
+
+def test_snapshot_shares_no_mutable_state():
+    """Changes to the live session after snapshot() never show up in the copy, and vice versa"""
+    print("\n" + "="*60)
+    print("TEST 6: Independent Snapshot")
+    print("="*60)
+
+    session = _session()
+    session.set_user_context(projects=["MockMate"], target_role="Backend")
+    session.mark_question_asked("q_0")
+    session.mark_question_answered("q_0", "First answer", 6)
+    session.add_mentioned_topic("projects", "MockMate")
+    copy = session.snapshot()
+    assert copy.answered_questions["q_0"]["answer"] == "First answer"
+
+    session.mark_question_answered("q_1", "Second answer", 8)
+    session.resume_data["skills"].append("sql")
+    session.resume_data["target_role"] = "Frontend"
+    session.add_mentioned_topic("projects", "ChatApp")
+    session.mark_skill_covered("python")
+    assert list(copy.answered_questions) == ["q_0"] and copy.answered_questions["q_0"]["score"] == 6
+    assert copy.resume_data["skills"] == ["python"] and copy.resume_data["target_role"] == "Backend"
+    assert copy.mentioned_topics == {"projects": ["MockMate"]} and not copy.covered_skills
+
+    copy.mark_question_answered("q_0", "Retake", 2)
+    copy.advance_phase()
+    assert session.answered_questions["q_0"]["score"] == 6 and session.current_phase == "warmup"
+    print("✓ Answers, resume data, topics and skills are copied, not shared")
+    print("✅ Independent snapshot passed")
+
+
+if __name__ == "__main__":
+    test_prefetched_batch_matches_retrieval()
+    test_stale_batch_discarded()
+    test_speculative_work_yields_to_foreground()
+    test_guidance_cache()
+    test_prefetched_guidance_key_matches_client_request()
+    test_snapshot_shares_no_mutable_state()
+    print("\n✅ All prefetch tests passed")
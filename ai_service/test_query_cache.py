@@ -0,0 +1,111 @@
+"""
+Test Query Embedding Cache
+
+Verifies LRU behaviour, persistence across restarts and hit-ratio reporting.
+"""
+
+import os
+import tempfile
+
+import numpy as np
+
+from rag.query_cache import QueryEmbeddingCache, query_key
+
+
+class CountingEncoder:
+    """Deterministic fake encoder that counts model calls"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, text: str) -> np.ndarray:
+        self.calls += 1
+        rng = np.random.default_rng(abs(hash(text)) % (2 ** 32))
+        return rng.random(8).astype("float32")
+
+
+def test_memory_hits_and_normalization():
+    """Repeated and whitespace-variant queries hit the cache"""
+    print("\n" + "="*60)
+    print("TEST 1: Memory Tier Hits")
+    print("="*60)
+
+    encoder = CountingEncoder()
+    cache = QueryEmbeddingCache(model_name="test-model", max_entries=4)
+
+    first = cache.get_or_compute("Backend engineer  python", encoder)
+    second = cache.get_or_compute("  Backend engineer python ", encoder)
+
+    assert encoder.calls == 1, "Normalized duplicate query was re-encoded"
+    assert np.array_equal(first, second)
+    assert not first.flags.writeable, "Cached vectors must be read-only"
+
+    stats = cache.get_statistics()
+    print(f"Stats: {stats}")
+    assert stats["memory_hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_ratio"] == 0.5
+
+    print("✅ Normalized queries share one embedding")
+
+
+def test_lru_eviction():
+    """Least recently used entries are evicted first"""
+    print("\n" + "="*60)
+    print("TEST 2: LRU Eviction")
+    print("="*60)
+
+    encoder = CountingEncoder()
+    cache = QueryEmbeddingCache(model_name="test-model", max_entries=2)
+
+    cache.get_or_compute("a", encoder)
+    cache.get_or_compute("b", encoder)
+    cache.get_or_compute("a", encoder)  # Refresh "a"
+    cache.get_or_compute("c", encoder)  # Evicts "b"
+
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
+
+    print("✅ LRU order respected")
+
+
+def test_model_name_in_key():
+    """Different models never share embeddings"""
+    assert query_key("same text", "model-a") != query_key("same text", "model-b")
+    print("✅ Model name is part of the cache key")
+
+
+def test_disk_tier_survives_restart():
+    """Persistent tier serves embeddings after a restart"""
+    print("\n" + "="*60)
+    print("TEST 3: Persistent Tier")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "query_cache.sqlite3")
+
+        encoder = CountingEncoder()
+        cache = QueryEmbeddingCache(model_name="test-model", disk_path=path)
+        original = cache.get_or_compute("Senior frontend developer", encoder)
+        cache.close()
+
+        restarted = QueryEmbeddingCache(model_name="test-model", disk_path=path)
+        restored = restarted.get_or_compute("Senior frontend developer", encoder)
+        stats = restarted.get_statistics()
+        restarted.close()
+
+    print(f"Stats after restart: {stats}")
+    assert encoder.calls == 1, "Embedding was recomputed after restart"
+    assert np.array_equal(original, restored)
+    assert stats["disk_hits"] == 1
+
+    print("✅ Embeddings persisted across restart")
+
+
+if __name__ == "__main__":
+    test_memory_hits_and_normalization()
+    test_lru_eviction()
+    test_model_name_in_key()
+    test_disk_tier_survives_restart()
+    print("\n✅ All query cache tests passed")
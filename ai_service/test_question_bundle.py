@@ -0,0 +1,114 @@
+"""
+Test Question Bundle
+
+Verifies that the compiled bundle serves exactly what the JSON files contain,
+rejects corrupt files, and notices edited sources.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from rag.metadata_filter import MetadataFilter
+from rag.question_bank import DATA_DIR, flatten_pools, load_question_sets
+from rag.question_bundle import BundleError, compile_bundle, load_bundle
+
+
+def test_bundle_matches_json():
+    """Pools, bank order and filter bitmaps are identical to the JSON load"""
+    print("\n" + "="*60)
+    print("TEST 1: Bundle Round Trip")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bank.bundle")
+        stats = compile_bundle(DATA_DIR, path)
+        bundle = load_bundle(path)
+
+        pools = load_question_sets()
+        bank, ranges = flatten_pools(pools)
+        print(f"Compiled: {stats}")
+
+        assert bundle.pools == pools
+        assert bundle.ranges == ranges
+        assert bundle.files["interview_flow.json"] == json.load(
+            open(os.path.join(DATA_DIR, "interview_flow.json"), encoding="utf-8")
+        )
+
+        from_json = MetadataFilter(bank)
+        columns = {field: (bundle.codes(field), bundle.code_tables[field]) for field in bundle.code_tables}
+        from_bundle = MetadataFilter(bundle.bank, columns)
+        for field, values in from_json.bitmaps.items():
+            for value, bitmap in values.items():
+                assert np.array_equal(from_bundle.bitmaps[field][value], bitmap), (field, value)
+        del bundle, from_bundle, columns
+
+    print("✅ Bundle serves the same questions and filters as JSON")
+
+
+def test_corrupt_bundle_rejected():
+    """A flipped byte fails the content hash check"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bank.bundle")
+        compile_bundle(DATA_DIR, path)
+        with open(path, "r+b") as f:
+            f.seek(-1, os.SEEK_END)
+            last = f.read(1)
+            f.seek(-1, os.SEEK_END)
+            f.write(bytes([last[0] ^ 0xFF]))
+
+        try:
+            load_bundle(path)
+        except BundleError as e:
+            print(f"Rejected: {e}")
+        else:
+            raise AssertionError("Corrupt bundle was loaded")
+
+    print("✅ Corrupt bundle rejected")
+
+
+def test_invalid_source_not_compiled():
+    """Validation errors stop the compile and name the file"""
+    with tempfile.TemporaryDirectory() as tmp:
+        with open(os.path.join(tmp, "dsa_questions.json"), "w", encoding="utf-8") as f:
+            json.dump([{"id": "dsa_x", "question": "", "difficulty": 9}], f)
+
+        try:
+            compile_bundle(tmp, os.path.join(tmp, "bank.bundle"))
+        except BundleError as e:
+            assert "dsa_questions.json" in str(e) and "difficulty" in str(e)
+        else:
+            raise AssertionError("Invalid question file compiled")
+        assert not os.path.exists(os.path.join(tmp, "bank.bundle"))
+
+    print("✅ Invalid data files rejected at compile time")
+
+
+def test_edited_source_is_stale():
+    """Editing a JSON file after compiling marks that file stale"""
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = os.path.join(tmp, "data")
+        shutil.copytree(DATA_DIR, data_dir, ignore=shutil.ignore_patterns("*.bundle", "bank_vectors.*", "embedding_store"))
+        path = os.path.join(tmp, "bank.bundle")
+        compile_bundle(data_dir, path)
+
+        bundle = load_bundle(path)
+        assert bundle.stale_sources(data_dir) == []
+
+        with open(os.path.join(data_dir, "dsa_questions.json"), "a", encoding="utf-8") as f:
+            f.write("\n")
+        assert bundle.stale_sources(data_dir) == ["dsa_questions.json"]
+        del bundle
+
+    print("✅ Edited source detected")
+
+
+if __name__ == "__main__":
+    test_bundle_matches_json()
+    test_corrupt_bundle_rejected()
+    test_invalid_source_not_compiled()
+    test_edited_source_is_stale()
+    print("\n✅ All question bundle tests passed")
@@ -0,0 +1,136 @@
+"""
+Test Question Calibration
+
+Verifies that the 2PL fit recovers known question difficulty and
+discrimination from simulated 0-10 scores, that only well-supported changes
+are proposed, and that the proposed section renders as a minimal diff of
+question_weight_calibration.json which the bank then applies.
+"""
+
+import json
+
+import numpy as np
+
+from question_calibration import QuestionCalibration, difficulty_level, render_calibration
+from rag.question_bank import CALIBRATION_FILE, apply_calibration, resolve_path
+from rag.question_bundle import validate_file
+
+CATEGORIES = {
+    "foundation_questions": {"range": [1.0, 1.3]},
+    "standard_questions": {"range": [1.4, 1.6]},
+    "challenging_questions": {"range": [1.7, 1.95]},
+    "elite_questions": {"range": [2.0, 2.5]}
+}
+
+
+def simulate(calibration: QuestionCalibration, difficulty: np.ndarray, discrimination: np.ndarray,
+             candidates: int, per_candidate: int, seed: int = 5):
+    """Binomial(10) scores from a 2PL model with N(0, 1) abilities"""
+    rng = np.random.default_rng(seed)
+    for n in range(candidates):
+        ability = rng.normal()
+        asked = rng.choice(len(difficulty), per_candidate, replace=False)
+        p = 1 / (1 + np.exp(-discrimination[asked] * (ability - difficulty[asked])))
+        calibration.add_session({
+            "session_id": f"c{n}",
+            "answered_questions": {
+                f"q{k}": {"answer": "...", "score": int(score), "timestamp": 0}
+                for k, score in zip(asked, rng.binomial(10, p))
+            }
+        })
+
+
+def test_fit_recovers_parameters():
+    """Fitted b and a track the simulated ones; proposals respect the thresholds"""
+    print("\n" + "="*60)
+    print("TEST 1: Parameter Recovery")
+    print("="*60)
+
+    rng = np.random.default_rng(11)
+    difficulty = rng.uniform(-2.2, 2.2, 40)
+    discrimination = np.exp(rng.normal(0, 0.3, 40))
+    hand_assigned = {f"q{k}": (3, 1.8) for k in range(40)}
+    calibration = QuestionCalibration(hand_assigned, ambiguous=["q1"])
+    simulate(calibration, difficulty, discrimination, candidates=3000, per_candidate=12)
+
+    # A retaken answer replaces the earlier one; unscored answers are ignored
+    calibration.add_answer("c0", "q_extra", 3)
+    calibration.add_answer("c0", "q_extra", None)
+    calibration.add_answer("c0", "q_extra", 9)
+    candidates, questions, scores = calibration.records()
+    assert len(scores) == 3000 * 12 + 1 and len(calibration) == 3000 * 12 + 2
+    assert np.allclose(scores[questions == calibration.questions.codes["q_extra"]], [0.9])
+
+    fit = calibration.fit(chunk_size=5000)
+    order = [calibration.questions.codes[f"q{k}"] for k in range(40)]
+    fitted_b, fitted_a = fit["difficulty"][order], fit["discrimination"][order]
+    assert fit["converged"], fit["iterations"]
+    assert np.corrcoef(difficulty, fitted_b)[0, 1] > 0.98
+    assert np.corrcoef(discrimination, fitted_a)[0, 1] > 0.8
+    assert np.abs(fitted_b - difficulty).mean() < 0.2
+    assert abs(fit["dispersion"] - 0.1) < 0.02, "Binomial(10) scores carry ~10 pass/fail answers of information"
+    agreement = (difficulty_level(fitted_b) == difficulty_level(difficulty)).mean()
+    print(f"✓ {fit['records']} records, {fit['iterations']} iterations, dispersion {fit['dispersion']:.3f}, "
+          f"difficulty level agreement {agreement:.0%}")
+
+    changes, rows = calibration.proposals(fit, CATEGORIES, min_responses=50)
+    status = {row["question_id"]: row["status"] for row in rows}
+    assert status["q1"] == "ambiguous_id" and status["q_extra"] == "not_in_bank"
+    for question_id, entry in changes.items():
+        assert status[question_id] == "changed"
+        assert 1 <= entry["difficulty"] <= 5 and 1.0 <= entry["weight"] <= 2.5
+        assert entry["difficulty"] != 3 or abs(entry["weight"] - 1.8) >= 0.1
+    assert {question_id for question_id, s in status.items() if s == "unchanged"}, "Level-3 questions exist"
+    print(f"✓ {len(changes)} changes proposed, statuses {sorted(set(status.values()))}")
+
+    few = QuestionCalibration(hand_assigned)
+    simulate(few, difficulty, discrimination, candidates=60, per_candidate=12)
+    few_changes, few_rows = few.proposals(few.fit(), CATEGORIES, min_responses=50)
+    assert not few_changes and {row["status"] for row in few_rows} == {"insufficient_data"}
+    print("✓ Nothing proposed below min_responses")
+    print("✅ Parameter recovery passed")
+
+
+def test_diff_and_bank_overrides():
+    """The section is a minimal, reversible edit that the bank applies on load"""
+    print("\n" + "="*60)
+    print("TEST 2: Calibration Diff")
+    print("="*60)
+
+    with open(resolve_path(CALIBRATION_FILE), "r", encoding="utf-8") as f:
+        original = f.read()
+    section = {
+        "model": "2pl_irt",
+        "records": 1000,
+        "questions": {
+            "fe_react_001": {"difficulty": 2, "weight": 1.45, "discrimination": 1.1, "location": -0.8,
+                             "responses": 400, "hand_assigned": [1, 1.2]}
+        }
+    }
+    proposed = render_calibration(original, section)
+    assert proposed.startswith(original.rstrip()[:-1].rstrip()), "Existing content must be untouched"
+    added = proposed.count("\n") - original.count("\n")
+    # Opening line, one line per key and per question, two closing braces
+    assert added == 1 + len(section) + len(section["questions"]) + 2, added
+    assert json.loads(proposed)["empirical_calibration"] == section
+    assert render_calibration(proposed, section) == proposed
+    assert render_calibration(proposed, None) == original
+    print(f"✓ +{added} lines, re-rendering and removal are exact")
+
+    pools = {"web": [{"id": "fe_react_001", "difficulty": 1, "weight": 1.2}, {"id": "other", "difficulty": 3}]}
+    assert apply_calibration(pools, json.loads(proposed)) == 1
+    assert pools["web"][0]["difficulty"] == 2 and pools["web"][0]["weight"] == 1.45
+    assert pools["web"][1] == {"id": "other", "difficulty": 3}
+    assert apply_calibration(pools, json.loads(original)) == 0
+
+    assert validate_file("question_weight_calibration.json", json.loads(proposed)) == []
+    section["questions"]["fe_react_001"]["difficulty"] = 7
+    assert validate_file("question_weight_calibration.json", json.loads(render_calibration(original, section)))
+    print("✓ Bank overrides applied, invalid sections rejected by the bundle compiler")
+    print("✅ Calibration diff passed")
+
+
+if __name__ == "__main__":
+    test_fit_recovers_parameters()
+    test_diff_and_bank_overrides()
+    print("\n✅ All question calibration tests passed")
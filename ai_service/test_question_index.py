@@ -0,0 +1,76 @@
+"""
+Test Question Index
+
+Verifies id lookups cover every question bank, reused ids are reported,
+and the flow controller shares the retriever's index.
+"""
+
+from rag.interview_flow_controller import InterviewFlowController, InterviewStage
+from rag.question_bank import QuestionIndex, load_bank
+from rag.retrieve import QuestionRetriever
+
+
+def test_get_by_id_covers_every_pool():
+    """Every pool's questions are found by id"""
+    print("\n" + "="*60)
+    print("TEST 1: Lookup Across Pools")
+    print("="*60)
+
+    retriever = QuestionRetriever()
+    for pool_name, (start, stop) in retriever.pool_ranges.items():
+        for question in retriever.all_questions[start:stop]:
+            found = retriever.get_by_id(question['id'])
+            assert found is not None, f"{question['id']} ({pool_name}) not found"
+            assert found['id'] == question['id']
+
+    assert retriever.get_by_id("no_such_question") is None
+    print(f"✅ {len(retriever.question_index)} ids resolve across {len(retriever.pool_ranges)} pools")
+
+
+def test_duplicate_ids_reported():
+    """Reused ids are detected at build time; get() keeps bank order"""
+    bank = [
+        {'id': 'q1', 'question': 'First'},
+        {'id': 'q2', 'question': 'Second'},
+        {'id': 'q1', 'question': 'Reused id'}
+    ]
+    index = QuestionIndex(bank)
+
+    assert index.duplicates == {'q1': [0, 2]}
+    assert index.get('q1')['question'] == 'First'
+    assert [q['question'] for q in index.get_all('q1')] == ['First', 'Reused id']
+    assert index.position('q2') == 1
+    print("✅ Duplicate ids detected")
+
+
+def test_flow_controller_uses_index():
+    """record_answer and should_advance_stage resolve ids through the index"""
+    _, bank, _ = load_bank()
+    controller = InterviewFlowController('data/interview_flow.json', bank)
+    controller.initialize_interview('backend', 'junior')
+
+    stage = controller.get_current_stage_config()
+    stage_questions = [q for q in bank if q.get('stage') == stage['stage']][:stage['question_count']]
+    assert len(stage_questions) == stage['question_count']
+    for question in stage_questions:
+        controller.state.questions_asked.append(question['id'])
+        controller.record_answer(question['id'], 0.9)
+
+    assert controller.state.current_stage == InterviewStage.INTRODUCTION
+    assert len(controller.state.scores) == len(stage_questions)
+    assert controller.should_advance_stage()
+
+    try:
+        controller.record_answer("no_such_question", 0.5)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Unknown question id accepted")
+    print("✅ Flow controller lookups go through the shared index")
+
+
+if __name__ == "__main__":
+    test_get_by_id_covers_every_pool()
+    test_duplicate_ids_reported()
+    test_flow_controller_uses_index()
+    print("\n✅ All question index tests passed")
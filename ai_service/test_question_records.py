@@ -0,0 +1,107 @@
+"""
+Test Question Records
+
+Verifies that slotted question records read exactly like the JSON dicts they
+replace, cannot be modified, share categorical strings, and that retrieval
+results are views over bank records rather than copies.
+"""
+
+import pickle
+
+from rag.question_bank import flatten_pools, load_bank, load_question_sets
+from rag.question_record import QuestionRecord, ScoredQuestion
+
+
+def test_records_match_json():
+    """Every bank record reads like its source dict"""
+    print("\n" + "="*60)
+    print("TEST 1: Records vs JSON")
+    print("="*60)
+
+    raw_bank, _ = flatten_pools(load_question_sets())
+    _, bank, _ = load_bank()
+
+    for raw, record in zip(raw_bank, bank):
+        assert isinstance(record, QuestionRecord)
+        assert record == raw and record.to_dict() == raw
+        assert list(record) == list(raw)
+        for key, value in raw.items():
+            assert key in record and record.get(key) is not None
+        assert record.get('not_a_field', 'x') == 'x' and 'not_a_field' not in record
+
+    print(f"✅ {len(bank)} records match their JSON")
+
+
+def test_records_are_immutable_and_interned():
+    """No assignment, nested values frozen, categorical values shared"""
+    _, bank, _ = load_bank()
+    record = next(q for q in bank if q.get('ideal_points') and q.get('evaluation_rubric'))
+
+    for attempt in (
+        lambda: setattr(record, 'role', 'x'),
+        lambda: record.__setitem__('role', 'x'),
+        lambda: record.ideal_points.append('x'),
+        lambda: record.evaluation_rubric.__setitem__('x', 'y'),
+    ):
+        try:
+            attempt()
+        except (AttributeError, TypeError):
+            continue
+        raise AssertionError("Record was modified")
+
+    roles = {}
+    for q in bank:
+        roles.setdefault(q['role'], set()).add(id(q['role']))
+    assert all(len(ids) == 1 for ids in roles.values()), "Role strings not interned"
+    assert not hasattr(record, '__dict__')
+
+    assert pickle.loads(pickle.dumps(record)) == record
+    print("✅ Records immutable, categorical values interned")
+
+
+def test_retrieval_results_are_views():
+    """retrieve() returns (record, score) views over bank records, not copies"""
+    print("\n" + "="*60)
+    print("TEST 3: Retrieval Results")
+    print("="*60)
+
+    from rag.retrieve import QuestionRetriever
+
+    retriever = QuestionRetriever()
+    results = retriever.retrieve(
+        resume_text="Backend developer, Python and SQL",
+        job_description="Backend engineer",
+        top_k=5
+    )
+
+    bank_records = {id(q) for q in retriever.all_questions}
+    for result in results:
+        assert isinstance(result, ScoredQuestion)
+        record, score = result
+        assert id(record) in bank_records
+        assert result['score'] == score == result.score
+        assert result['id'] == record['id'] == result.id
+        assert result.to_dict() == dict(record.to_dict(), score=score)
+
+    print(f"✓ {len(results)} results, none copied")
+
+    # Every phase returns the same view type with a numeric score, rule-based picks included
+    from session_context import InterviewSession
+    session = InterviewSession()
+    session.set_user_context(education="B.Tech", target_role="Backend Engineer")
+    for phase in ("warmup", "behavioral", "technical", "advanced"):
+        phased = retriever.retrieve_phased(session, "Backend developer, Python and SQL", "Backend engineer",
+                                           top_k=6, force_phase=phase)
+        assert phased and all(isinstance(result, ScoredQuestion) for result in phased), phase
+        assert all(isinstance(result.get('score'), float) for result in phased), phase
+        assert all(id(result.record) in bank_records for result in phased), phase
+        for result in phased:
+            session.mark_question_asked(result['id'])
+    print("✅ retrieve_phased returns (record, score) views in every phase")
+
+
+if __name__ == "__main__":
+    test_records_match_json()
+    test_records_are_immutable_and_interned()
+    test_retrieval_results_are_views()
+    print("\n✅ All question record tests passed")
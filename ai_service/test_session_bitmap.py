@@ -0,0 +1,91 @@
+"""
+Test Session Asked-Question Bitmap
+
+Verifies that a session's packed bitmap always agrees with its asked ids,
+whichever way they were recorded, and stays small.
+"""
+
+import numpy as np
+
+from rag.metadata_filter import MetadataFilter
+from rag.question_bank import get_question_index, load_bank
+from session_context import InterviewSession, QuestionIdSet
+
+
+def _bank():
+    _, bank, _ = load_bank()
+    return bank, get_question_index(bank), MetadataFilter(bank)
+
+
+def test_bitmap_tracks_marks():
+    """asked_mask() equals the id-based mask after asks, answers and skips"""
+    print("\n" + "="*60)
+    print("TEST 1: Bitmap Tracks Asked Questions")
+    print("="*60)
+
+    bank, index, filters = _bank()
+    session = InterviewSession("bitmap")
+    session.mark_question_asked(bank[0]['id'])
+    session.bind_bank(index)
+
+    session.mark_question_asked(bank[10]['id'])
+    session.mark_question_answered(bank[20]['id'], "answer", 7)
+    session.mark_question_skipped(bank[30]['id'])
+    session.mark_question_asked('behavioral_001')  # Reused id: every copy is marked
+
+    expected = filters.ids_mask(session.asked_questions)
+    assert np.array_equal(session.asked_mask(), expected)
+    assert expected.sum() > len(session.asked_questions) - 1
+
+    start, stop = 0, 40
+    positions = np.arange(start, stop)
+    assert session.unasked(positions).tolist() == [p for p in range(start, stop) if not expected[p]]
+
+    print(f"✅ Bitmap matches {len(session.asked_questions)} asked ids "
+          f"({session._asked_bits.nbytes} bytes for {len(bank)} questions)")
+
+
+def test_bitmap_resyncs_after_direct_updates():
+    """Ids added to asked_questions directly (or restored) are picked up"""
+    bank, index, filters = _bank()
+
+    session = InterviewSession.from_dict({"asked_questions": [bank[5]['id']]})
+    session.bind_bank(index)
+    session.asked_questions.add(bank[6]['id'])
+
+    assert np.array_equal(session.asked_mask(), filters.ids_mask(session.asked_questions))
+
+    # A different set of the same size replacing asked_questions
+    session.asked_questions = QuestionIdSet([bank[7]['id'], bank[8]['id']])
+    expected = filters.ids_mask(session.asked_questions)
+    assert np.array_equal(session.asked_mask(), expected)
+    assert session.unasked(np.arange(10)).tolist() == [p for p in range(10) if not expected[p]]
+    print("✅ Direct set updates and replaced sets resynced")
+
+
+def test_phased_retrieval_never_repeats():
+    """Pages of phased questions never repeat within a session"""
+    from rag.retrieve import QuestionRetriever
+
+    retriever = QuestionRetriever()
+    session = InterviewSession("pages")
+    session.set_user_context(skills=["python", "react"])
+    session.set_interview_mode("technical")
+
+    seen = set()
+    for _ in range(6):
+        page = retriever.retrieve_phased(session, top_k=5)
+        ids = [q['id'] for q in page]
+        assert not seen & set(ids), "Question repeated across pages"
+        seen.update(ids)
+        for question_id in ids:
+            session.mark_question_asked(question_id)
+
+    print(f"✅ {len(seen)} questions over 6 pages, no repeats")
+
+
+if __name__ == "__main__":
+    test_bitmap_tracks_marks()
+    test_bitmap_resyncs_after_direct_updates()
+    test_phased_retrieval_never_repeats()
+    print("\n✅ All session bitmap tests passed")
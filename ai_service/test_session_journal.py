@@ -0,0 +1,180 @@
+"""
+Test Session Journal
+
+Verifies that journaled sessions come back identical after a restart, that
+a torn final batch (crash mid-write) is ignored, that snapshots replace
+the segments they cover without changing what is recovered, and that
+directories with single-document snapshot-*.json.gz files still recover.
+"""
+
+import gzip
+import json
+import os
+import tempfile
+
+from session_context import InterviewSession
+from session_journal import SessionJournal
+
+
+def play_interview(journal: SessionJournal, session_id: str, answers: int = 6) -> InterviewSession:
+    """A session with every kind of journaled change"""
+    session = journal.attach(InterviewSession(session_id))
+    session.set_user_context(resume="Python developer", skills=["Python", "SQL"], education="B.Tech",
+                             projects=["MockMate"], experience_level="intern", target_role="Backend")
+    session.set_interview_mode("general")
+    for n in range(answers):
+        question_id = f"warmup_{session_id}_{n}"
+        session.mark_question_asked(question_id)
+        session.mark_question_answered(question_id, f"Answer {n} about MockMate\nwith SQL", score=n % 10)
+    session.mark_question_skipped(f"skip_{session_id}")
+    session.mark_skill_covered("Python")
+    session.add_mentioned_topic("projects", "MockMate")
+    session.advance_phase()
+    session.mark_question_asked(f"behavioral_{session_id}")
+    return session
+
+
+def test_recovery_round_trip():
+    """Sessions recover exactly, deleted sessions stay deleted"""
+    print("\n" + "="*60)
+    print("TEST 1: Recovery")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        journal = SessionJournal(tmp)
+        assert journal.recover() == {}
+        live = {sid: play_interview(journal, sid) for sid in ("s1", "s2", "s3")}
+        journal.forget("s2")
+        del live["s2"]
+        assert journal.sync(timeout=5)
+        journal.close()
+
+        recovered = SessionJournal(tmp)
+        sessions = recovered.recover()
+        assert sorted(sessions) == ["s1", "s3"]
+        for sid, session in live.items():
+            assert sessions[sid].to_dict() == session.to_dict()
+            assert sessions[sid].journal is recovered
+        print(f"✓ {len(sessions)} sessions recovered: {recovered.last_recovery}")
+
+        # Recovered sessions keep journaling
+        sessions["s1"].mark_question_answered("late_q", "After restart", 8)
+        recovered.close()
+        again = SessionJournal(tmp)
+        assert again.recover()["s1"].answered_questions["late_q"]["answer"] == "After restart"
+        again.close()
+
+    print("✅ Recovery round trip passed")
+
+
+def test_torn_tail_ignored():
+    """A half-written final batch is dropped; everything before it recovers"""
+    print("\n" + "="*60)
+    print("TEST 2: Torn Tail")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        journal = SessionJournal(tmp)
+        journal.recover()
+        session = play_interview(journal, "s1")
+        journal.sync()
+        expected = session.to_dict()
+        session.mark_question_answered("lost_q", "Never made it", 5)
+        journal.close()
+
+        # Cut the last batch in half, as a crash during write() would
+        segment = max(name for name in os.listdir(tmp) if name.startswith("journal-"))
+        path = os.path.join(tmp, segment)
+        size = os.path.getsize(path)
+        with open(path, "r+b") as f:
+            f.truncate(size - 10)
+
+        recovered = SessionJournal(tmp)
+        assert recovered.recover()["s1"].to_dict() == expected
+        recovered.close()
+
+    print("✅ Torn tail ignored")
+
+
+def test_snapshot_compaction():
+    """Snapshots drop covered segments; recovery from snapshot + tail is unchanged"""
+    print("\n" + "="*60)
+    print("TEST 3: Snapshots")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        journal = SessionJournal(tmp, snapshot_bytes=2048)
+        journal.recover()
+        live = {f"s{n}": play_interview(journal, f"s{n}", answers=10) for n in range(20)}
+        journal.sync()
+        journal.checkpoint(wait=True)
+        live["s0"].mark_question_answered("after_snapshot", "Tail event", 9)
+        journal.forget("s1")
+        del live["s1"]
+        journal.close()
+
+        names = sorted(os.listdir(tmp))
+        snapshots = [int(name[9:17]) for name in names if name.startswith("snapshot-")]
+        segments = [int(name[8:16]) for name in names if name.startswith("journal-")]
+        assert len(snapshots) == 1 and min(segments) >= snapshots[0], "Covered segments not removed"
+        print(f"✓ On disk after compaction: {names}")
+
+        recovered = SessionJournal(tmp)
+        sessions = recovered.recover()
+        assert recovered.last_recovery["snapshot"] is not None
+        assert {sid: s.to_dict() for sid, s in sessions.items()} == {sid: s.to_dict() for sid, s in live.items()}
+        print(f"✓ {recovered.last_recovery}")
+        recovered.close()
+
+    print("✅ Snapshot compaction passed")
+
+
+def test_legacy_snapshot_recovered():
+    """A snapshot-*.json.gz document (the earlier layout) is read, then replaced on compaction"""
+    print("\n" + "="*60)
+    print("TEST 4: Legacy Snapshots")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        journal = SessionJournal(tmp)
+        journal.recover()
+        live = {f"s{n}": play_interview(journal, f"s{n}") for n in range(5)}
+        journal.checkpoint(wait=True)
+        live["s0"].mark_question_answered("after_snapshot", "Tail event", 9)
+        journal.close()
+
+        # Rewrite the snapshot in the earlier layout: one document keyed by session id
+        name = next(name for name in os.listdir(tmp) if name.startswith("snapshot-"))
+        with gzip.open(os.path.join(tmp, name), "rt", encoding="utf-8") as f:
+            header = json.loads(f.readline())
+            states = [json.loads(line) for line in f]
+        os.remove(os.path.join(tmp, name))
+        legacy = name.replace(".jsonl.gz", ".json.gz")
+        with gzip.open(os.path.join(tmp, legacy), "wt", encoding="utf-8") as f:
+            json.dump({"segment": header["segment"], "created": header["created"],
+                       "sessions": {state["session_id"]: state for state in states}}, f)
+
+        recovered = SessionJournal(tmp)
+        sessions = recovered.recover()
+        assert recovered.last_recovery["snapshot"] == header["segment"]
+        assert {sid: s.to_dict() for sid, s in sessions.items()} == {sid: s.to_dict() for sid, s in live.items()}
+        print(f"✓ {len(sessions)} sessions recovered from {legacy}")
+
+        recovered.checkpoint(wait=True)
+        recovered.close()
+        names = os.listdir(tmp)
+        assert legacy not in names and sum(name.startswith("snapshot-") for name in names) == 1
+        reopened = SessionJournal(tmp)
+        assert {sid: s.to_dict() for sid, s in reopened.recover().items()} == {sid: s.to_dict() for sid, s in live.items()}
+        reopened.close()
+        print(f"✓ Compaction replaced it: {sorted(names)}")
+
+    print("✅ Legacy snapshots passed")
+
+
+if __name__ == "__main__":
+    test_recovery_round_trip()
+    test_torn_tail_ignored()
+    test_snapshot_compaction()
+    test_legacy_snapshot_recovered()
+    print("\n✅ All session journal tests passed")
@@ -0,0 +1,120 @@
+"""
+Test Session Memory Layout
+
+Verifies the compact InterviewSession: answers round-trip through the
+compressed AnswerLog, answered_questions still reads like the old dicts,
+question id sets behave like sets, and the session has no per-instance dict.
+"""
+
+import os
+import tempfile
+
+from answer_log import AnswerLog, AnswerLogError
+from session_context import InterviewSession, QuestionIdSet
+
+
+def test_answer_log_round_trip():
+    """Answers come back byte-for-byte; corruption is detected"""
+    print("\n" + "="*60)
+    print("TEST 1: Answer Log")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "answers.log")
+        log = AnswerLog(path)
+        answers = ["", "Yes.", "I used Redis for caching — ünïcode too. " * 40]
+        offsets = [log.append(answer) for answer in answers]
+
+        assert [log.read(offset) for offset in offsets] == answers
+        stats = log.get_statistics()
+        assert stats["records"] == 3 and stats["compression_ratio"] > 1
+        print(f"✓ {stats['records']} records, {stats['compression_ratio']}x compression")
+
+        try:
+            log.read(stats["size_bytes"] + 10)
+        except AnswerLogError:
+            print("✓ Out-of-range offset rejected")
+        else:
+            raise AssertionError("Read past the end of the log")
+
+        # Flip a byte inside the long answer's payload
+        with open(path, "r+b") as f:
+            f.seek(offsets[2] + 20)
+            byte = f.read(1)
+            f.seek(offsets[2] + 20)
+            f.write(bytes([byte[0] ^ 0xFF]))
+        try:
+            log.read(offsets[2])
+        except AnswerLogError:
+            print("✓ Corrupt record detected")
+        else:
+            raise AssertionError("Corrupt record was returned")
+        log.close()
+
+    print("✅ Answer log round trip passed")
+
+
+def test_answered_questions_compatibility():
+    """answered_questions reads like {id: {answer, score, timestamp}} and survives to_dict/from_dict"""
+    print("\n" + "="*60)
+    print("TEST 2: Answered Questions")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        log = AnswerLog(os.path.join(tmp, "answers.log"))
+        session = InterviewSession("memory_test", answer_log=log)
+        session.mark_question_answered("q_a", "First answer", 7)
+        session.mark_question_answered("q_b", "Second answer")
+        session.mark_question_answered("q_a", "Revised answer", 9)
+
+        answered = session.answered_questions
+        assert list(answered) == ["q_a", "q_b"] and len(answered) == 2
+        assert answered["q_a"]["answer"] == "Revised answer"
+        assert answered["q_a"]["score"] == 9 and answered["q_b"]["score"] is None
+        assert "q_c" not in answered and "q_a" in session.asked_questions
+        assert session.get_statistics()["average_score"] == 9
+        print("✓ Entries read back, re-answer replaces in place")
+
+        data = session.to_dict()
+        assert data["answered_questions"]["q_b"] == dict(answered["q_b"])
+        restored = InterviewSession.from_dict(data)
+        assert restored.to_dict() == data
+        print("✓ to_dict/from_dict round trip (timestamps preserved)")
+        log.close()
+
+    print("✅ Answered questions compatibility passed")
+
+
+def test_question_id_set_and_slots():
+    """QuestionIdSet has set semantics; sessions carry no __dict__"""
+    print("\n" + "="*60)
+    print("TEST 3: Question Id Sets")
+    print("="*60)
+
+    ids = QuestionIdSet(["q3", "q1", "q3", "q2"])
+    assert list(ids) == ["q3", "q1", "q2"] and len(ids) == 3
+    assert ids == {"q1", "q2", "q3"} and "q4" not in ids
+    assert ids & {"q1", "q9"} == {"q1"}
+
+    copy = ids.copy()
+    copy.add("q4")
+    assert "q4" in copy and "q4" not in ids
+    print("✓ Membership, order, equality and copies behave like a set")
+
+    session = InterviewSession("slots_test")
+    assert not hasattr(session, "__dict__")
+    try:
+        session.unexpected = True
+    except AttributeError:
+        print("✓ InterviewSession is slotted")
+    else:
+        raise AssertionError("Session accepted an undeclared attribute")
+
+    print("✅ Question id set tests passed")
+
+
+if __name__ == "__main__":
+    test_answer_log_round_trip()
+    test_answered_questions_compatibility()
+    test_question_id_set_and_slots()
+    print("\n✅ All session memory tests passed")
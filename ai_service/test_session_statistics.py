@@ -0,0 +1,122 @@
+"""
+Test Session Statistics
+
+Verifies that running session aggregates match a from-scratch recount after
+any sequence of asks, answers (including re-answers) and skills, that
+unchanged statistics are served from cache, and that the delta form returns
+exactly what changed since a client's last version.
+"""
+
+import random
+
+from session_context import InterviewSession
+
+
+def recount(session: InterviewSession) -> dict:
+    """Statistics the way they used to be computed, from the raw session state"""
+    scores = [entry["score"] for entry in session.answered_questions.values() if entry["score"] is not None]
+    histogram = [0] * 11
+    for score in scores:
+        histogram[int(min(max(score, 0), 10))] += 1
+    return {
+        "average_score": sum(scores) / len(scores) if scores else None,
+        "score_histogram": histogram,
+        "covered_skills": sorted(session.covered_skills),
+        "uncovered_skills": [s for s in session.target_skills if s.lower() not in session.covered_skills],
+        "total_answered": len(session.answered_questions),
+    }
+
+
+def test_aggregates_match_recount():
+    """Running sums, histogram and counters stay exact through re-answers and phase changes"""
+    print("\n" + "="*60)
+    print("TEST 1: Aggregates vs Recount")
+    print("="*60)
+
+    rng = random.Random(7)
+    session = InterviewSession("stats_test")
+    session.set_user_context(skills=["Python", "SQL", "React", "Docker"])
+    skills = ["Python", "SQL", "React", "Docker", "Kubernetes"]
+
+    for step in range(300):
+        question_id = f"q{rng.randint(0, 60)}"
+        action = rng.random()
+        if action < 0.3:
+            session.mark_question_asked(question_id)
+        elif action < 0.8:
+            score = rng.choice([None, 0, 3, 5, 7.5, 10])
+            session.mark_question_answered(question_id, f"answer {step}", score)
+        else:
+            session.mark_skill_covered(rng.choice(skills))
+        if step % 50 == 49:
+            session.advance_phase()
+
+        stats = session.get_statistics()
+        expected = recount(session)
+        assert stats["score_histogram"] == expected["score_histogram"]
+        assert stats["total_answered"] == expected["total_answered"]
+        assert sorted(stats["covered_skills"]) == expected["covered_skills"]
+        assert stats["uncovered_skills"] == expected["uncovered_skills"]
+        if expected["average_score"] is None:
+            assert stats["average_score"] is None
+        else:
+            assert abs(stats["average_score"] - expected["average_score"]) < 1e-9
+
+    assert sum(stats["asked_per_phase"].values()) == stats["total_asked"]
+    assert sum(stats["answered_per_phase"].values()) == stats["total_answered"]
+    print(f"✓ 300 random steps, final: {stats['score_histogram']} avg={stats['average_score']:.2f}")
+    print(f"✓ Per phase asked {stats['asked_per_phase']}, skills {stats['skill_counts']}")
+    print("✅ Aggregates match a full recount")
+
+
+def test_cached_lists_and_delta():
+    """Unchanged lists are reused but handed out as copies; deltas carry only changed keys"""
+    print("\n" + "="*60)
+    print("TEST 2: Cache and Delta")
+    print("="*60)
+
+    session = InterviewSession("delta_test")
+    session.set_user_context(skills=["Python", "SQL"])
+    first = session.get_statistics()
+    cached = session._stats["uncovered_skills"]
+    again = session.get_statistics()
+    assert session._stats["uncovered_skills"] is cached, "Unchanged list was rebuilt"
+    assert again["uncovered_skills"] is not cached and again["uncovered_skills"] == cached
+
+    # Callers mutating a result don't change later results or deltas
+    again["uncovered_skills"].append("Go")
+    again["score_histogram"][3] = 99
+    again["asked_per_phase"]["warmup"] = 99
+    again["mentioned_topics"]["projects"] = ["Injected"]
+    assert session.get_statistics() == first
+
+    session.mark_question_answered("warmup_intro", "Hi, I'm...", 8)
+    delta = session.get_statistics_delta(first["version"])
+    assert set(delta["changed"]) == {
+        "total_asked", "asked_per_phase", "total_answered", "answered_per_phase", "average_score", "score_histogram"
+    }
+    assert delta["changed"]["average_score"] == 8 and delta["version"] > first["version"]
+    assert session._stats["uncovered_skills"] is cached
+    print(f"✓ Answer delta: {sorted(delta['changed'])}")
+
+    session.mark_skill_covered("python")
+    delta = session.get_statistics_delta(delta["version"])
+    assert delta["changed"]["uncovered_skills"] == ["SQL"] and delta["changed"]["skill_counts"] == {"python": 1}
+    assert session.get_statistics_delta(delta["version"])["changed"] == {}
+    print("✓ Skill delta, then nothing changed")
+
+    # A version the session never reached (e.g. from before a restart) returns everything
+    assert len(session.get_statistics_delta(10**6)["changed"]) >= 10
+
+    restored = InterviewSession.from_dict(session.to_dict())
+    assert restored.get_statistics() == session.get_statistics()
+    assert restored.get_statistics_delta(delta["version"])["changed"] == {}
+    assert len(restored.get_statistics_delta(delta["version"] - 1)["changed"]) >= 10
+    print("✓ Aggregates and version survive to_dict/from_dict")
+    print("✅ Cache and delta passed")
+
+
+if __name__ == "__main__":
+    test_aggregates_match_recount()
+    test_cached_lists_and_delta()
+    print("\n✅ All session statistics tests passed")
@@ -0,0 +1,89 @@
+"""
+Test Weighted Sampling
+
+Verifies that question selection draws without replacement, follows the
+weights, and is reproducible from a session seed.
+"""
+
+import numpy as np
+
+from rag.interview_flow_controller import (
+    InterviewFlowController, weighted_random_selection, weighted_sample_indices
+)
+from rag.question_bank import load_bank
+
+
+def test_sample_without_replacement():
+    """Distinct indices, never more than available"""
+    rng = np.random.default_rng(0)
+    for _ in range(100):
+        picked = weighted_sample_indices([1.0, 2.0, 0.5, 1.5, 1.0], 3, rng)
+        assert len(set(picked.tolist())) == 3
+
+    assert sorted(weighted_sample_indices([1.0, 1.0], 5, rng).tolist()) == [0, 1]
+    assert weighted_sample_indices([], 3, rng).tolist() == []
+    assert len(weighted_random_selection([("a", 0.0), ("b", 1.0)], 2, rng)) == 2
+    print("✅ Draws without replacement")
+
+
+def test_first_draw_follows_weights():
+    """P(first pick = i) = w_i / sum(w)"""
+    print("\n" + "="*60)
+    print("TEST 2: Draw Probabilities")
+    print("="*60)
+
+    weights = np.array([1.0, 2.0, 3.0, 4.0])
+    rng = np.random.default_rng(1)
+    trials = 20000
+    firsts = np.bincount(
+        [weighted_sample_indices(weights, 2, rng)[0] for _ in range(trials)], minlength=4
+    ) / trials
+
+    print(f"Observed {np.round(firsts, 3).tolist()} vs expected {(weights / weights.sum()).tolist()}")
+    assert np.allclose(firsts, weights / weights.sum(), atol=0.015)
+    print("✅ First draw matches the weights")
+
+
+def test_seeded_interviews_are_reproducible():
+    """Same seed -> same plan; different seed -> (almost surely) different"""
+    _, bank, _ = load_bank()
+
+    def plan(seed):
+        controller = InterviewFlowController('data/interview_flow.json', bank)
+        controller.initialize_interview('backend', 'junior', seed=seed)
+        return [q['id'] for q in controller.select_questions(3, use_adaptive_difficulty=False)]
+
+    assert plan(7) == plan(7)
+    assert any(plan(7) != plan(seed) for seed in range(8, 12))
+    print("✅ Seeded plans are reproducible")
+
+
+def test_column_weights_match_question_weights():
+    """Array weighting equals the per-question rule (x1.3 weakness, x0.7 strength)"""
+    _, bank, _ = load_bank()
+    controller = InterviewFlowController('data/interview_flow.json', bank)
+    controller.initialize_interview('backend', 'junior', seed=0)
+    controller.state.candidate_weaknesses = ['technical']
+    controller.state.candidate_strengths = ['behavioral', 'behavioral']
+
+    positions = np.arange(len(bank))
+    expected = []
+    for q in bank:
+        weight = q.get('weight', 1.0)
+        if q.get('category') in controller.state.candidate_weaknesses:
+            weight *= 1.3
+        if q.get('category') in controller.state.candidate_strengths:
+            weight *= 0.7
+        expected.append(weight)
+
+    assert np.allclose(controller.position_weights(positions), expected)
+    assert np.allclose([w for _, w in controller.weight_questions(bank)], expected)
+    print("✅ Column weights match the per-question rule")
+
+
+if __name__ == "__main__":
+    test_sample_without_replacement()
+    test_first_draw_follows_weights()
+    test_seeded_interviews_are_reproducible()
+    test_column_weights_match_question_weights()
+    print("\n✅ All weighted sampling tests passed")